@@ -0,0 +1,133 @@
+"""
+Primary/replica database routing.
+
+When DATABASES has a ``replica`` entry, reads made while a view using ``ReplicaReadMixin``
+handles a GET go to the replica. Everything else stays on ``default``: writes, reads in
+other views, commands and background jobs, reads inside a transaction on ``default``, and
+all reads for a user who wrote within the last ``REPLICA_STICKY_SECONDS``, so users see
+their own changes despite replication lag.
+
+``PrimaryStickinessMiddleware`` holds the per-request routing state. The router notes
+every write in it, and when a request wrote, the middleware marks its user sticky to the
+primary in the cache. A write during a replica-routed request moves that request's
+later reads back to the primary too.
+"""
+import contextvars
+from dataclasses import dataclass
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DB_ALIAS = "replica"
+
+
+@dataclass
+class RequestRouting:
+    use_replica: bool = False
+    wrote: bool = False
+
+
+_routing = contextvars.ContextVar("db_routing", default=None)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def sticky_cache_key(user_id):
+    return f"primary-sticky:{user_id}"
+
+
+def mark_sticky(user_id):
+    cache.set(sticky_cache_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id):
+    return cache.get(sticky_cache_key(user_id)) is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None and routing.use_replica and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+            routing.use_replica = False
+        # Explicit, so instances read from the replica are still saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_DB_ALIAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """For read-only APIViews: once the user is authenticated, send the request's reads to the replica if it may."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        routing = _routing.get()
+        if (
+            routing is not None
+            and not routing.wrote
+            and request.method in SAFE_METHODS
+            and replica_configured()
+            and not is_sticky(request.user.id)
+        ):
+            routing.use_replica = True
+
+
+class PrimaryStickinessMiddleware:
+    """Track each request's writes and keep the writing user on the primary for REPLICA_STICKY_SECONDS."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        routing = RequestRouting()
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        if routing.wrote and replica_configured():
+            self.mark_writer(request)
+        return response
+
+    async def __acall__(self, request):
+        routing = RequestRouting()
+        token = _routing.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        if routing.wrote and replica_configured():
+            # request.user may be a lazy session lookup, and the cache call may block.
+            await sync_to_async(self.mark_writer)(request)
+        return response
+
+    def mark_writer(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            mark_sticky(user.id)
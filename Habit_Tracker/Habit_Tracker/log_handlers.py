@@ -0,0 +1,160 @@
+"""
+Logging pieces used by ``LOGGING`` in settings.
+
+``QueuedRotatingFileHandler`` and ``QueuedStreamHandler`` only put records on an in-memory
+queue; a ``QueueListener`` thread formats them and writes them to a rotating file or to
+stderr, so request threads never wait on disk or console I/O. The listener is started lazily in each process, which keeps it working in
+workers forked after settings were loaded (e.g. gunicorn with ``preload_app``).
+
+The queue is bounded. When the disk falls behind and it fills up, new records are dropped
+rather than blocking requests, and a warning with the number dropped is queued as soon as
+there is room again.
+"""
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``.
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class QueuedHandler(QueueHandler):
+    """
+    Queue-backed wrapper that hands records to ``target`` on a listener thread.
+
+    Level and filters run on the calling thread, so dropped records cost nothing more.
+    Formatting and writing happen on the listener thread.
+    """
+
+    def __init__(self, target, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self.queue_size = queue_size
+        self.target = target
+        self.listener = None
+        self.pid = None
+        self.dropped = 0
+
+    def setFormatter(self, fmt):
+        # Formatting is the listener's job; see prepare().
+        self.target.setFormatter(fmt)
+
+    def start(self):
+        """Start a listener for this process. A forked child gets a fresh queue and thread."""
+        self.queue = queue.Queue(self.queue_size)
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        self.pid = os.getpid()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Drain the queue and stop the listener thread."""
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+
+    def enqueue(self, record):
+        if self.pid != os.getpid():
+            # The handler lock is reinitialised in forked children, so it is safe to take here.
+            with self.lock:
+                if self.pid != os.getpid():
+                    self.start()
+        try:
+            if self.dropped:
+                self.queue.put_nowait(self.dropped_record())
+                self.dropped = 0
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def dropped_record(self):
+        return logging.makeLogRecord({
+            "name": __name__, "levelno": logging.WARNING, "levelname": "WARNING",
+            "msg": "Log queue full, records dropped", "dropped": self.dropped,
+        })
+
+    def prepare(self, record):
+        # Resolve the message now (args may be mutated after the call returns) but leave
+        # formatting, including tracebacks, to the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def close(self):
+        self.stop()
+        self.target.close()
+        super().close()
+
+
+class QueuedRotatingFileHandler(QueuedHandler):
+    """Queued file handler with size (``rotation="size"``) or time (``rotation="time"``) rotation."""
+
+    def __init__(self, filename, rotation="size", max_bytes=10 * 1024 * 1024, backup_count=5,
+                 when="midnight", encoding="utf-8", queue_size=10000):
+        if rotation == "time":
+            target = TimedRotatingFileHandler(filename, when=when, backupCount=backup_count, encoding=encoding, delay=True)
+        elif rotation == "size":
+            target = RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding, delay=True)
+        else:
+            raise ValueError(f"Unknown log rotation {rotation!r}; expected 'size' or 'time'.")
+        super().__init__(target, queue_size)
+
+
+class QueuedStreamHandler(QueuedHandler):
+    """Queued ``StreamHandler``, writing to ``stream`` (stderr by default)."""
+
+    def __init__(self, stream=None, queue_size=10000):
+        super().__init__(logging.StreamHandler(stream), queue_size)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the standard fields plus any ``extra=`` values."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in RESERVED_ATTRS)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of selected high-volume records.
+
+    ``rates`` maps a message template (the string passed to the logger) to the fraction of
+    those records to keep. Only records at ``max_level`` or below are sampled, so warnings
+    and errors always pass.
+
+    Attach it to the loggers that emit sampled messages, not to handlers: a logger filter
+    decides once per record, so a record is kept or dropped for every handler together.
+    Logger filters do not see records propagated from child loggers.
+    """
+
+    def __init__(self, rates=None, max_level="INFO"):
+        super().__init__()
+        self.rates = {message: float(rate) for message, rate in (rates or {}).items()}
+        self.max_level = logging.getLevelName(max_level) if isinstance(max_level, str) else max_level
+
+    def filter(self, record):
+        if record.levelno > self.max_level:
+            return True
+        rate = self.rates.get(record.msg)
+        return rate is None or random.random() < rate
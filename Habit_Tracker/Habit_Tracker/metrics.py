@@ -0,0 +1,363 @@
+"""
+Request metrics in the Prometheus text format.
+
+``MetricsMiddleware`` records latency, status and DB query count for every request,
+labelled with the resolved URL name, into fixed-bucket histograms and counters.
+``metrics_view`` serves them at ``/metrics``; percentiles come from the buckets with
+``histogram_quantile`` on the Prometheus side. Scrapes are refused (403) unless they send
+``Authorization: Bearer <METRICS_TOKEN>`` or come from an address in ``METRICS_ALLOWED_IPS``.
+
+With ``METRICS_DIR`` unset values live in process memory, which is only correct for a single
+worker. With it set, each process appends its samples to its own memory-mapped file in
+that directory and a scrape sums every file, so all workers are reported whichever one
+answers. The directory must be emptied when the server starts, and ``retire_worker`` run
+for each worker that exits (both done in gunicorn.conf.py).
+"""
+import glob
+import hmac
+import ipaddress
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, math.inf)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, math.inf)
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+def sample_key(name, labels):
+    return json.dumps([name, sorted(labels.items())])
+
+
+def parse_key(key):
+    name, labels = json.loads(key)
+    return name, tuple((label, value) for label, value in labels)
+
+
+class LocalStore:
+    """Sample values for a single process."""
+
+    def __init__(self):
+        self.values = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def inc(self, key, amount):
+        with self.lock:
+            self.values[key] += amount
+
+    def read(self):
+        with self.lock:
+            return dict(self.values)
+
+
+class MmapStore:
+    """
+    Sample values for one process in a memory-mapped file.
+
+    Layout: an 8-byte count of used bytes, then entries of a 4-byte key length, the UTF-8
+    key padded to 8 bytes and an 8-byte float. Entries are only appended, and the used
+    count is bumped after an entry is complete, so readers in other processes never see a
+    half-written key.
+    """
+    HEADER = struct.Struct("<Q")
+    KEY_LENGTH = struct.Struct("<I")
+    VALUE = struct.Struct("<d")
+
+    def __init__(self, path, initial_size=64 * 1024):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = open(path, "a+b")
+        size = max(os.fstat(self.file.fileno()).st_size, initial_size)
+        self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), size)
+        self.used = self.HEADER.unpack_from(self.map, 0)[0] or self.HEADER.size
+        self.offsets = {key: offset for key, offset, _ in self._entries(self.map, self.used)}
+
+    @classmethod
+    def _entries(cls, data, used):
+        position = cls.HEADER.size
+        while position < used:
+            length = cls.KEY_LENGTH.unpack_from(data, position)[0]
+            key_start = position + cls.KEY_LENGTH.size
+            value_offset = key_start + length + (-(cls.KEY_LENGTH.size + length) % 8)
+            yield bytes(data[key_start:key_start + length]).decode(), value_offset, cls.VALUE.unpack_from(data, value_offset)[0]
+            position = value_offset + cls.VALUE.size
+
+    @classmethod
+    def read_file(cls, path):
+        with open(path, "rb") as file:
+            data = file.read()
+        if len(data) < cls.HEADER.size:
+            return {}
+        return {key: value for key, _, value in cls._entries(data, cls.HEADER.unpack_from(data, 0)[0])}
+
+    def _append(self, key):
+        encoded = key.encode()
+        header_size = self.KEY_LENGTH.size + len(encoded)
+        entry_size = header_size + (-header_size % 8) + self.VALUE.size
+        if self.used + entry_size > len(self.map):
+            size = max(2 * len(self.map), self.used + entry_size)
+            self.map.close()
+            self.file.truncate(size)
+            self.map = mmap.mmap(self.file.fileno(), size)
+
+        self.KEY_LENGTH.pack_into(self.map, self.used, len(encoded))
+        self.map[self.used + self.KEY_LENGTH.size:self.used + header_size] = encoded
+        offset = self.used + entry_size - self.VALUE.size
+        self.VALUE.pack_into(self.map, offset, 0.0)
+        self.used += entry_size
+        self.HEADER.pack_into(self.map, 0, self.used)
+        self.offsets[key] = offset
+        return offset
+
+    def inc(self, key, amount):
+        with self.lock:
+            offset = self.offsets.get(key)
+            if offset is None:
+                offset = self._append(key)
+            self.VALUE.pack_into(self.map, offset, self.VALUE.unpack_from(self.map, offset)[0] + amount)
+
+    def read(self):
+        with self.lock:
+            return {key: self.VALUE.unpack_from(self.map, offset)[0] for key, offset in self.offsets.items()}
+
+
+_store = None
+_store_owner = None
+
+
+def get_store():
+    """This process's store, recreated after a fork or a change of METRICS_DIR."""
+    global _store, _store_owner
+    owner = (os.getpid(), settings.METRICS_DIR)
+    if _store_owner != owner:
+        if settings.METRICS_DIR:
+            os.makedirs(settings.METRICS_DIR, exist_ok=True)
+            _store = MmapStore(os.path.join(settings.METRICS_DIR, f"worker-{os.getpid()}.db"))
+        else:
+            _store = LocalStore()
+        _store_owner = owner
+    return _store
+
+
+def collect():
+    """Every sample summed across workers, keyed by ``(name, labels)``."""
+    if settings.METRICS_DIR:
+        get_store()
+        values = defaultdict(float)
+        for path in glob.glob(os.path.join(settings.METRICS_DIR, "worker-*.db")):
+            for key, value in MmapStore.read_file(path).items():
+                values[key] += value
+    else:
+        values = get_store().read()
+    return {parse_key(key): value for key, value in values.items()}
+
+
+def retire_worker(pid):
+    """
+    Fold an exited worker's counters and histograms into ``worker-retired.db`` and delete
+    its file, so totals keep counting its requests but its gauges no longer add up. Must
+    only be called from one process (the gunicorn master).
+    """
+    path = os.path.join(settings.METRICS_DIR, f"worker-{pid}.db")
+    if not settings.METRICS_DIR or not os.path.exists(path):
+        return
+    gauges = {metric.name for metric in METRICS if metric.type == "gauge"}
+    retired = MmapStore(os.path.join(settings.METRICS_DIR, "worker-retired.db"))
+    for key, value in MmapStore.read_file(path).items():
+        if parse_key(key)[0] not in gauges:
+            retired.inc(key, value)
+    os.remove(path)
+
+
+def format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def format_labels(labels):
+    if not labels:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')) for name, value in labels
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+class Counter:
+    type = "counter"
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+
+    def inc(self, amount=1, **labels):
+        get_store().inc(sample_key(self.name, labels), amount)
+
+    def samples(self, values):
+        for (name, labels), value in sorted(values.items()):
+            if name == self.name:
+                yield name, labels, value
+
+
+class Gauge(Counter):
+    """A value that goes up and down. Across workers the per-process values are summed."""
+    type = "gauge"
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    type = "histogram"
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+
+    def observe(self, value, **labels):
+        # Only the first matching bucket is written; counts are made cumulative when rendered.
+        bound = next(bound for bound in self.buckets if value <= bound)
+        store = get_store()
+        store.inc(sample_key(f"{self.name}_bucket", {**labels, "le": format_value(bound)}), 1)
+        store.inc(sample_key(f"{self.name}_sum", labels), value)
+        store.inc(sample_key(f"{self.name}_count", labels), 1)
+
+    def samples(self, values):
+        series = defaultdict(dict)
+        for (name, labels), value in values.items():
+            if name == f"{self.name}_bucket":
+                series[tuple(label for label in labels if label[0] != "le")][dict(labels)["le"]] = value
+
+        for labels in sorted(series):
+            cumulative = 0
+            for bound in self.buckets:
+                cumulative += series[labels].get(format_value(bound), 0)
+                yield f"{self.name}_bucket", tuple(sorted(labels + (("le", format_value(bound)),))), cumulative
+            yield f"{self.name}_sum", labels, values.get((f"{self.name}_sum", labels), 0)
+            yield f"{self.name}_count", labels, values.get((f"{self.name}_count", labels), 0)
+
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Request latency in seconds by URL name.", LATENCY_BUCKETS)
+REQUEST_QUERIES = Histogram("http_request_db_queries", "Database queries per request by URL name.", QUERY_BUCKETS)
+REQUESTS = Counter("http_requests_total", "Requests by URL name, method and status code.")
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connection checkouts by database alias and result: hit (reused), miss (opened) or timeout."
+)
+DB_POOL_WAIT = Histogram("db_pool_wait_seconds", "Time spent waiting for a connection from a full pool.", WAIT_BUCKETS)
+DB_POOL_DISCARDS = Counter("db_pool_discarded_total", "Pooled connections closed by database alias and reason.")
+DB_POOL_CONNECTIONS = Gauge("db_pool_connections", "Pooled connections by database alias and state (idle or in_use).")
+METRICS = [REQUEST_LATENCY, REQUEST_QUERIES, REQUESTS, DB_POOL_CHECKOUTS, DB_POOL_WAIT, DB_POOL_DISCARDS, DB_POOL_CONNECTIONS]
+
+
+def render_metrics():
+    values = collect()
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(f"{name}{format_labels(labels)} {format_value(value)}" for name, labels, value in metric.samples(values))
+    return "\n".join(lines) + "\n"
+
+
+def scrape_allowed(request):
+    token = settings.METRICS_TOKEN
+    if token and hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(network, strict=False) for network in settings.METRICS_ALLOWED_IPS)
+
+
+def metrics_view(request):
+    if not scrape_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """A QueryCounter counting the queries run on every database connection inside the block."""
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(counter))
+        yield counter
+
+
+@asynccontextmanager
+async def in_request_thread(context_manager):
+    """
+    Enter ``context_manager`` in the thread running the request's sync code. Connections are
+    per thread and the ORM, async API included, queries from that thread, not the event loop's.
+    """
+    value = await sync_to_async(context_manager.__enter__)()
+    try:
+        yield value
+    finally:
+        await sync_to_async(context_manager.__exit__)(None, None, None)
+
+
+def endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.url_name or match.route
+
+
+class MetricsMiddleware:
+    """Record latency, status and query count for each request under its URL name."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with count_queries() as counter:
+            response = self.get_response(request)
+        self.record(request, response, counter.count, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        async with in_request_thread(count_queries()) as counter:
+            response = await self.get_response(request)
+        self.record(request, response, counter.count, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, queries, elapsed):
+        labels = {"endpoint": endpoint_name(request), "method": request.method if request.method in METHODS else "other"}
+        REQUEST_LATENCY.observe(elapsed, **labels)
+        REQUEST_QUERIES.observe(queries, **labels)
+        REQUESTS.inc(**labels, status=str(response.status_code))
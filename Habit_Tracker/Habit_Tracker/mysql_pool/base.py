@@ -0,0 +1,50 @@
+"""
+MySQL backend whose connections come from ``Habit_Tracker.mysql_pool.pool``.
+
+Set ENGINE to ``Habit_Tracker.mysql_pool`` with CONN_MAX_AGE 0: each request checks a
+connection out on its first query and returns it when Django closes the connection at
+the end of the request. Pool settings go in OPTIONS["pool"] (size, timeout, max_lifetime,
+ping_after; see ConnectionPool) and are not passed on to the driver.
+
+A reused connection keeps the session state set when it was opened, so the per-connection
+setup queries only run for new connections. An open transaction is rolled back before
+the connection goes back to the pool.
+"""
+from functools import partial
+from django.db.backends.mysql import base
+from Habit_Tracker.mysql_pool.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    pooled = None
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict["OPTIONS"].get("pool", {}))
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        self.pooled = self.pool.acquire(partial(super().get_new_connection, conn_params))
+        return self.pooled.raw
+
+    def init_connection_state(self):
+        if self.pooled is None or not self.pooled.reused:
+            super().init_connection_state()
+
+    def _close(self):
+        pooled, self.pooled = self.pooled, None
+        if pooled is None:
+            return super()._close()
+
+        # Closing inside atomic() leaves the wrapper holding the connection, so it cannot be shared.
+        broken = self.in_atomic_block or (self.errors_occurred and not self.is_usable())
+        if not broken and not self.connection.get_autocommit():
+            try:
+                self.connection.rollback()
+            except Exception:
+                broken = True
+        pooled.pool.release(pooled, broken=broken)
@@ -0,0 +1,161 @@
+"""
+A bounded per-process pool of raw database connections.
+
+Django keeps one connection per thread and, with CONN_MAX_AGE 0, closes it at the end of
+each request. The pooled backend (``base.py``) takes that connection from a pool instead
+of opening one and gives it back instead of closing it, so requests reuse connections
+rather than paying a TCP and auth handshake each time.
+
+- At most ``size`` connections are open per process and alias. A thread finding the pool
+  exhausted waits up to ``timeout`` seconds and then gets ``PoolTimeout``.
+- Idle connections are reused newest first, so surplus ones sit unused until they expire.
+- A connection idle for more than ``ping_after`` seconds is pinged before reuse, and one
+  older than ``max_lifetime`` is closed instead of reused, which keeps clear of MySQL's
+  wait_timeout and server restarts.
+- Checkouts (hit, miss, timeout), waits, discards and open connections are recorded in
+  ``Habit_Tracker.metrics``.
+
+Pools are per process: a forked worker gets its own and never touches its parent's sockets.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from django.db.utils import OperationalError
+from Habit_Tracker.metrics import DB_POOL_CHECKOUTS, DB_POOL_WAIT, DB_POOL_DISCARDS, DB_POOL_CONNECTIONS
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+@dataclass
+class PooledConnection:
+    pool: "ConnectionPool"
+    raw: object
+    created: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    reused: bool = False
+
+
+def ping(raw):
+    raw.ping()
+
+
+class ConnectionPool:
+    def __init__(self, alias, size=4, timeout=10.0, max_lifetime=3600.0, ping_after=30.0, ping=ping):
+        self.alias = alias
+        self.size = size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.ping_after = ping_after
+        self.ping = ping
+        self.pid = os.getpid()
+        self.idle = []
+        self.open = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, connect):
+        """A healthy pooled connection, opening one with ``connect()`` when none is idle."""
+        while True:
+            entry = self._checkout()
+            if entry is None:
+                return self._open(connect)
+            DB_POOL_CONNECTIONS.dec(alias=self.alias, state="idle")
+            problem = self._problem(entry)
+            if problem is None:
+                entry.reused = True
+                DB_POOL_CHECKOUTS.inc(alias=self.alias, result="hit")
+                DB_POOL_CONNECTIONS.inc(alias=self.alias, state="in_use")
+                return entry
+            self._discard(entry, problem)
+
+    def release(self, entry, broken=False):
+        """Return a connection from ``acquire``; broken or expired ones are closed."""
+        if os.getpid() != self.pid:
+            # Inherited across a fork: the socket is the parent's, so leave it alone.
+            return
+        DB_POOL_CONNECTIONS.dec(alias=self.alias, state="in_use")
+        if broken or time.monotonic() - entry.created > self.max_lifetime:
+            self._discard(entry, "broken" if broken else "expired")
+            return
+        entry.last_used = time.monotonic()
+        with self.condition:
+            self.idle.append(entry)
+            self.condition.notify()
+        DB_POOL_CONNECTIONS.inc(alias=self.alias, state="idle")
+
+    def close_idle(self):
+        """Close every idle connection, e.g. before the process exits."""
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for entry in idle:
+            DB_POOL_CONNECTIONS.dec(alias=self.alias, state="idle")
+            self._discard(entry, "closed")
+
+    def _checkout(self):
+        """The newest idle connection, or None after reserving a slot for a new one."""
+        with self.condition:
+            if not self.idle and self.open >= self.size:
+                started = time.monotonic()
+                while not self.idle and self.open >= self.size:
+                    remaining = started + self.timeout - time.monotonic()
+                    if remaining <= 0:
+                        DB_POOL_CHECKOUTS.inc(alias=self.alias, result="timeout")
+                        raise PoolTimeout(f"No connection to '{self.alias}' became free within {self.timeout}s.")
+                    self.condition.wait(remaining)
+                DB_POOL_WAIT.observe(time.monotonic() - started, alias=self.alias)
+            if self.idle:
+                return self.idle.pop()
+            self.open += 1
+            return None
+
+    def _open(self, connect):
+        try:
+            raw = connect()
+        except BaseException:
+            with self.condition:
+                self.open -= 1
+                self.condition.notify()
+            raise
+        DB_POOL_CHECKOUTS.inc(alias=self.alias, result="miss")
+        DB_POOL_CONNECTIONS.inc(alias=self.alias, state="in_use")
+        return PooledConnection(pool=self, raw=raw)
+
+    def _problem(self, entry):
+        """Why an idle connection should not be reused, or None."""
+        now = time.monotonic()
+        if now - entry.created > self.max_lifetime:
+            return "expired"
+        if now - entry.last_used > self.ping_after:
+            try:
+                self.ping(entry.raw)
+            except Exception:
+                return "failed_ping"
+        return None
+
+    def _discard(self, entry, reason):
+        try:
+            entry.raw.close()
+        except Exception:
+            pass
+        with self.condition:
+            self.open -= 1
+            self.condition.notify()
+        DB_POOL_DISCARDS.inc(alias=self.alias, reason=reason)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, options):
+    """This process's pool for ``alias``, created from the OPTIONS["pool"] settings on first use."""
+    key = (os.getpid(), alias)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(alias, **options)
+    return pool
@@ -0,0 +1,132 @@
+"""
+Per-request query counting and N+1 detection.
+
+``inspect_queries()`` records every query run on any connection while it is open. Queries
+are grouped by shape (the SQL with literals and parameter placeholders collapsed), and a
+shape repeated ``N_PLUS_ONE_THRESHOLD`` times or more is reported as a likely N+1 along with
+the project code line that issued it.
+
+``QueryInspectorMiddleware`` applies this to each request when ``QUERY_INSPECTOR`` is on:
+it logs suspected N+1 shapes to ``api.queries`` and adds an ``X-DB-Query-Count`` header.
+It removes itself from the middleware chain when the setting is off. Tests use the
+``query_budget`` fixture in conftest.py.
+"""
+import logging
+import os
+import re
+import traceback
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from Habit_Tracker.metrics import in_request_thread
+
+logger = logging.getLogger("api.queries")
+
+N_PLUS_ONE_THRESHOLD = 3
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_VALUE_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_SKIPPED_PATHS = (os.path.abspath(__file__), os.sep + "site-packages" + os.sep)
+
+
+def query_shape(sql):
+    """SQL with literals and placeholders replaced by ``?`` and IN lists collapsed, so repeats compare equal."""
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDER.sub("?", shape)
+    return _VALUE_LIST.sub("(...)", " ".join(shape.split()))
+
+
+def query_origin():
+    """``file:line in function`` of the innermost project frame on the stack."""
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(base_dir) and not any(part in frame.filename for part in _SKIPPED_PATHS):
+            return f"{os.path.relpath(frame.filename, base_dir)}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+@dataclass
+class QueryInspector:
+    threshold: int = N_PLUS_ONE_THRESHOLD
+    queries: list = field(default_factory=list)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((context["connection"].alias, sql, query_origin()))
+        return execute(sql, params, many, context)
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    def repeated_shapes(self):
+        """``(shape, count, origins)`` for every shape run at least ``threshold`` times."""
+        shapes = Counter(query_shape(sql) for _, sql, _ in self.queries)
+        return [
+            (shape, count, sorted({origin for _, sql, origin in self.queries if query_shape(sql) == shape}))
+            for shape, count in shapes.most_common()
+            if count >= self.threshold
+        ]
+
+    def report(self):
+        lines = [f"{self.count} queries:"]
+        lines += [f"  [{alias}] {sql}\n      from {origin}" for alias, sql, origin in self.queries]
+        for shape, count, origins in self.repeated_shapes():
+            lines.append(f"Possible N+1 ({count}x): {shape}\n      from {', '.join(origins)}")
+        return "\n".join(lines)
+
+
+@contextmanager
+def inspect_queries(threshold=N_PLUS_ONE_THRESHOLD):
+    """Record the queries run on every database connection inside the block."""
+    inspector = QueryInspector(threshold=threshold)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(inspector))
+        yield inspector
+
+
+class QueryInspectorMiddleware:
+    """Log likely N+1 query patterns per request. Enabled with QUERY_INSPECTOR=true."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSPECTOR:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with inspect_queries(settings.QUERY_INSPECTOR_THRESHOLD) as inspector:
+            response = self.get_response(request)
+        return self.report(request, response, inspector)
+
+    async def __acall__(self, request):
+        async with in_request_thread(inspect_queries(settings.QUERY_INSPECTOR_THRESHOLD)) as inspector:
+            response = await self.get_response(request)
+        return self.report(request, response, inspector)
+
+    def report(self, request, response, inspector):
+        for shape, count, origins in inspector.repeated_shapes():
+            logger.warning(
+                "Possible N+1 queries",
+                extra={
+                    "path": request.path,
+                    "query_shape": shape,
+                    "query_count": count,
+                    "origins": origins,
+                },
+            )
+        response["X-DB-Query-Count"] = str(inspector.count)
+        return response
@@ -50,17 +50,31 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ],
 }
 
+# Serve guest/register/login with the async views in users/async_views.py (use with ASGI).
+ASYNC_AUTH_VIEWS = os.getenv('ASYNC_AUTH_VIEWS', 'FALSE').lower() == 'true'
+# Upper bound on concurrent password hashes run by the async auth views.
+PASSWORD_HASHING_THREADS = int(os.getenv('PASSWORD_HASHING_THREADS', os.cpu_count() or 2))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=30),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'users.serializers.TokenRefreshSerializer',
 }
 
+# Seconds between syncs of each process's revocation set with the blacklist table (users/revocation.py).
+# A refresh token revoked by another worker can still be used in this one for up to this long;
+# 0 refuses it immediately but costs a blacklist query on every refresh.
+REVOCATION_SYNC_INTERVAL = float(os.getenv('REVOCATION_SYNC_INTERVAL', 5))
+
 MIDDLEWARE = [
+    'Habit_Tracker.metrics.MetricsMiddleware',
+    'Habit_Tracker.query_inspector.QueryInspectorMiddleware',
+    'Habit_Tracker.db_router.PrimaryStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -72,6 +86,20 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'Habit_Tracker.urls'
 
+# Directory for per-worker metric files (Habit_Tracker/metrics.py). Leave empty for a single
+# process; set it whenever several workers serve requests so /metrics reports all of them.
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+
+# /metrics answers only scrapes carrying "Authorization: Bearer <METRICS_TOKEN>" (when set) or
+# coming from these addresses/networks. Behind a reverse proxy REMOTE_ADDR is the proxy, so use the token.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+METRICS_ALLOWED_IPS = [network for network in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if network]
+
+# Log query shapes repeated QUERY_INSPECTOR_THRESHOLD+ times in one request as likely N+1
+# (Habit_Tracker/query_inspector.py). Costs a stack walk per query; keep it off in production.
+QUERY_INSPECTOR = os.getenv('QUERY_INSPECTOR', 'FALSE').lower() == 'true'
+QUERY_INSPECTOR_THRESHOLD = int(os.getenv('QUERY_INSPECTOR_THRESHOLD', 3))
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -94,19 +122,74 @@ WSGI_APPLICATION = 'Habit_Tracker.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections come from a bounded pool per worker process (Habit_Tracker/mysql_pool) and are
+# returned to it at the end of each request. DB_POOL=false falls back to Django's persistent
+# connections, kept for DB_CONN_MAX_AGE seconds and health-checked before reuse.
+DB_POOL = os.getenv('DB_POOL', 'TRUE').lower() == 'true'
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        'ENGINE': 'Habit_Tracker.mysql_pool' if DB_POOL else 'django.db.backends.mysql',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT','3306'),
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': not DB_POOL,
         'OPTIONS': {
             'charset': 'utf8mb4',
         },
     }
 }
+if DB_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        # Keep at or above the worker's thread count; extra threads wait up to DB_POOL_TIMEOUT.
+        'size': int(os.getenv('DB_POOL_SIZE', 4)),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        # Below MySQL's wait_timeout, so the server never drops a connection we still hold.
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 3600)),
+        'ping_after': float(os.getenv('DB_POOL_PING_AFTER', 30)),
+    }
+
+# Optional read replica used by the read-only endpoints (Habit_Tracker/db_router.py).
+# Credentials and database name default to the primary's.
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['Habit_Tracker.db_router.ReplicaRouter']
+# Seconds a user's reads stay on the primary after they write; keep above the replica's usual lag.
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory is private to each process; point CACHE_BACKEND at a shared cache
+# (e.g. django.core.cache.backends.redis.RedisCache) when running several workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'habit-tracker'),
+    }
+}
+
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', 60 * 60))
+# Seconds an authenticated user is served from cache by users.authentication.CachedJWTAuthentication.
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', 60))
+
+# Reminders
+# Callable receiving each minute's batch of habits.reminders.Reminder tuples.
+
+REMINDER_DISPATCHER = os.getenv('REMINDER_DISPATCHER', 'habits.reminders.log_reminders')
 
 
 # Password validation
@@ -156,7 +239,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Logging System Setup
 
-APP_LOG_LEVEL = os.getenv("APP_LOG_LEVEL", "DEBUG")
+APP_LOG_LEVEL = os.getenv("APP_LOG_LEVEL", "INFO")
 DJANGO_LOG_LEVEL = os.getenv("DJANGO_LOG_LEVEL", "INFO")
 API_LOG_LEVEL = os.getenv("API_LOG_LEVEL", "INFO")
 ERROR_LOG_LEVEL = os.getenv("ERROR_LOG_LEVEL", "ERROR")
@@ -164,6 +247,41 @@ ERROR_LOG_LEVEL = os.getenv("ERROR_LOG_LEVEL", "ERROR")
 LOG_DIR = BASE_DIR / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
+# File and console handlers queue records and write them from a background thread
+# (Habit_Tracker/log_handlers.py).
+# LOG_ROTATION is "size" (LOG_MAX_BYTES per file) or "time" (rotated at LOG_ROTATE_WHEN).
+# Each process rotates its own file handle, so with several workers writing the same files
+# rotation is best left to an external tool (set LOG_MAX_BYTES=0 to disable size rotation).
+LOG_ROTATION = os.getenv("LOG_ROTATION", "size")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 5))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+
+# Records each queued handler may hold in memory before new ones are dropped.
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+
+# Fraction of these high-volume INFO messages that are kept (1.0 keeps all). The "sampling"
+# filter is attached to the loggers emitting them, so each record is sampled once.
+LOG_SAMPLE_RATES = {
+    "User login successful": float(os.getenv("LOGIN_LOG_SAMPLE_RATE", 1.0)),
+    "Guest User created successfully": float(os.getenv("GUEST_LOG_SAMPLE_RATE", 1.0)),
+}
+
+
+def _queued_file_handler(filename, level):
+    return {
+        "()": "Habit_Tracker.log_handlers.QueuedRotatingFileHandler",
+        "filename": LOG_DIR / filename,
+        "rotation": LOG_ROTATION,
+        "max_bytes": LOG_MAX_BYTES,
+        "backup_count": LOG_BACKUP_COUNT,
+        "when": LOG_ROTATE_WHEN,
+        "queue_size": LOG_QUEUE_SIZE,
+        "formatter": "json",
+        "level": level,
+    }
+
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -175,38 +293,28 @@ LOGGING = {
         "verbose": {
             "format": "[{levelname}] {asctime} {name} ({pathname}: {lineno}): {message}",
             "style": "{",
-        }
+        },
+        "json": {
+            "()": "Habit_Tracker.log_handlers.JsonFormatter",
+        },
+    },
+    "filters": {
+        "sampling": {
+            "()": "Habit_Tracker.log_handlers.SamplingFilter",
+            "rates": LOG_SAMPLE_RATES,
+        },
     },
     "handlers": {
         "console": {
-            "class": "logging.StreamHandler",
+            "()": "Habit_Tracker.log_handlers.QueuedStreamHandler",
+            "queue_size": LOG_QUEUE_SIZE,
             "formatter": "standard",
             "level": APP_LOG_LEVEL,
         },
-        "debug_file": {
-            "class": "logging.FileHandler",
-            "filename": LOG_DIR / "debug.log",
-            "formatter": "verbose",
-            "level": APP_LOG_LEVEL,
-        },
-        "error_file": {
-            "class": "logging.FileHandler",
-            "filename": LOG_DIR / "error.log",
-            "formatter": "verbose",    
-            "level": ERROR_LOG_LEVEL,
-        },
-        "django_file": {
-            "class": "logging.FileHandler",
-            "filename": LOG_DIR / "django.log",
-            "formatter": "standard",
-            "level": DJANGO_LOG_LEVEL,
-        },
-        "api_file": {
-            "class": "logging.FileHandler",
-            "filename": LOG_DIR / "api.log",
-            "formatter": "standard",
-            "level": API_LOG_LEVEL,
-        },
+        "debug_file": _queued_file_handler("debug.log", APP_LOG_LEVEL),
+        "error_file": _queued_file_handler("error.log", ERROR_LOG_LEVEL),
+        "django_file": _queued_file_handler("django.log", DJANGO_LOG_LEVEL),
+        "api_file": _queued_file_handler("api.log", API_LOG_LEVEL),
     },
     "loggers": {
         "django": {
@@ -224,6 +332,9 @@ LOGGING = {
             "level": APP_LOG_LEVEL,
             "propagate": False,
         },
+        "api.users": {
+            "filters": ["sampling"],
+        },
         "": {
             "handlers": ["debug_file","console"],
             "level": APP_LOG_LEVEL,
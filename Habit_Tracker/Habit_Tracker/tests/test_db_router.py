@@ -0,0 +1,92 @@
+import time
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.db import router, transaction
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from Habit_Tracker import db_router
+from Habit_Tracker.db_router import ReplicaReadMixin, PrimaryStickinessMiddleware, ReplicaRouter, mark_sticky, is_sticky
+from users.models import User
+from habits import dashboard
+from habits.views import DashboardView
+from tasks.models import Task
+
+USER = User(id=42, username="reader")
+
+
+class ReadView(ReplicaReadMixin, APIView):
+    def get(self, request):
+        return Response({"read": router.db_for_read(Task)})
+
+
+class WriteView(APIView):
+    def post(self, request):
+        return Response({"write": router.db_for_write(Task), "read": router.db_for_read(Task)})
+
+
+def call(view, method="get"):
+    request = getattr(APIRequestFactory(), method)("/")
+    force_authenticate(request, user=USER)
+    return PrimaryStickinessMiddleware(lambda request: view.as_view()(request).render())(request).data
+
+@pytest.fixture
+def replica(monkeypatch):
+    monkeypatch.setattr(db_router, "replica_configured", lambda: True)
+    cache.clear()
+    yield
+    cache.clear()
+
+def test_reads_use_replica_in_read_views(replica):
+    assert call(ReadView)["read"] == "replica"
+
+def test_writes_stick_the_user_to_the_primary(replica):
+    assert call(WriteView, "post") == {"write": "default", "read": "default"}
+    assert is_sticky(USER.id)
+    assert call(ReadView)["read"] == "default"
+
+def test_async_requests_are_tracked(replica):
+    async def view(request):
+        return await sync_to_async(lambda: WriteView.as_view()(request).render())()
+
+    request = APIRequestFactory().post("/")
+    force_authenticate(request, user=USER)
+    response = async_to_sync(PrimaryStickinessMiddleware(view))(request)
+
+    assert response.data["write"] == "default"
+    assert is_sticky(USER.id)
+
+def test_cached_dashboards_are_built_from_the_primary(replica, monkeypatch):
+    monkeypatch.setattr(dashboard, "build_dashboard", lambda user_id, day: {"read": router.db_for_read(Task)})
+
+    assert call(DashboardView)["read"] == "default"
+
+def test_sticky_window_expires(replica, settings):
+    settings.REPLICA_STICKY_SECONDS = 0.05
+    mark_sticky(USER.id)
+    time.sleep(0.1)
+
+    assert call(ReadView)["read"] == "replica"
+
+def test_without_replica_everything_uses_default():
+    assert call(ReadView)["read"] == "default"
+    assert not is_sticky(USER.id)
+
+def test_outside_requests_use_default(replica):
+    assert router.db_for_read(Task) == "default"
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_inside_transactions_use_primary(replica):
+    routing = db_router.RequestRouting(use_replica=True)
+    token = db_router._routing.set(routing)
+    try:
+        assert router.db_for_read(Task) == "replica"
+        with transaction.atomic():
+            assert router.db_for_read(Task) == "default"
+    finally:
+        db_router._routing.reset(token)
+
+def test_replica_is_never_migrated():
+    assert ReplicaRouter().allow_migrate("replica", "tasks") is False
+    assert ReplicaRouter().allow_migrate("default", "tasks") is None
@@ -0,0 +1,161 @@
+import io
+import json
+import logging
+import os
+import threading
+import time
+import pytest
+from Habit_Tracker import log_handlers
+from Habit_Tracker.log_handlers import JsonFormatter, QueuedRotatingFileHandler, QueuedStreamHandler, SamplingFilter
+
+
+def make_logger(handler):
+    logger = logging.getLogger(f"test.log_handlers.{id(handler)}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = QueuedRotatingFileHandler(tmp_path / "app.log")
+    handler.setFormatter(JsonFormatter())
+    yield handler
+    handler.close()
+
+
+def test_records_written_as_json_by_listener(handler, tmp_path):
+    logger = make_logger(handler)
+
+    logger.info("User %s logged in", "alice", extra={"user_id": 7})
+    handler.stop()
+
+    [entry] = read_lines(tmp_path / "app.log")
+    assert entry["message"] == "User alice logged in"
+    assert entry["level"] == "INFO"
+    assert entry["user_id"] == 7
+
+
+def test_exception_formatted_on_listener(handler, tmp_path):
+    logger = make_logger(handler)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Failed")
+    handler.stop()
+
+    [entry] = read_lines(tmp_path / "app.log")
+    assert "ValueError: boom" in entry["exc_info"]
+
+
+def test_listener_restarted_in_forked_process(handler, monkeypatch):
+    logger = make_logger(handler)
+    logger.info("parent")
+    parent_listener = handler.listener
+
+    monkeypatch.setattr(log_handlers.os, "getpid", lambda: handler.pid + 1)
+    logger.info("child")
+
+    assert handler.listener is not parent_listener
+    handler.stop()
+    parent_listener.stop()
+
+
+def test_concurrent_first_records_start_one_listener(handler, monkeypatch):
+    starts = []
+    monkeypatch.setattr(handler, "start", lambda: (starts.append(1), time.sleep(0.05), setattr(handler, "pid", os.getpid())))
+    record = logging.makeLogRecord({"msg": "first"})
+
+    threads = [threading.Thread(target=handler.enqueue, args=(record,)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(starts) == 1
+
+
+def test_full_queue_drops_and_reports(tmp_path, monkeypatch):
+    handler = QueuedRotatingFileHandler(tmp_path / "app.log", queue_size=2)
+    monkeypatch.setattr(handler, "pid", os.getpid())
+
+    for number in range(4):
+        handler.enqueue(logging.makeLogRecord({"msg": f"record {number}"}))
+    assert handler.dropped == 2
+    handler.queue.get_nowait()
+    handler.queue.get_nowait()
+    handler.enqueue(logging.makeLogRecord({"msg": "after"}))
+
+    warning = handler.queue.get_nowait()
+    assert (warning.levelname, warning.dropped) == ("WARNING", 2)
+    assert handler.queue.get_nowait().msg == "after"
+    assert handler.dropped == 0
+
+
+def test_size_rotation(tmp_path):
+    handler = QueuedRotatingFileHandler(tmp_path / "app.log", max_bytes=200, backup_count=2)
+    handler.setFormatter(JsonFormatter())
+    logger = make_logger(handler)
+
+    for number in range(20):
+        logger.info("message %s", number)
+    handler.close()
+
+    assert (tmp_path / "app.log.1").exists()
+
+
+def test_console_written_by_listener():
+    class Stream(io.StringIO):
+        def write(self, text):
+            writers.add(threading.current_thread())
+            return super().write(text)
+
+    writers = set()
+    stream = Stream()
+    handler = QueuedStreamHandler(stream)
+    handler.setFormatter(logging.Formatter("{levelname}: {message}", style="{"))
+    logger = make_logger(handler)
+
+    logger.warning("Disk %s full", "/var")
+    handler.close()
+
+    assert stream.getvalue() == "WARNING: Disk /var full\n"
+    assert threading.current_thread() not in writers
+
+def test_unknown_rotation_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        QueuedRotatingFileHandler(tmp_path / "app.log", rotation="weekly")
+
+
+def test_sampling_filter_drops_only_sampled_info(monkeypatch):
+    sampler = SamplingFilter({"User login successful": 0.25})
+    monkeypatch.setattr(log_handlers.random, "random", lambda: 0.5)
+
+    def record(level, msg):
+        return logging.LogRecord("api.users", level, __file__, 1, msg, None, None)
+
+    assert not sampler.filter(record(logging.INFO, "User login successful"))
+    assert sampler.filter(record(logging.WARNING, "User login successful"))
+    assert sampler.filter(record(logging.INFO, "User logout successful"))
+
+
+def test_configured_sampling_decided_once_for_all_handlers(monkeypatch):
+    records = []
+    handlers = [logging.Handler(), logging.Handler()]
+    for capture in handlers:
+        capture.emit = records.append
+    draws = []
+    monkeypatch.setattr(logging.getLogger("api"), "handlers", handlers)
+    monkeypatch.setattr(log_handlers.random, "random", lambda: draws.append(1) or 0.9)
+    [sampler] = [f for f in logging.getLogger("api.users").filters if isinstance(f, SamplingFilter)]
+    monkeypatch.setitem(sampler.rates, "User login successful", 0.5)
+
+    logging.getLogger("api.users").info("User login successful")
+
+    assert (len(draws), records) == (1, [])
@@ -0,0 +1,121 @@
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings as django_settings
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.utils.module_loading import import_string
+from rest_framework.test import APIClient
+from Habit_Tracker import metrics
+from Habit_Tracker.metrics import MetricsMiddleware, MmapStore, render_metrics, sample_key
+from users.models import User
+
+
+@pytest.fixture(autouse=True)
+def fresh_store(settings):
+    settings.METRICS_DIR = ""
+    metrics._store_owner = None
+    yield
+    metrics._store_owner = None
+
+
+def scrape(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    return response.content.decode().splitlines()
+
+
+def test_mmap_store_round_trip_and_growth(tmp_path):
+    path = tmp_path / "worker-1.db"
+    store = MmapStore(path, initial_size=64)
+    keys = [sample_key("requests", {"endpoint": f"endpoint-{number}"}) for number in range(50)]
+    for key in keys:
+        store.inc(key, 1)
+    store.inc(keys[0], 2.5)
+
+    values = MmapStore.read_file(path)
+    assert len(values) == 50
+    assert values[keys[0]] == 3.5
+    assert MmapStore(path).read() == values
+
+@pytest.mark.django_db
+def test_requests_recorded_by_url_name():
+    client = APIClient()
+    user = User.objects.create_user(username="testuser", password="password123")
+    client.post("/auth/api/v1/login/", {"identifier": "testuser", "password": "wrong"})
+    client.force_authenticate(user)
+    client.get("/habits/api/v1/dashboard/")
+
+    lines = scrape(client)
+
+    assert 'http_requests_total{endpoint="login",method="POST",status="400"} 1.0' in lines
+    assert 'http_requests_total{endpoint="dashboard",method="GET",status="200"} 1.0' in lines
+    assert 'http_request_duration_seconds_bucket{endpoint="login",le="+Inf",method="POST"} 1.0' in lines
+    assert 'http_request_duration_seconds_count{endpoint="login",method="POST"} 1.0' in lines
+    assert 'http_request_db_queries_bucket{endpoint="login",le="0.0",method="POST"} 0.0' in lines
+    assert 'http_request_db_queries_bucket{endpoint="login",le="+Inf",method="POST"} 1.0' in lines
+
+def test_unmatched_requests_share_one_label():
+    client = APIClient()
+    client.get("/no-such-page/")
+    client.get("/another-missing-page/")
+
+    assert 'http_requests_total{endpoint="unmatched",method="GET",status="404"} 2.0' in scrape(client)
+
+@pytest.mark.django_db(transaction=True)
+def test_middleware_stays_async_for_async_views():
+    async def view(request):
+        await User.objects.filter(username="nobody").aexists()
+        return HttpResponse(status=204)
+
+    middleware = MetricsMiddleware(view)
+    response = async_to_sync(middleware)(RequestFactory().get("/no-such-page/"))
+
+    assert iscoroutinefunction(middleware)
+    assert response.status_code == 204
+    lines = render_metrics().splitlines()
+    assert 'http_requests_total{endpoint="unmatched",method="GET",status="204"} 1.0' in lines
+    assert 'http_request_db_queries_bucket{endpoint="unmatched",le="0.0",method="GET"} 0.0' in lines
+    assert 'http_request_db_queries_bucket{endpoint="unmatched",le="1.0",method="GET"} 1.0' in lines
+
+@override_settings(QUERY_INSPECTOR=True)
+def test_project_middleware_is_async_capable():
+    for path in django_settings.MIDDLEWARE:
+        assert import_string(path).async_capable, path
+
+def test_worker_files_are_summed(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    other_worker = MmapStore(tmp_path / "worker-999999.db")
+    other_worker.inc(sample_key("http_requests_total", {"endpoint": "metrics", "method": "GET", "status": "200"}), 4)
+
+    client = APIClient()
+    scrape(client)
+
+    assert 'http_requests_total{endpoint="metrics",method="GET",status="200"} 5.0' in scrape(client)
+
+def test_retired_worker_keeps_counters_but_not_gauges(settings, tmp_path):
+    settings.METRICS_DIR = str(tmp_path)
+    worker = MmapStore(tmp_path / "worker-999999.db")
+    worker.inc(sample_key("http_requests_total", {"endpoint": "metrics", "method": "GET", "status": "200"}), 4)
+    worker.inc(sample_key("db_pool_connections", {"alias": "default", "state": "idle"}), 2)
+
+    metrics.retire_worker(999999)
+    lines = scrape(APIClient())
+
+    assert not (tmp_path / "worker-999999.db").exists()
+    assert 'http_requests_total{endpoint="metrics",method="GET",status="200"} 4.0' in lines
+    assert not any(line.startswith("db_pool_connections{") for line in lines)
+
+def test_scrapes_from_other_addresses_are_refused(settings):
+    settings.METRICS_TOKEN = ""
+    client = APIClient(REMOTE_ADDR="203.0.113.7")
+
+    assert client.get("/metrics").status_code == 403
+    settings.METRICS_ALLOWED_IPS = ["203.0.113.0/24"]
+    assert client.get("/metrics").status_code == 200
+
+def test_scrapes_with_the_token_are_allowed_from_anywhere(settings):
+    settings.METRICS_TOKEN = "scrape-secret"
+    client = APIClient(REMOTE_ADDR="203.0.113.7")
+
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code == 403
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret").status_code == 200
@@ -0,0 +1,119 @@
+import itertools
+import threading
+import pytest
+from django.db.backends.mysql import base as mysql_base
+from Habit_Tracker.metrics import collect
+from Habit_Tracker.mysql_pool.base import DatabaseWrapper
+from Habit_Tracker.mysql_pool.pool import ConnectionPool, PoolTimeout
+
+aliases = itertools.count()
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.autocommit_mode = True
+        self.rollbacks = 0
+
+    def ping(self):
+        if self.closed:
+            raise OSError("gone")
+
+    def close(self):
+        self.closed = True
+
+    def autocommit(self, value):
+        self.autocommit_mode = value
+
+    def get_autocommit(self):
+        return self.autocommit_mode
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def samples(name, alias):
+    return {
+        dict(labels).get("result") or dict(labels).get("reason") or dict(labels).get("state"): value
+        for (metric, labels), value in collect().items()
+        if metric == name and dict(labels).get("alias") == alias
+    }
+
+@pytest.fixture
+def pool():
+    return ConnectionPool(f"pool{next(aliases)}", size=1, timeout=0.05)
+
+def test_released_connections_are_reused(pool):
+    first = pool.acquire(FakeConnection)
+    pool.release(first)
+    second = pool.acquire(FakeConnection)
+
+    assert second.raw is first.raw and second.reused
+    assert samples("db_pool_checkouts_total", pool.alias) == {"miss": 1, "hit": 1}
+    assert samples("db_pool_connections", pool.alias) == {"idle": 0, "in_use": 1}
+
+def test_full_pool_waits_then_times_out(pool):
+    held = pool.acquire(FakeConnection)
+
+    with pytest.raises(PoolTimeout):
+        pool.acquire(FakeConnection)
+
+    pool.timeout = 5
+    threading.Timer(0.05, pool.release, [held]).start()
+    assert pool.acquire(FakeConnection).raw is held.raw
+    assert samples("db_pool_checkouts_total", pool.alias)["timeout"] == 1
+    assert sum(value for (metric, labels), value in collect().items()
+               if metric == "db_pool_wait_seconds_count" and dict(labels)["alias"] == pool.alias) == 1
+
+def test_dead_and_expired_connections_are_replaced(pool):
+    pool.ping_after = 0
+    entry = pool.acquire(FakeConnection)
+    pool.release(entry)
+    entry.raw.closed = True
+
+    replacement = pool.acquire(FakeConnection)
+    pool.release(replacement)
+    pool.max_lifetime = 0
+    assert pool.acquire(FakeConnection).raw is not replacement.raw
+
+    assert replacement.raw is not entry.raw and replacement.raw.closed
+    assert samples("db_pool_discarded_total", pool.alias) == {"failed_ping": 1, "expired": 1}
+    assert pool.open == 1
+
+def test_failed_connect_frees_its_slot(pool):
+    def refuse():
+        raise OSError("refused")
+
+    with pytest.raises(OSError):
+        pool.acquire(refuse)
+    assert pool.acquire(FakeConnection).raw is not None
+
+def test_connections_inherited_across_fork_are_left_alone(pool):
+    entry = pool.acquire(FakeConnection)
+    pool.pid = -1
+
+    pool.release(entry)
+
+    assert pool.idle == [] and not entry.raw.closed
+
+def test_backend_returns_connections_to_the_pool(monkeypatch, django_db_blocker):
+    opened, initialized = [], []
+    monkeypatch.setattr(mysql_base.DatabaseWrapper, "get_new_connection", lambda self, params: opened.append(FakeConnection()) or opened[-1])
+    monkeypatch.setattr(mysql_base.DatabaseWrapper, "init_connection_state", lambda self: initialized.append(self))
+    alias = f"pool{next(aliases)}"
+    settings_dict = {
+        "ENGINE": "Habit_Tracker.mysql_pool", "NAME": "habits", "USER": "", "PASSWORD": "", "HOST": "localhost", "PORT": "",
+        "CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False, "AUTOCOMMIT": True, "ATOMIC_REQUESTS": False, "TIME_ZONE": None,
+        "OPTIONS": {"pool": {"size": 2}}, "TEST": {},
+    }
+
+    with django_db_blocker.unblock():
+        for _ in range(3):
+            wrapper = DatabaseWrapper(settings_dict, alias)
+            assert "pool" not in wrapper.get_connection_params()
+            wrapper.connect()
+            wrapper.connection.autocommit(False)
+            wrapper.close()
+
+    assert len(opened) == 1 and len(initialized) == 1
+    assert opened[0].rollbacks == 3 and not opened[0].closed
@@ -0,0 +1,109 @@
+import logging
+import pytest
+from asgiref.sync import async_to_sync
+from datetime import date
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework.test import APIClient
+from Habit_Tracker.query_inspector import QueryInspectorMiddleware, query_shape
+from habits.models import Habit
+from tasks.models import Task
+from users.models import User
+from users.revocation import revocations
+from users.tokens import RefreshToken
+
+
+def test_query_shape_collapses_literals_and_in_lists():
+    assert query_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'") == \
+        query_shape("SELECT * FROM t WHERE id IN (%s) AND name = 'y'").replace("(?)", "(...)")
+    assert query_shape('SELECT "t"."id" FROM "t" WHERE "t"."id" = 12') == 'SELECT "t"."id" FROM "t" WHERE "t"."id" = ?'
+
+@pytest.mark.django_db
+class TestEndpointQueryBudgets:
+    """Query budgets per endpoint; raising one should be a deliberate change."""
+    def setup_method(self):
+        cache.clear()
+        revocations.reset()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.refresh = RefreshToken.for_user(self.user)
+        habits = [Habit.objects.create(user=self.user, title=f"Habit {number}") for number in range(5)]
+        self.tasks = [Task.objects.create(user=self.user, habit=habit, description="Do it", date=date.today()) for habit in habits]
+
+    def authenticate(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}")
+
+    def test_guest(self, query_budget):
+        with query_budget(4):
+            assert self.client.post("/auth/api/v1/guest/").status_code == 201
+
+    def test_register(self, query_budget):
+        with query_budget(4):
+            response = self.client.post(
+                "/auth/api/v1/register/", {"username": "newuser", "email": "new@example.com", "password": "password123"}
+            )
+        assert response.status_code == 201
+
+    def test_login(self, query_budget):
+        with query_budget(2):
+            response = self.client.post("/auth/api/v1/login/", {"identifier": "testuser", "password": "password123"})
+        assert response.status_code == 200
+
+    def test_token_refresh(self, query_budget):
+        with query_budget(4):
+            response = self.client.post("/auth/api/v1/token/refresh/", {"refresh": str(self.refresh)})
+        assert response.status_code == 200
+
+    def test_dashboard(self, query_budget):
+        self.authenticate()
+        with query_budget(3):
+            assert self.client.get("/habits/api/v1/dashboard/").status_code == 200
+
+    def test_task_history(self, query_budget):
+        self.authenticate()
+        with query_budget(2):
+            assert self.client.get("/tasks/api/v1/history/").status_code == 200
+
+    def test_batch_status(self, query_budget):
+        self.authenticate()
+        with query_budget(12):
+            response = self.client.post(
+                "/tasks/api/v1/batch-status/", {"tasks": [{"id": task.id, "status": "done"} for task in self.tasks]}, format="json"
+            )
+        assert response.status_code == 200
+
+@pytest.mark.django_db
+@override_settings(QUERY_INSPECTOR=True)
+def test_middleware_logs_repeated_queries(caplog):
+    user = User.objects.create_user(username="testuser", password="password123")
+    for number in range(3):
+        Habit.objects.create(user=user, title=f"Habit {number}")
+
+    def view(request):
+        return HttpResponse(", ".join(str(habit) for habit in Habit.objects.all()))
+
+    with caplog.at_level(logging.WARNING, logger="api.queries"):
+        response = QueryInspectorMiddleware(view)(RequestFactory().get("/habits/"))
+
+    assert response["X-DB-Query-Count"] == "4"
+    [record] = caplog.records
+    assert record.query_count == 3
+    assert record.origins == ["habits/models.py:25 in __str__"]
+
+@override_settings(QUERY_INSPECTOR=True)
+@pytest.mark.django_db(transaction=True)
+def test_middleware_counts_queries_of_async_views():
+    async def view(request):
+        await Habit.objects.acount()
+        return HttpResponse()
+
+    response = async_to_sync(QueryInspectorMiddleware(view))(RequestFactory().get("/habits/"))
+
+    assert response["X-DB-Query-Count"] == "1"
+
+@override_settings(QUERY_INSPECTOR=False)
+def test_middleware_disabled_by_default():
+    with pytest.raises(MiddlewareNotUsed):
+        QueryInspectorMiddleware(lambda request: HttpResponse())
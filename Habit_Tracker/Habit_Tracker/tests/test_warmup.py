@@ -0,0 +1,57 @@
+import os
+import runpy
+import pytest
+from types import SimpleNamespace
+from django.conf import settings as django_settings
+from habits.views import DashboardView
+from users.revocation import revocations
+from Habit_Tracker import warmup
+
+
+@pytest.fixture(autouse=True)
+def fresh_revocations():
+    yield
+    revocations.reset()
+
+def test_view_classes_found_through_includes():
+    assert DashboardView in set(warmup.view_classes())
+
+@pytest.mark.django_db
+def test_warm_up_runs_every_step():
+    results = warmup.warm_up()
+
+    assert list(results) == ["urls", "views", "serializers", "database"]
+    assert results["views"][0] >= 10
+    assert revocations.filter is not None
+
+@pytest.mark.django_db
+def test_failed_step_is_skipped(monkeypatch, caplog):
+    def unreachable():
+        raise OSError("database unreachable")
+
+    monkeypatch.setattr(warmup, "STEPS", [("database", unreachable), ("urls", warmup.warm_urls)])
+
+    assert list(warmup.warm_up()) == ["urls"]
+    assert "Warm-up step failed" in caplog.text
+
+def test_gunicorn_refuses_several_workers_with_a_local_cache(settings, monkeypatch, tmp_path):
+    # The config sets these defaults in os.environ; let monkeypatch restore them.
+    monkeypatch.setenv("DB_POOL_SIZE", "2")
+    monkeypatch.setenv("METRICS_DIR", str(tmp_path))
+    monkeypatch.setenv("DJANGO_SETTINGS_MODULE", django_settings.SETTINGS_MODULE)
+    config = runpy.run_path(str(django_settings.BASE_DIR / "gunicorn.conf.py"))
+    server = SimpleNamespace(cfg=SimpleNamespace(workers=3))
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+    with pytest.raises(RuntimeError, match="CACHE_BACKEND"):
+        config["on_starting"](server)
+
+    server.cfg.workers = 1
+    config["on_starting"](server)
+
+def test_gunicorn_shares_metrics_between_workers_by_default(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "2")
+    monkeypatch.delenv("METRICS_DIR", raising=False)
+    runpy.run_path(str(django_settings.BASE_DIR / "gunicorn.conf.py"))
+
+    assert os.environ["METRICS_DIR"].endswith("habit-tracker-metrics")
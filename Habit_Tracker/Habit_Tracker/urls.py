@@ -16,9 +16,13 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from Habit_Tracker.metrics import metrics_view
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls')),
+    path('habits/', include('habits.urls')),
+    path('tasks/', include('tasks.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
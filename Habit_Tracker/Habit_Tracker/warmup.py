@@ -0,0 +1,109 @@
+"""
+Per-worker warm-up, run by gunicorn before a worker accepts traffic (see gunicorn.conf.py).
+
+With ``preload_app`` the master has already imported every app and module. What is left is
+state Django and DRF build lazily in each process on the first request that needs it:
+
+- the URL resolver's lookup tables;
+- each API view's authentication, permission, renderer, parser and throttle classes,
+  which DRF imports from settings on first use;
+- serializer field maps, built from model introspection the first time a serializer's
+  ``fields`` is read;
+- database connections (a pool checkout, the server version check and session setup)
+  and the in-memory token revocation filter.
+
+Each step is timed and logged. Failures are logged and skipped, so a database that is
+briefly unreachable slows the first requests down but does not stop workers booting.
+"""
+import inspect
+import logging
+import time
+from importlib import import_module
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils.module_loading import module_has_submodule
+from rest_framework.serializers import BaseSerializer
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+
+def project_apps():
+    base_dir = str(settings.BASE_DIR)
+    return [config for config in apps.get_app_configs() if config.path.startswith(base_dir)]
+
+
+def view_classes(patterns=None):
+    """Every class-based view reachable from the root URLconf."""
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        if isinstance(pattern, URLResolver):
+            yield from view_classes(pattern.url_patterns)
+        elif isinstance(pattern, URLPattern) and hasattr(pattern.callback, "view_class"):
+            yield pattern.callback.view_class
+
+
+def warm_urls():
+    resolver = get_resolver()
+    resolver.reverse_dict
+    return len(resolver.url_patterns)
+
+
+def warm_views():
+    warmed = 0
+    for view_class in set(view_classes()):
+        if issubclass(view_class, APIView):
+            view = view_class()
+            view.get_authenticators()
+            view.get_permissions()
+            view.get_renderers()
+            view.get_parsers()
+            view.get_throttles()
+            warmed += 1
+    return warmed
+
+
+def warm_serializers():
+    warmed = 0
+    for config in project_apps():
+        if not module_has_submodule(config.module, "serializers"):
+            continue
+        module = import_module(f"{config.name}.serializers")
+        for _, serializer_class in inspect.getmembers(module, inspect.isclass):
+            if issubclass(serializer_class, BaseSerializer) and serializer_class.__module__ == module.__name__:
+                serializer = serializer_class()
+                getattr(serializer, "fields", None)
+                warmed += 1
+    return warmed
+
+
+def warm_database():
+    from users.revocation import revocations
+
+    for connection in connections.all():
+        connection.ensure_connection()
+    revocations.load()
+    # Hands pooled connections back, open, for the first requests to pick up.
+    for connection in connections.all(initialized_only=True):
+        if not connection.in_atomic_block:
+            connection.close()
+    return len(settings.DATABASES)
+
+
+STEPS = [("urls", warm_urls), ("views", warm_views), ("serializers", warm_serializers), ("database", warm_database)]
+
+
+def warm_up():
+    """Run every warm-up step; returns ``{step: (result, seconds)}`` for the steps that succeeded."""
+    results = {}
+    for name, step in STEPS:
+        started = time.perf_counter()
+        try:
+            result = step()
+        except Exception:
+            logger.exception("Warm-up step failed", extra={"step": name})
+            continue
+        results[name] = (result, round(time.perf_counter() - started, 4))
+    logger.info("Worker warmed up", extra={"steps": results})
+    return results
@@ -0,0 +1,3 @@
+from benchmarks.api import main
+
+main()
@@ -0,0 +1,260 @@
+"""
+API and model hot-path benchmark.
+
+Runs each operation through the full request stack (middleware, authentication,
+serializers) against a throwaway database and reports throughput, latency percentiles and
+queries per operation. Dashboard reads are measured cold and warm after seeding the task
+table to each ``--scales`` size.
+
+    python -m benchmarks --sqlite /tmp/bench.sqlite3
+    python -m benchmarks --sqlite /tmp/bench.sqlite3 --save-baseline /tmp/local.json
+    python -m benchmarks --sqlite /tmp/bench.sqlite3 --baseline /tmp/local.json
+
+The run exits non-zero when an operation runs more queries than the baseline recorded, or
+its p50 or p95 grows by more than ``--tolerance``. Timings only compare meaningfully against
+a baseline taken on the same machine and database, so the committed default,
+benchmarks/baseline.json, records queries per operation only. Regenerate it with
+``--save-baseline benchmarks/baseline.json --queries-only`` when a change is meant to alter
+an operation's queries, and pass ``--baseline ''`` to skip the comparison.
+"""
+import argparse
+import itertools
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+import time
+from benchmarks.harness import add_database_arguments, setup_django, benchmark_database, time_calls, summarize
+from benchmarks.indexes import seed
+
+PASSWORD = "bench-password-123"
+HABITS_PER_USER = 5
+DAYS = 100
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# Queries per operation are averages, which move a little with --repeat and the random
+# task flips; a regression has to add more than this many queries per call to count.
+QUERY_SLACK = 0.5
+
+
+def run_operation(func, repeat, setup=None):
+    """Time ``func`` and count the queries of every call, after one untimed warm-up call."""
+    from Habit_Tracker.query_inspector import inspect_queries
+
+    func(*((setup(),) if setup else ()))
+    counts = []
+
+    def counted(*args):
+        with inspect_queries() as inspector:
+            func(*args)
+        counts.append(inspector.count)
+
+    started = time.perf_counter()
+    samples = time_calls(counted, repeat, setup)
+    elapsed = time.perf_counter() - started
+    return {
+        **summarize(samples),
+        "throughput_per_s": round(len(samples) / sum(samples), 1),
+        "wall_s": round(elapsed, 3),
+        "queries_per_op": round(sum(counts) / len(counts), 2),
+    }
+
+
+def expect(response, status_code):
+    if response.status_code != status_code:
+        raise RuntimeError(f"Expected {status_code}, got {response.status_code}: {response.content[:200]!r}")
+    return response
+
+
+def auth_operations(client):
+    """(name, func, setup) triples for the auth endpoints."""
+    from users.models import User
+    from users.tokens import RefreshToken
+
+    user = User.objects.create_user(username="bench_member", email="bench@example.com", password=PASSWORD)
+    counter = itertools.count()
+
+    def new_registration():
+        number = next(counter)
+        return {"username": f"bench_new_{number}", "email": f"bench_new_{number}@example.com", "password": PASSWORD}
+
+    def new_refresh():
+        return RefreshToken.for_user(user)
+
+    def logout(refresh):
+        expect(client.post(
+            "/auth/api/v1/logout/", {"refresh_token": str(refresh)},
+            HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}",
+        ), 204)
+
+    return [
+        ("guest", lambda: expect(client.post("/auth/api/v1/guest/"), 201), None),
+        ("register", lambda data: expect(client.post("/auth/api/v1/register/", data), 201), new_registration),
+        ("login_username", lambda: expect(client.post(
+            "/auth/api/v1/login/", {"identifier": user.username, "password": PASSWORD}), 200), None),
+        ("login_email", lambda: expect(client.post(
+            "/auth/api/v1/login/", {"identifier": user.email, "password": PASSWORD}), 200), None),
+        ("token_refresh", lambda refresh: expect(client.post(
+            "/auth/api/v1/token/refresh/", {"refresh": str(refresh)}), 200), new_refresh),
+        ("logout", logout, new_refresh),
+    ]
+
+
+def streak_operation(rng):
+    """Toggle one task's status per call; the Task signal applies the streak transition."""
+    from datetime import date, timedelta
+    from users.models import User
+    from habits.models import Habit
+    from tasks.models import Task
+
+    user = User.objects.create_user(username="bench_streaks", password=None)
+    habit = Habit.objects.create(user=user, title="Streak bench")
+    today = date.today()
+    Task.objects.bulk_create(
+        [Task(user=user, habit=habit, description="Bench", date=today - timedelta(days=offset)) for offset in range(DAYS)]
+    )
+    tasks = list(Task.objects.filter(habit=habit))
+
+    def flip():
+        task = rng.choice(tasks)
+        task.status = "pending" if task.status == "done" else "done"
+        return task
+
+    return ("streak_update", lambda task: task.save(), flip)
+
+
+def dashboard_operations(client, scale, rng):
+    """Cold (cache cleared before each call) and warm dashboard reads for random seeded users."""
+    from django.core.cache import cache
+    from users.models import User
+    from tasks.models import Task
+    from habits.dashboard import get_dashboard
+
+    missing = scale - Task.objects.count()
+    seed(max(1, math.ceil(missing / (HABITS_PER_USER * DAYS))), HABITS_PER_USER, DAYS, rng, prefix=f"scale{scale}")
+    user_ids = list(User.objects.filter(username__startswith=f"scale{scale}_").values_list("id", flat=True))
+    users_by_id = User.objects.in_bulk(user_ids)
+
+    def read(user):
+        client.force_authenticate(user)
+        expect(client.get("/habits/api/v1/dashboard/"), 200)
+
+    def cold_user():
+        cache.clear()
+        return users_by_id[rng.choice(user_ids)]
+
+    def warm_user():
+        user = users_by_id[user_ids[0]]
+        get_dashboard(user.id)
+        return user
+
+    return [
+        (f"dashboard_cold_{scale}", read, cold_user),
+        (f"dashboard_warm_{scale}", read, warm_user),
+    ]
+
+
+def parse_scale(value):
+    multipliers = {"k": 1000, "m": 1000000}
+    value = value.strip().lower()
+    if value[-1:] in multipliers:
+        return int(float(value[:-1]) * multipliers[value[-1]])
+    return int(value)
+
+
+def compare(results, baseline, tolerance):
+    """Human-readable regressions against ``baseline``; empty when none."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            continue
+        if result["queries_per_op"] > previous["queries_per_op"] + QUERY_SLACK:
+            regressions.append(f"{name}: queries/op {previous['queries_per_op']} -> {result['queries_per_op']}")
+        for key in ("p50_ms", "p95_ms"):
+            if key in previous and result[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {previous[key]} -> {result[key]} (+{result[key] / previous[key] - 1:.0%})")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'operation':<28}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}")
+    for name, result in report["results"].items():
+        print(
+            f"{name:<28}{result['throughput_per_s']:>10}{result['p50_ms']:>10}{result['p95_ms']:>10}"
+            f"{result['p99_ms']:>10}{result['queries_per_op']:>9}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=100, help="Timed calls per operation.")
+    parser.add_argument("--scales", default="1k,100k,1m", help="Comma-separated task-table sizes for the dashboard reads.")
+    parser.add_argument("--only", help="Comma-separated operation name prefixes to run (e.g. login,dashboard).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", metavar="PATH", default=DEFAULT_BASELINE,
+                        help="Fail if results regress against this report (default: benchmarks/baseline.json).")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed latency growth over the baseline (0.25 = 25%%).")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write this run's report to PATH.")
+    parser.add_argument("--queries-only", action="store_true",
+                        help="Save only queries per operation, which hold on any machine.")
+    options = parser.parse_args(argv)
+
+    setup_django(options)
+    from django.test.utils import setup_test_environment
+    from rest_framework.test import APIClient
+
+    setup_test_environment()
+    # Per-request INFO lines would bury the report; warnings and errors still show.
+    logging.disable(logging.INFO)
+    rng = random.Random(options.seed)
+    prefixes = tuple(options.only.split(",")) if options.only else ("",)
+    scales = sorted(parse_scale(scale) for scale in options.scales.split(","))
+
+    with benchmark_database(keepdb=options.keepdb) as connection:
+        client = APIClient()
+        operations = auth_operations(client) + [streak_operation(rng)]
+        results = {}
+        for name, func, setup in operations:
+            if name.startswith(prefixes):
+                results[name] = run_operation(func, options.repeat, setup)
+        if any("dashboard".startswith(prefix) or prefix.startswith("dashboard") for prefix in prefixes):
+            for scale in scales:
+                for name, func, setup in dashboard_operations(client, scale, rng):
+                    if name.startswith(prefixes):
+                        results[name] = run_operation(func, options.repeat, setup)
+        vendor = connection.vendor
+
+    report = {
+        "meta": {"database": vendor, "python": platform.python_version(), "repeat": options.repeat, "scales": scales},
+        "results": results,
+    }
+    print_report(report)
+
+    if options.save_baseline:
+        saved = report
+        if options.queries_only:
+            saved = {
+                "meta": {key: report["meta"][key] for key in ("database", "repeat", "scales")},
+                "results": {name: {"queries_per_op": result["queries_per_op"]} for name, result in results.items()},
+            }
+        with open(options.save_baseline, "w") as handle:
+            json.dump(saved, handle, indent=2)
+            handle.write("\n")
+
+    if options.baseline:
+        with open(options.baseline) as handle:
+            regressions = compare(results, json.load(handle), options.tolerance)
+        if regressions:
+            print("\nREGRESSIONS against " + options.baseline, file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            sys.exit(1)
+        print(f"\nNo regressions against {options.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
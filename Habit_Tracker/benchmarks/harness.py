@@ -0,0 +1,93 @@
+"""
+Shared plumbing for the benchmark scripts.
+
+Benchmarks run from the directory holding ``manage.py`` (``python -m benchmarks`` for the API
+suite, ``python -m benchmarks.<name>`` for the others)
+against a freshly migrated throwaway database, created and dropped the same way the
+test runner does, so they never touch real data.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+
+def add_database_arguments(parser):
+    parser.add_argument("--sqlite", metavar="PATH", help="Use this SQLite file (recreated) instead of the configured database.")
+    parser.add_argument("--keepdb", action="store_true", help="Keep the benchmark database between runs.")
+
+
+def setup_django(options):
+    """Configure settings (optionally pointing at SQLite) and initialise Django."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Habit_Tracker.settings")
+    from django.conf import settings
+
+    if options.sqlite:
+        settings.DATABASES = {
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": options.sqlite,
+                "TEST": {"NAME": options.sqlite},
+            }
+        }
+
+    import django
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """Create a migrated throwaway database for the duration of the block."""
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def analyze(models):
+    """Refresh planner statistics so EXPLAIN reflects the seeded data."""
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute("ANALYZE")
+        elif connection.vendor == "mysql":
+            tables = ", ".join(connection.ops.quote_name(model._meta.db_table) for model in models)
+            cursor.execute(f"ANALYZE TABLE {tables}")
+            cursor.fetchall()
+
+
+def time_calls(func, repeat, setup=None):
+    """
+    Call ``func`` ``repeat`` times and return the wall-clock duration of each call in seconds.
+
+    When ``setup`` is given it runs untimed before every call and its result is passed to ``func``.
+    """
+    samples = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(samples):
+    """Latency summary in milliseconds."""
+    return {
+        "calls": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
@@ -0,0 +1,150 @@
+"""
+Index benchmark for the habit, task and streak access paths.
+
+Seeds a throwaway database, then reports EXPLAIN plans and timings for the hot queries
+with the composite indexes in place ("after") and again with them dropped, leaving only
+the implicit foreign-key indexes ("before").
+
+    python -m benchmarks.indexes --sqlite /tmp/bench.sqlite3 --users 500 --days 180
+"""
+import argparse
+import json
+import random
+from datetime import date, timedelta
+from benchmarks.harness import add_database_arguments, setup_django, benchmark_database, analyze, time_calls, summarize
+
+
+def seed(users, habits_per_user, days, rng, batch_size=5000, prefix="bench"):
+    from users.models import User
+    from habits.models import Habit
+    from tasks.models import Task
+    from streaks.models import StreakRecord
+
+    today = date.today()
+    User.objects.bulk_create(
+        [User(username=f"{prefix}_{number}", password="!") for number in range(users)], batch_size=batch_size
+    )
+    user_ids = list(User.objects.filter(username__startswith=f"{prefix}_").values_list("id", flat=True))
+
+    Habit.objects.bulk_create(
+        [
+            Habit(user_id=user_id, title=f"Habit {number}", is_active=rng.random() < 0.8)
+            for user_id in user_ids
+            for number in range(habits_per_user)
+        ],
+        batch_size=batch_size,
+    )
+    habits = list(Habit.objects.filter(user_id__in=user_ids).values_list("id", "user_id"))
+
+    batch = []
+    for habit_id, user_id in habits:
+        for offset in range(days):
+            status = "done" if rng.random() < 0.7 else "pending"
+            batch.append(Task(user_id=user_id, habit_id=habit_id, description="Bench", date=today - timedelta(days=offset), status=status))
+            if len(batch) >= batch_size:
+                Task.objects.bulk_create(batch)
+                batch = []
+    Task.objects.bulk_create(batch)
+
+    StreakRecord.objects.bulk_create(
+        [
+            StreakRecord(habit_id=habit_id, current_streak=1, longest_streak=1, last_completed_date=today - timedelta(days=rng.randrange(days)))
+            for habit_id, _ in habits
+        ],
+        batch_size=batch_size,
+    )
+    analyze([User, Habit, Task, StreakRecord])
+    return user_ids, [habit_id for habit_id, _ in habits]
+
+
+def hot_queries(user_ids, habit_ids, rng):
+    """(name, queryset factory) pairs; each call picks a random user or habit."""
+    from habits.models import Habit
+    from tasks.models import Task
+    from streaks.models import StreakRecord
+
+    today = date.today()
+    return [
+        ("today_tasks_for_user", lambda: Task.objects.filter(user_id=rng.choice(user_ids), date=today)),
+        ("user_tasks_last_week", lambda: Task.objects.filter(user_id=rng.choice(user_ids), date__gte=today - timedelta(days=7))),
+        ("habit_done_last_month", lambda: Task.objects.filter(habit_id=rng.choice(habit_ids), date__gte=today - timedelta(days=30), status="done")),
+        ("active_habits_for_user", lambda: Habit.objects.filter(user_id=rng.choice(user_ids), is_active=True)),
+        ("streaks_completed_today", lambda: StreakRecord.objects.filter(last_completed_date=today).values_list("habit_id", flat=True)),
+    ]
+
+
+def measure(queries, repeat):
+    results = {}
+    for name, make_queryset in queries:
+        results[name] = {
+            "explain": make_queryset().explain(),
+            **summarize(time_calls(lambda: list(make_queryset()), repeat)),
+        }
+    return results
+
+
+def drop_composite_indexes():
+    """
+    Drop the indexes and constraints declared in the models' Meta, leaving the foreign-key indexes.
+
+    Only indexes are removed, not columns added alongside them, so the hot queries run
+    unchanged against both schemas.
+    """
+    from django.db import connection
+    from habits.models import Habit
+    from tasks.models import Task
+    from streaks.models import StreakRecord
+
+    models = [Habit, Task, StreakRecord]
+    with connection.schema_editor() as editor:
+        for model in models:
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+            for constraint in model._meta.constraints:
+                editor.remove_constraint(model, constraint)
+    analyze(models)
+
+
+def print_report(report):
+    print(f"Seeded {report['users']} users, {report['habits']} habits, {report['tasks']} tasks")
+    for name, after in report["after"].items():
+        before = report["before"][name]
+        speedup = before["p50_ms"] / after["p50_ms"] if after["p50_ms"] else float("inf")
+        print(f"\n== {name}: p50 {before['p50_ms']}ms -> {after['p50_ms']}ms ({speedup:.1f}x), "
+              f"p95 {before['p95_ms']}ms -> {after['p95_ms']}ms")
+        print(f"-- before:\n{before['explain']}")
+        print(f"-- after:\n{after['explain']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--habits-per-user", type=int, default=5)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=200, help="Timed calls per query.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report to this file.")
+    options = parser.parse_args(argv)
+
+    setup_django(options)
+    rng = random.Random(options.seed)
+
+    with benchmark_database(keepdb=options.keepdb):
+        from tasks.models import Task
+
+        user_ids, habit_ids = seed(options.users, options.habits_per_user, options.days, rng)
+        queries = hot_queries(user_ids, habit_ids, rng)
+        report = {"users": len(user_ids), "habits": len(habit_ids), "tasks": Task.objects.count()}
+        report["after"] = measure(queries, options.repeat)
+        drop_composite_indexes()
+        report["before"] = measure(queries, options.repeat)
+
+    print_report(report)
+    if options.json:
+        with open(options.json, "w") as handle:
+            json.dump(report, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
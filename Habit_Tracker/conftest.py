@@ -0,0 +1,20 @@
+from contextlib import contextmanager
+import pytest
+from Habit_Tracker.query_inspector import N_PLUS_ONE_THRESHOLD, inspect_queries
+
+
+@pytest.fixture
+def query_budget(db):
+    """
+    Context manager failing the test when the block runs more than ``max_queries`` queries
+    or repeats a query shape ``threshold`` times (a likely N+1). The failure lists every query
+    with the project line that issued it.
+    """
+    @contextmanager
+    def budget(max_queries, threshold=N_PLUS_ONE_THRESHOLD):
+        with inspect_queries(threshold) as inspector:
+            yield inspector
+        assert inspector.count <= max_queries, f"Query budget of {max_queries} exceeded. {inspector.report()}"
+        assert not inspector.repeated_shapes(), f"Repeated query shapes. {inspector.report()}"
+
+    return budget
@@ -0,0 +1,88 @@
+"""
+Gunicorn settings for production. From this directory:
+
+    gunicorn Habit_Tracker.wsgi
+
+Gunicorn reads ./gunicorn.conf.py automatically. Each value below can be changed through
+its GUNICORN_* environment variable, or overridden on the command line.
+
+- Workers and threads are sized from the CPU cores this process may run on.
+- The app is loaded once in the master (``preload_app``) and forked, so workers start
+  with every module imported. Each worker then runs ``Habit_Tracker.warmup`` before it
+  accepts traffic.
+- Workers are recycled after ``max_requests`` requests. The jitter spreads restarts out,
+  so workers do not all go cold at the same moment.
+- With more than one worker the cache must be shared (CACHE_BACKEND): dashboard and auth
+  cache invalidation and replica stickiness only work across workers through it. The
+  server refuses to start with the per-process LocMemCache and several workers.
+- Workers write their metrics to files under METRICS_DIR, so /metrics reports all of them
+  whichever worker answers the scrape. It defaults to a directory under the system temp dir.
+"""
+import glob
+import os
+import tempfile
+
+
+def _cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", 2 * _cores() + 1))
+threads = int(os.getenv("GUNICORN_THREADS", 2))
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = True
+
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG")
+
+# Every thread of a worker can hold a pooled DB connection (Habit_Tracker/mysql_pool).
+# This is set before the app, and with it settings, is loaded.
+os.environ.setdefault("DB_POOL_SIZE", str(threads))
+# Per-worker metric files (Habit_Tracker/metrics.py); without them each scrape sees one worker.
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), "habit-tracker-metrics"))
+
+
+def on_starting(server):
+    """Check the cache is shared between workers, then drop metric files left by the previous run (Habit_Tracker/metrics.py)."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Habit_Tracker.settings")
+    from django.conf import settings
+
+    backend = settings.CACHES["default"]["BACKEND"]
+    if server.cfg.workers > 1 and backend == "django.core.cache.backends.locmem.LocMemCache":
+        raise RuntimeError(
+            f"{server.cfg.workers} workers would each have their own LocMemCache, serving stale dashboards "
+            "and auth entries. Set CACHE_BACKEND to a shared cache, or GUNICORN_WORKERS=1."
+        )
+
+    metrics_dir = os.getenv("METRICS_DIR")
+    if metrics_dir:
+        for path in glob.glob(os.path.join(metrics_dir, "worker-*.db")):
+            os.remove(path)
+
+
+def post_fork(server, worker):
+    """Connections opened in the master while preloading must not be shared with workers."""
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    from Habit_Tracker.warmup import warm_up
+
+    warm_up()
+
+
+def child_exit(server, worker):
+    from Habit_Tracker.metrics import retire_worker
+
+    retire_worker(worker.pid)
@@ -0,0 +1,88 @@
+"""
+Per-user "today" dashboard served from Django's cache.
+
+Entries are keyed on user, day and the user's dashboard generation, and filled on first
+read. Invalidation deletes the generation, so the next read starts a new one and misses.
+A read that loaded the old rows before the change committed still stores its entry, but
+under the old generation, where nothing looks it up again. Deleting the entry itself
+would let that read put the stale dashboard back for DASHBOARD_CACHE_TIMEOUT.
+
+The signal handlers in ``habits.signals`` invalidate whenever one of the user's habits,
+tasks or streak records changes.
+"""
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from habits.models import Habit
+from tasks.models import Task
+from streaks.engine import current_streak_on
+
+
+def dashboard_generation_key(user_id):
+    return f"dashboard-generation:{user_id}"
+
+
+def dashboard_cache_key(user_id, day, generation):
+    return f"dashboard:{user_id}:{generation}:{day.isoformat()}"
+
+
+def dashboard_generation(user_id):
+    """The user's current generation, starting a new one (unique per start) if there is none."""
+    key = dashboard_generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        candidate = time.time_ns()
+        generation = candidate if cache.add(key, candidate, None) else cache.get(key, candidate)
+    return generation
+
+
+def build_dashboard(user_id, day):
+    """Load the dashboard from the database with one query for habits (joined with streaks) and one for tasks."""
+    habits = (
+        Habit.objects.filter(user_id=user_id, is_active=True)
+        .order_by("id")
+        .values(
+            "id", "title", "reminder_time", "end_date",
+            "streak_record__current_streak", "streak_record__longest_streak", "streak_record__last_completed_date",
+        )
+    )
+    tasks = Task.objects.filter(user_id=user_id, date=day).order_by("id").values("id", "habit_id", "description", "status")
+
+    return {
+        "date": day,
+        "habits": [
+            {
+                "id": habit["id"],
+                "title": habit["title"],
+                "reminder_time": habit["reminder_time"],
+                "end_date": habit["end_date"],
+                "current_streak": current_streak_on(
+                    habit["streak_record__current_streak"] or 0, habit["streak_record__last_completed_date"], day
+                ),
+                "longest_streak": habit["streak_record__longest_streak"] or 0,
+                "last_completed_date": habit["streak_record__last_completed_date"],
+            }
+            for habit in habits
+        ],
+        "tasks": [
+            {"id": task["id"], "habit": task["habit_id"], "description": task["description"], "status": task["status"]}
+            for task in tasks
+        ],
+    }
+
+
+def get_dashboard(user_id):
+    """Return today's dashboard for a user, building and caching it on a miss."""
+    day = timezone.localdate()
+    key = dashboard_cache_key(user_id, day, dashboard_generation(user_id))
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_dashboard(user_id, day)
+        cache.set(key, dashboard, settings.DASHBOARD_CACHE_TIMEOUT)
+    return dashboard
+
+
+def invalidate_dashboard(*user_ids):
+    """Retire the cached dashboards of the given users by deleting their generations."""
+    cache.delete_many([dashboard_generation_key(user_id) for user_id in user_ids if user_id is not None])
@@ -0,0 +1,83 @@
+"""
+Streaming export of a user's habits, tasks and streak records.
+
+Rows are read with ``values_list`` in keyset pages of ``EXPORT_CHUNK_SIZE`` ordered by
+primary key and encoded page by page, so memory stays flat however long the history is.
+Keyset pages are used instead of ``.iterator()`` because MySQLdb buffers a whole result
+set on the client.
+
+CSV output has one section per record type: a header row starting with ``record``, then
+that type's rows, each starting with the record type. NDJSON output is one object per
+line with a ``record`` key. With ``compress`` the stream is gzipped as it is produced.
+"""
+import csv
+import io
+import zlib
+from django.core.serializers.json import DjangoJSONEncoder
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import StreakRecord
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# (record type, model, lookup to the owning user, exported fields)
+SECTIONS = [
+    ("habit", Habit, "user_id", ["id", "title", "description", "created_on", "end_date", "reminder_enabled", "reminder_time", "is_active"]),
+    ("task", Task, "user_id", ["id", "habit_id", "date", "description", "status"]),
+    ("streak", StreakRecord, "habit__user_id", ["habit_id", "current_streak", "longest_streak", "last_completed_date"]),
+]
+
+
+def pages(queryset, fields, chunk_size):
+    """Lists of ``fields`` tuples, one keyset page of ``chunk_size`` rows at a time."""
+    last = 0
+    while True:
+        page = list(queryset.filter(pk__gt=last).order_by("pk").values_list("pk", *fields)[:chunk_size])
+        if page:
+            yield [row[1:] for row in page]
+        if len(page) < chunk_size:
+            return
+        last = page[-1][0]
+
+
+def export_sections(user_id, chunk_size=EXPORT_CHUNK_SIZE, using=None):
+    """``(record, fields, pages)`` for each record type, read lazily from database ``using``."""
+    for record, model, owner, fields in SECTIONS:
+        yield record, fields, pages(model.objects.using(using).filter(**{owner: user_id}), fields, chunk_size)
+
+
+def csv_chunks(sections):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record, fields, section_pages in sections:
+        writer.writerow(["record", *fields])
+        for page in section_pages:
+            writer.writerows([record, *row] for row in page)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_chunks(sections):
+    encoder = DjangoJSONEncoder()
+    for record, fields, section_pages in sections:
+        for page in section_pages:
+            yield "".join(encoder.encode({"record": record, **dict(zip(fields, row))}) + "\n" for row in page)
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_export(user_id, output, compress=False, chunk_size=EXPORT_CHUNK_SIZE, using=None):
+    """The user's full history as an iterator of CSV or NDJSON chunks, gzipped when ``compress`` is set."""
+    encode = csv_chunks if output == "csv" else ndjson_chunks
+    chunks = encode(export_sections(user_id, chunk_size, using))
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,154 @@
+"""
+Bulk import of habit history from CSV or NDJSON.
+
+Each row is one day of one habit: ``habit`` (title), ``date``, optional ``status`` (done,
+completed, true, 1, ... or pending, missed, false, 0, ...; default done) and optional
+``description``. CSV needs a header row; NDJSON has one object per line. Habits are
+matched to the user's existing habits by title and created when missing.
+
+The input is parsed lazily and handled ``batch_size`` rows at a time: rows are validated
+with ``HistoryRowSerializer``, invalid ones are skipped and reported, and each batch is
+written in its own transaction with one ``bulk_create`` for new habits and one upsert for
+tasks (re-importing a day overwrites it). ``bulk_create`` bypasses the Task signals, so
+StreakRecords and completion bitmaps of every touched habit are rebuilt in one pass at
+the end, including after a failure part way through.
+"""
+import csv
+import json
+from dataclasses import dataclass, field
+from django.db import connections, router, transaction
+from rest_framework.exceptions import ValidationError
+from habits.models import Habit
+from habits.serializers import HistoryRowSerializer
+from habits.dashboard import invalidate_dashboard
+from tasks.models import Task
+from streaks.rebuild import rebuild_streaks
+from streaks.bitmaps import rebuild_bitmaps
+
+IMPORT_BATCH_SIZE = 2000
+IMPORT_FORMATS = ("csv", "ndjson")
+MAX_REPORTED_ERRORS = 100
+REQUIRED_COLUMNS = {"habit", "date"}
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    skipped: int = 0
+    habits_created: int = 0
+    tasks_imported: int = 0
+    errors: list = field(default_factory=list)
+
+
+def read_rows(lines, input_format):
+    """Rows of an iterable of text lines. Undecodable NDJSON lines are yielded as-is so validation rejects them."""
+    if input_format == "csv":
+        reader = csv.DictReader(lines)
+        missing = REQUIRED_COLUMNS - set(reader.fieldnames or ())
+        if missing:
+            raise ValidationError({"file": [f"Missing CSV columns: {', '.join(sorted(missing))}."]})
+        yield from reader
+        return
+
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line
+
+
+def format_from_name(name):
+    """``csv`` or ``ndjson`` from a file name, or None."""
+    extension = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+    return {"csv": "csv", "ndjson": "ndjson", "jsonl": "ndjson"}.get(extension)
+
+
+class HistoryImporter:
+    def __init__(self, user_id, batch_size=IMPORT_BATCH_SIZE):
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.row_serializer = HistoryRowSerializer()
+        self.habit_ids = {}
+        self.touched = set()
+        self.result = ImportResult()
+
+    def validate(self, batch):
+        valid = []
+        for number, row in batch:
+            try:
+                valid.append(self.row_serializer.run_validation(row))
+            except ValidationError as exc:
+                self.result.skipped += 1
+                if len(self.result.errors) < MAX_REPORTED_ERRORS:
+                    self.result.errors.append({"row": number, "errors": exc.detail})
+        return valid
+
+    def resolve_habits(self, titles):
+        """Fill ``habit_ids`` for ``titles``, creating the habits the user does not have yet."""
+        titles = set(titles) - self.habit_ids.keys()
+        if not titles:
+            return
+        habits = Habit.objects.filter(user_id=self.user_id)
+        # Newest first, so the oldest habit wins when titles repeat.
+        self.habit_ids.update(habits.filter(title__in=titles).order_by("-id").values_list("title", "id"))
+        new = titles - self.habit_ids.keys()
+        if new:
+            Habit.objects.bulk_create([Habit(user_id=self.user_id, title=title) for title in new])
+            # MySQL does not return ids from bulk inserts.
+            self.habit_ids.update(habits.filter(title__in=new).values_list("title", "id"))
+            self.result.habits_created += len(new)
+
+    def write(self, rows):
+        upsert = {"update_conflicts": True, "update_fields": ["status", "description"]}
+        connection = connections[router.db_for_write(Task)]
+        if connection.features.supports_update_conflicts_with_target:
+            upsert["unique_fields"] = ["habit", "date"]
+
+        with transaction.atomic(using=connection.alias):
+            self.resolve_habits(row["habit"] for row in rows)
+            # One task per habit and day; a later row for the same day wins.
+            tasks = {}
+            for row in rows:
+                habit_id = self.habit_ids[row["habit"]]
+                tasks[habit_id, row["date"]] = Task(
+                    user_id=self.user_id,
+                    habit_id=habit_id,
+                    date=row["date"],
+                    status=row["status"],
+                    description=row["description"] or row["habit"],
+                )
+            Task.objects.bulk_create(list(tasks.values()), **upsert)
+
+        self.touched.update(habit_id for habit_id, _ in tasks)
+        self.result.tasks_imported += len(tasks)
+
+    def run(self, rows):
+        """Import ``rows`` and return the ImportResult."""
+        try:
+            batch = []
+            for number, row in enumerate(rows, 1):
+                batch.append((number, row))
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+            self.flush(batch)
+        finally:
+            if self.touched:
+                habit_ids = sorted(self.touched)
+                rebuild_streaks(habit_ids=habit_ids)
+                rebuild_bitmaps(habit_ids=habit_ids)
+            invalidate_dashboard(self.user_id)
+        return self.result
+
+    def flush(self, batch):
+        self.result.rows += len(batch)
+        valid = self.validate(batch)
+        if valid:
+            self.write(valid)
+
+
+def import_history(user_id, lines, input_format, batch_size=IMPORT_BATCH_SIZE):
+    """Import CSV or NDJSON ``lines`` into the user's habits and tasks."""
+    return HistoryImporter(user_id, batch_size).run(read_rows(lines, input_format))
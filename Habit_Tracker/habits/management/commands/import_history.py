@@ -0,0 +1,38 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+from habits.imports import IMPORT_BATCH_SIZE, IMPORT_FORMATS, import_history, format_from_name
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Import a user's habit history from a CSV or NDJSON file exported by another habit app."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import.")
+        parser.add_argument("--user", required=True, help="Username or id of the user to import into.")
+        parser.add_argument("--input", choices=IMPORT_FORMATS, help="File format; defaults from the file extension.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows validated and inserted per transaction.")
+
+    def handle(self, *args, **options):
+        identifier = options["user"]
+        user = User.objects.filter(**{"id" if identifier.isdigit() else "username": identifier}).first()
+        if user is None:
+            raise CommandError(f"No user '{identifier}'.")
+        input_format = options["input"] or format_from_name(options["path"])
+        if input_format is None:
+            raise CommandError("Cannot tell the format from the file name; pass --input.")
+
+        started = time.monotonic()
+        try:
+            with open(options["path"], encoding="utf-8-sig", newline="") as lines:
+                result = import_history(user.id, lines, input_format, batch_size=options["batch_size"])
+        except (OSError, UnicodeDecodeError, ValidationError) as exc:
+            raise CommandError(str(exc))
+
+        for error in result.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result.tasks_imported} tasks from {result.rows} rows ({result.skipped} skipped, "
+            f"{result.habits_created} habits created) in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from habits.reminders import ReminderScheduler, get_dispatcher
+
+
+class Command(BaseCommand):
+    help = "Run the long-lived reminder scheduler, dispatching each minute's due reminders as one batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bucket-seconds", type=int, default=60, help="Width of a dispatch bucket.")
+        parser.add_argument("--sync-seconds", type=int, default=60, help="How often to pick up edited habits.")
+        parser.add_argument("--reload-seconds", type=int, default=24 * 60 * 60, help="How often to reload the whole schedule.")
+        parser.add_argument("--chunk-size", type=int, default=10000, help="Rows fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        scheduler = ReminderScheduler(
+            get_dispatcher(),
+            bucket_seconds=options["bucket_seconds"],
+            sync_seconds=options["sync_seconds"],
+            reload_seconds=options["reload_seconds"],
+            chunk_size=options["chunk_size"],
+        )
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("Reminder scheduler stopped."))
@@ -0,0 +1,49 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from habits.synthetic import SeedCounts, SyntheticLoader
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Bulk-generate users, habits, task history, streaks and completion bitmaps for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000, help="Users to create.")
+        parser.add_argument("--guest-ratio", type=float, default=0.1, help="Fraction of users created as guests.")
+        parser.add_argument("--habits-per-user", type=int, default=5)
+        parser.add_argument("--days", type=int, default=90, help="Days of task history, ending today.")
+        parser.add_argument("--reminder-ratio", type=float, default=0.5, help="Fraction of habits with a reminder.")
+        parser.add_argument("--password", default="password123", help="Password for registered users (hashed once).")
+        parser.add_argument("--unusable-passwords", action="store_true", help="Skip hashing; nobody can log in with a password.")
+        parser.add_argument("--prefix", default="load", help="Username prefix; must not already be in use.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users (with all their rows) per transaction.")
+        parser.add_argument("--insert-size", type=int, default=5000, help="Rows per INSERT statement.")
+        parser.add_argument("--workers", type=int, default=1, help="Worker processes loading batches in parallel (not for SQLite).")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible datasets.")
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if User.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Users named {prefix}_* already exist; pass a different --prefix.")
+
+        loader = SyntheticLoader(
+            habits_per_user=options["habits_per_user"],
+            days=options["days"],
+            guest_ratio=options["guest_ratio"],
+            reminder_ratio=options["reminder_ratio"],
+            password=None if options["unusable_passwords"] else options["password"],
+            prefix=prefix,
+            insert_size=options["insert_size"],
+            seed=options["seed"],
+        )
+        counts = SeedCounts()
+        started = time.monotonic()
+        for batch_counts in loader.load(options["users"], options["batch_size"], options["workers"]):
+            counts.add(batch_counts)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{counts.users} users, {counts.tasks} tasks after {time.monotonic() - started:.1f}s")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {counts.users} users ({counts.guests} guests), {counts.habits} habits, {counts.tasks} tasks, "
+            f"{counts.streaks} streak records and {counts.bitmaps} completion bitmaps in {time.monotonic() - started:.1f}s."
+        ))
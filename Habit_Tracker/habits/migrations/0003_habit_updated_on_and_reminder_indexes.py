@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0002_habit_habit_user_active_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='habit',
+            name='updated_on',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['reminder_enabled', 'reminder_time'], name='habit_reminder_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['updated_on'], name='habit_updated_on_idx'),
+        ),
+    ]
@@ -12,6 +12,14 @@ class Habit(models.Model):
     reminder_enabled = models.BooleanField(default=False)
     reminder_time = models.TimeField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
+    updated_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "is_active"], name="habit_user_active_idx"),
+            models.Index(fields=["reminder_enabled", "reminder_time"], name="habit_reminder_idx"),
+            models.Index(fields=["updated_on"], name="habit_updated_on_idx"),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.user.username})"
\ No newline at end of file
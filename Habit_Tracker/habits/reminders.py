@@ -0,0 +1,175 @@
+"""
+Reminder scheduling over ``Habit.reminder_time``.
+
+The scheduler keeps every enabled reminder in an in-memory min-heap of next fire times,
+loaded once with a single indexed query. It sleeps until the next bucket boundary that has
+work, hands all reminders due in that bucket to the dispatcher in one call, and applies
+habit edits incrementally from ``Habit.updated_on`` instead of reloading the table.
+
+Reminder times are interpreted in the project's TIME_ZONE.
+"""
+import heapq
+import logging
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from habits.models import Habit
+
+logger = logging.getLogger("habits.reminders")
+
+ONE_DAY = timedelta(days=1)
+
+Reminder = namedtuple("Reminder", ["habit_id", "user_id", "fire_at"])
+_Entry = namedtuple("_Entry", ["user_id", "reminder_time", "generation"])
+
+
+def log_reminders(reminders):
+    """Default dispatcher: log the batch. Point REMINDER_DISPATCHER at a real sender."""
+    logger.info("Dispatching reminders", extra={"count": len(reminders), "fire_at": reminders[0].fire_at.isoformat()})
+
+
+def get_dispatcher():
+    return import_string(getattr(settings, "REMINDER_DISPATCHER", "habits.reminders.log_reminders"))
+
+
+def reminder_habits():
+    """Habits whose reminders should fire: enabled, active, with a time, for users accepting notifications."""
+    return Habit.objects.filter(
+        reminder_enabled=True, reminder_time__isnull=False, is_active=True, user__notifications_enabled=True
+    )
+
+
+def next_fire_time(reminder_time, now):
+    """The first occurrence of ``reminder_time`` strictly after ``now``."""
+    local_now = timezone.localtime(now)
+    fire_at = timezone.make_aware(datetime.combine(local_now.date(), reminder_time))
+    if fire_at <= now:
+        fire_at = timezone.make_aware(datetime.combine(local_now.date() + ONE_DAY, reminder_time))
+    return fire_at
+
+
+class ReminderScheduler:
+    """Min-heap of ``(fire_at, habit_id, generation)`` with a habit_id -> entry map for lazy invalidation."""
+
+    def __init__(self, dispatch, bucket_seconds=60, sync_seconds=60, sync_overlap_seconds=120,
+                 reload_seconds=24 * 60 * 60, chunk_size=10000, clock=timezone.now, sleep=time.sleep):
+        self.dispatch = dispatch
+        self.bucket_seconds = bucket_seconds
+        self.sync_interval = timedelta(seconds=sync_seconds)
+        # Rows saved just before a sync may commit just after it; re-reading a short window is harmless.
+        self.sync_overlap = timedelta(seconds=sync_overlap_seconds)
+        # User-level changes (notifications_enabled) do not touch Habit.updated_on; a periodic reload catches them.
+        self.reload_interval = timedelta(seconds=reload_seconds)
+        self.chunk_size = chunk_size
+        self.clock = clock
+        self.sleep = sleep
+        self.heap = []
+        self.entries = {}
+        self.generation = 0
+        self.synced_at = None
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self):
+        """(Re)build the heap from one bulk query."""
+        now = self.clock()
+        rows = reminder_habits().values_list("id", "user_id", "reminder_time").iterator(chunk_size=self.chunk_size)
+
+        self.heap, self.entries = [], {}
+        for habit_id, user_id, reminder_time in rows:
+            self.generation += 1
+            self.entries[habit_id] = _Entry(user_id, reminder_time, self.generation)
+            self.heap.append((next_fire_time(reminder_time, now), habit_id, self.generation))
+        heapq.heapify(self.heap)
+        self.synced_at = self.loaded_at = now
+        logger.info("Reminder schedule loaded", extra={"reminders": len(self.entries)})
+
+    def sync(self):
+        """Apply habits edited since the previous sync. Returns the number of schedule changes."""
+        now = self.clock()
+        rows = (
+            Habit.objects.filter(updated_on__gte=self.synced_at - self.sync_overlap)
+            .values_list("id", "user_id", "reminder_time", "reminder_enabled", "is_active", "user__notifications_enabled")
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+        changes = 0
+        for habit_id, user_id, reminder_time, enabled, active, notifications in rows:
+            current = self.entries.get(habit_id)
+            if not (enabled and active and notifications and reminder_time is not None):
+                if self.entries.pop(habit_id, None) is not None:
+                    changes += 1
+                continue
+            if current is not None and (current.user_id, current.reminder_time) == (user_id, reminder_time):
+                continue
+            self.generation += 1
+            self.entries[habit_id] = _Entry(user_id, reminder_time, self.generation)
+            heapq.heappush(self.heap, (next_fire_time(reminder_time, now), habit_id, self.generation))
+            changes += 1
+
+        self.synced_at = now
+        return changes
+
+    def bucket_end(self, moment):
+        """The bucket boundary at or after ``moment``."""
+        seconds = -(-moment.timestamp() // self.bucket_seconds) * self.bucket_seconds
+        return datetime.fromtimestamp(seconds, tz=moment.tzinfo)
+
+    def next_wake(self):
+        """Next bucket boundary that either has reminders due or is due for a sync."""
+        wake = self.bucket_end(self.synced_at + self.sync_interval)
+        if self.heap:
+            wake = min(wake, self.bucket_end(self.heap[0][0]))
+        return wake
+
+    def pop_due(self, until):
+        """Pop every live reminder due at or before ``until`` and schedule its next occurrence."""
+        due = []
+        while self.heap and self.heap[0][0] <= until:
+            fire_at, habit_id, generation = heapq.heappop(self.heap)
+            entry = self.entries.get(habit_id)
+            if entry is None or entry.generation != generation:
+                continue
+            due.append(Reminder(habit_id, entry.user_id, fire_at))
+            heapq.heappush(self.heap, (next_fire_time(entry.reminder_time, fire_at), habit_id, generation))
+        return due
+
+    def run_pending(self):
+        """Dispatch everything due by now as one batch. Returns the dispatched reminders."""
+        due = self.pop_due(self.clock())
+        if not due:
+            return due
+
+        # Deletes never show up in sync(), so confirm the batch against the table before sending.
+        live = set()
+        for start in range(0, len(due), self.chunk_size):
+            ids = [reminder.habit_id for reminder in due[start:start + self.chunk_size]]
+            live.update(reminder_habits().filter(id__in=ids).values_list("id", flat=True))
+        for reminder in due:
+            if reminder.habit_id not in live:
+                self.entries.pop(reminder.habit_id, None)
+        due = [reminder for reminder in due if reminder.habit_id in live]
+
+        if due:
+            self.dispatch(due)
+        return due
+
+    def run(self, should_stop=lambda: False):
+        """Main loop: sleep to the next boundary, dispatch the bucket, pick up edits."""
+        self.load()
+        while not should_stop():
+            delay = (self.next_wake() - self.clock()).total_seconds()
+            if delay > 0:
+                self.sleep(delay)
+            # Dispatch first: load() schedules from now, so it would push the due bucket to tomorrow.
+            self.run_pending()
+            now = self.clock()
+            if now >= self.loaded_at + self.reload_interval:
+                self.load()
+            elif now >= self.synced_at + self.sync_interval:
+                self.sync()
@@ -0,0 +1,28 @@
+from rest_framework import serializers
+from habits.models import Habit
+
+# Status spellings found in other habit apps' exports.
+DONE_VALUES = {"done", "completed", "complete", "true", "yes", "y", "1", "x"}
+PENDING_VALUES = {"pending", "missed", "skipped", "false", "no", "n", "0", ""}
+
+class ImportedStatusField(serializers.Field):
+    """Maps a status string, boolean or 0/1 onto Task's "done"/"pending"."""
+    default_error_messages = {"invalid": "Unknown status '{value}'."}
+
+    def to_internal_value(self, data):
+        value = str(data).strip().lower()
+        if value in DONE_VALUES:
+            return "done"
+        if value in PENDING_VALUES:
+            return "pending"
+        self.fail("invalid", value=value)
+
+    def to_representation(self, value):
+        return value
+
+class HistoryRowSerializer(serializers.Serializer):
+    """One imported day of a habit; the habit is matched by title and created if missing."""
+    habit = serializers.CharField(max_length=Habit._meta.get_field("title").max_length)
+    date = serializers.DateField()
+    status = ImportedStatusField(required=False, default="done")
+    description = serializers.CharField(required=False, allow_blank=True, default="")
@@ -0,0 +1,28 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from habits.models import Habit
+from habits.dashboard import invalidate_dashboard
+from tasks.models import Task
+from streaks.models import StreakRecord
+
+
+def _invalidate_on_commit(user_id):
+    """Invalidate once the change is committed, so reads starting after it load the new state."""
+    transaction.on_commit(partial(invalidate_dashboard, user_id))
+
+
+@receiver([post_save, post_delete], sender=Habit)
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_dashboard_for_owner(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _invalidate_on_commit(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=StreakRecord)
+def invalidate_dashboard_for_streak(sender, instance, raw=False, **kwargs):
+    # Engine writes come from a Task change, whose receiver above already invalidates the
+    # dashboard; looking up the owner here would add a query to every transition.
+    if not raw and StreakRecord.habit.is_cached(instance):
+        _invalidate_on_commit(instance.habit.user_id)
@@ -0,0 +1,65 @@
+"""
+Habit statistics computed with aggregate queries over Task.
+
+For one habit or all of a user's habits, over the year ending on a given day: completion
+rate, completions per ISO weekday, monthly totals and a calendar heatmap. Each section is
+one ``GROUP BY`` query, so the cost does not grow with the number of task rows returned.
+
+The heatmap is a bitstring, base64 encoded: bit ``i`` (least significant bit first within
+each byte) is set when a habit task was completed on ``start + i`` days. It is read from the
+habits' CompletionBitmaps, at most two rows per habit, instead of the Task table. The
+bitmaps are derived from Task (see ``streaks.bitmaps``); ``manage.py recompute_streaks``
+brings them back in line with the other sections if they ever drift.
+"""
+import base64
+from datetime import timedelta
+from django.db.models import Count, Q
+from django.db.models.functions import ExtractIsoWeekDay, TruncMonth
+from django.utils import timezone
+from streaks.bitmaps import completed_days, union_years
+from streaks.models import CompletionBitmap
+from tasks.models import Task
+
+HEATMAP_DAYS = 365
+DONE = Count("id", filter=Q(status="done"))
+
+
+def pack_days(days, start, length):
+    """Base64 bitstring of ``length`` days from ``start`` with the given days set."""
+    bits = bytearray((length + 7) // 8)
+    for day in days:
+        offset = (day - start).days
+        if 0 <= offset < length:
+            bits[offset >> 3] |= 1 << (offset & 7)
+    return base64.b64encode(bytes(bits)).decode()
+
+
+def habit_stats(user_id, habit_id=None, end=None):
+    end = end or timezone.localdate()
+    start = end - timedelta(days=HEATMAP_DAYS - 1)
+    tasks = Task.objects.filter(user_id=user_id, habit__isnull=False, date__range=(start, end))
+    bitmaps = CompletionBitmap.objects.filter(habit__user_id=user_id, year__range=(start.year, end.year))
+    if habit_id is not None:
+        tasks = tasks.filter(habit_id=habit_id)
+        bitmaps = bitmaps.filter(habit_id=habit_id)
+
+    by_weekday = tasks.annotate(weekday=ExtractIsoWeekDay("date")).values("weekday").annotate(done=DONE, total=Count("id")).order_by()
+    months = tasks.annotate(month=TruncMonth("date")).values("month").annotate(done=DONE, total=Count("id")).order_by("month")
+    heatmap = completed_days(union_years(bitmaps.values_list("year", "bits")), start, end)
+
+    weekdays = [{"weekday": weekday, "done": 0, "total": 0} for weekday in range(1, 8)]
+    for row in by_weekday:
+        weekdays[row["weekday"] - 1].update(done=row["done"], total=row["total"])
+    completed = sum(row["done"] for row in weekdays)
+    total = sum(row["total"] for row in weekdays)
+    return {
+        "habit": habit_id,
+        "start": start,
+        "end": end,
+        "completed": completed,
+        "total": total,
+        "completion_rate": round(completed / total, 4) if total else 0.0,
+        "weekdays": weekdays,
+        "months": [{"month": row["month"].strftime("%Y-%m"), "done": row["done"], "total": row["total"]} for row in months],
+        "heatmap": {"start": start, "days": HEATMAP_DAYS, "bits": pack_days(heatmap, start, HEATMAP_DAYS)},
+    }
@@ -0,0 +1,224 @@
+"""
+Synthetic users, habits, task history and streaks for load testing.
+
+Everything is written with ``bulk_create`` one batch of users at a time, each batch in its
+own transaction; batches can be spread over forked worker processes (MySQL only, since
+SQLite allows a single writer). Completion histories are generated with NumPy: each habit has its own
+adherence rate, completing a day makes the next one more likely, weekends dip, and habits
+start on different days. StreakRecords are derived from the generated history with
+``streaks.rebuild.summarize_runs`` and CompletionBitmaps with ``streaks.bitmaps.pack_bitmaps``,
+so they match what ``recompute_streaks`` and ``rebuild_completion_bitmaps`` would write.
+
+``bulk_create`` bypasses ``save()`` and signals: passwords are hashed once and shared,
+guest expiry dates are written explicitly, and no dashboard invalidation is needed
+because only new users are touched.
+"""
+import multiprocessing
+from dataclasses import dataclass
+from datetime import time, timedelta
+import numpy as np
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from django.utils import timezone
+from users.models import User, GUEST_ACCOUNT_LIFETIME
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import StreakRecord, CompletionBitmap
+from streaks.rebuild import summarize_runs
+from streaks.bitmaps import pack_bitmaps
+
+HABIT_TITLES = ["Read", "Exercise", "Meditate", "Drink water", "Journal", "Walk", "Stretch", "Study", "Sleep early", "Practice guitar"]
+# Reminders fall on quarter hours between 06:00 and 22:00.
+REMINDER_SLOTS = [time(hour, minute) for hour in range(6, 22) for minute in (0, 15, 30, 45)]
+
+
+@dataclass
+class SeedCounts:
+    users: int = 0
+    guests: int = 0
+    habits: int = 0
+    tasks: int = 0
+    streaks: int = 0
+    bitmaps: int = 0
+
+    def add(self, other):
+        for name in self.__dataclass_fields__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+
+def completion_history(rng, habits, days, weekend_days):
+    """
+    ``(present, done)`` boolean arrays of shape ``(habits, days)``.
+
+    ``present`` marks days on or after the habit's start; ``done`` is a per-habit Markov
+    chain where a completed day raises the chance of completing the next.
+    """
+    adherence = rng.uniform(0.35, 0.95, habits)
+    after_done = np.minimum(adherence + 0.15, 0.98)
+    after_miss = adherence * 0.6
+
+    done = np.zeros((habits, days), dtype=bool)
+    previous = rng.random(habits) < adherence
+    for day in range(days):
+        chance = np.where(previous, after_done, after_miss)
+        if weekend_days[day]:
+            chance = chance * 0.85
+        previous = rng.random(habits) < chance
+        done[:, day] = previous
+
+    start = rng.integers(0, days // 2 + 1, habits)
+    present = np.arange(days) >= start[:, None]
+    return present, done & present
+
+
+class SyntheticLoader:
+    def __init__(self, habits_per_user=5, days=90, guest_ratio=0.1, reminder_ratio=0.5, password="password123",
+                 prefix="load", insert_size=5000, seed=0):
+        self.habits_per_user = habits_per_user
+        self.days = days
+        self.guest_ratio = guest_ratio
+        self.reminder_ratio = reminder_ratio
+        # One hash for every registered user; None gives everyone the same unusable password.
+        self.password = make_password(password)
+        self.prefix = prefix
+        self.insert_size = insert_size
+        self.seed = seed
+        self.rng = None
+        self.today = timezone.localdate()
+        self.first_day = self.today - timedelta(days=days - 1)
+        self.weekend_days = [(self.first_day + timedelta(days=offset)).weekday() >= 5 for offset in range(days)]
+
+    def create_users(self, start, count, counts):
+        guests = self.rng.random(count) < self.guest_ratio
+        usernames = [f"{self.prefix}_{number}" for number in range(start, start + count)]
+        User.objects.bulk_create(
+            [
+                User(
+                    username=username,
+                    email=None if is_guest else f"{username}@example.com",
+                    password=self.password,
+                    is_guest=is_guest,
+                )
+                for username, is_guest in zip(usernames, guests.tolist())
+            ],
+            batch_size=self.insert_size,
+        )
+        # MySQL does not return ids from bulk inserts, so look them up by the unique username.
+        ids = dict(User.objects.filter(username__in=usernames).values_list("username", "id"))
+        user_ids = [ids[username] for username in usernames]
+
+        # created_on is auto_now_add, so guest ages are spread with one UPDATE per age.
+        guest_ids = np.array(user_ids, dtype=np.int64)[guests]
+        ages = self.rng.integers(0, 2 * GUEST_ACCOUNT_LIFETIME.days + 1, guest_ids.size)
+        for age in np.unique(ages).tolist():
+            created_on = self.today - timedelta(days=age)
+            User.objects.filter(id__in=guest_ids[ages == age].tolist()).update(
+                created_on=created_on, guest_expires_on=created_on + GUEST_ACCOUNT_LIFETIME
+            )
+
+        counts.users += count
+        counts.guests += int(guests.sum())
+        return user_ids
+
+    def create_habits(self, user_ids, counts):
+        total = len(user_ids) * self.habits_per_user
+        reminders = self.rng.random(total) < self.reminder_ratio
+        slots = self.rng.integers(0, len(REMINDER_SLOTS), total).tolist()
+        titles = self.rng.integers(0, len(HABIT_TITLES), total).tolist()
+        active = (self.rng.random(total) < 0.9).tolist()
+
+        Habit.objects.bulk_create(
+            [
+                Habit(
+                    user_id=user_ids[index // self.habits_per_user],
+                    title=HABIT_TITLES[titles[index]],
+                    reminder_enabled=reminder,
+                    reminder_time=REMINDER_SLOTS[slots[index]] if reminder else None,
+                    is_active=active[index],
+                )
+                for index, reminder in enumerate(reminders.tolist())
+            ],
+            batch_size=self.insert_size,
+        )
+        habits = list(Habit.objects.filter(user_id__in=user_ids).order_by("id").values_list("id", "user_id"))
+        counts.habits += len(habits)
+        return habits
+
+    def create_history(self, habits, counts):
+        habit_ids = np.array([habit_id for habit_id, _ in habits], dtype=np.int64)
+        owner_ids = [user_id for _, user_id in habits]
+        present, done = completion_history(self.rng, len(habits), self.days, self.weekend_days)
+
+        rows, columns = np.nonzero(present)
+        statuses = done[rows, columns].tolist()
+        dates = [self.first_day + timedelta(days=offset) for offset in range(self.days)]
+        habit_list = habit_ids.tolist()
+        for start in range(0, rows.size, self.insert_size):
+            chunk = slice(start, start + self.insert_size)
+            Task.objects.bulk_create([
+                Task(
+                    user_id=owner_ids[row],
+                    habit_id=habit_list[row],
+                    description=f"Daily task {dates[column].isoformat()}",
+                    date=dates[column],
+                    status="done" if status else "pending",
+                )
+                for row, column, status in zip(rows[chunk].tolist(), columns[chunk].tolist(), statuses[chunk])
+            ])
+        counts.tasks += int(rows.size)
+
+        done_rows, done_columns = np.nonzero(done)
+        done_habits, done_days = habit_ids[done_rows], np.datetime64(self.first_day) + done_columns
+        streak_habits, current, longest, last_day = summarize_runs(done_habits, done_days)
+        stats = {
+            habit_id: {"current_streak": current_streak, "longest_streak": longest_streak, "last_completed_date": last_completed}
+            for habit_id, current_streak, longest_streak, last_completed in zip(
+                streak_habits.tolist(), current.tolist(), longest.tolist(), last_day.astype(object).tolist()
+            )
+        }
+        StreakRecord.objects.bulk_create(
+            [StreakRecord(habit_id=habit_id, **stats.get(habit_id, {})) for habit_id in habit_list],
+            batch_size=self.insert_size,
+        )
+        counts.streaks += len(habit_list)
+
+        bitmaps = pack_bitmaps(done_habits, done_days)
+        CompletionBitmap.objects.bulk_create(
+            [CompletionBitmap(habit_id=habit_id, year=year, bits=bits) for habit_id, year, bits in bitmaps],
+            batch_size=self.insert_size,
+        )
+        counts.bitmaps += len(bitmaps)
+
+    def load_batch(self, start, count):
+        """Create users ``start`` to ``start + count - 1`` with all their rows in one transaction."""
+        # Seeding per batch makes the dataset independent of how batches are spread over workers.
+        self.rng = np.random.default_rng([self.seed, start])
+        counts = SeedCounts()
+        with transaction.atomic():
+            user_ids = self.create_users(start, count, counts)
+            habits = self.create_habits(user_ids, counts)
+            if habits:
+                self.create_history(habits, counts)
+        return counts
+
+    def load(self, users, batch_size, workers=1):
+        """Load ``users`` users in batches, yielding each batch's counts as it commits."""
+        batches = [(start, min(batch_size, users - start)) for start in range(0, users, batch_size)]
+        if workers <= 1:
+            for start, count in batches:
+                yield self.load_batch(start, count)
+            return
+
+        global _worker_loader
+        _worker_loader = self
+        # Forked workers must not share the parent's database connections.
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            yield from pool.imap_unordered(_load_batch_in_worker, batches)
+
+
+_worker_loader = None
+
+
+def _load_batch_in_worker(batch):
+    return _worker_loader.load_batch(*batch)
@@ -0,0 +1,122 @@
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+from users.models import User
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import StreakRecord
+
+@pytest.mark.django_db
+class TestDashboardAPI:
+    """Test suite for the cached dashboard endpoint."""
+    def setup_method(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = "/habits/api/v1/dashboard/"
+        self.today = timezone.localdate()
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.habit = Habit.objects.create(user=self.user, title="Exercise")
+        self.task = Task.objects.create(user=self.user, habit=self.habit, description="Workout", date=self.today)
+        self.client.force_authenticate(self.user)
+
+    def test_dashboard_contents(self):
+        Habit.objects.create(user=self.user, title="Paused", is_active=False)
+        Task.objects.create(user=self.user, description="Yesterday", date=self.today - timedelta(days=1))
+
+        response = self.client.get(self.url)
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["date"] == str(self.today)
+        assert [habit["title"] for habit in data["habits"]] == ["Exercise"]
+        assert data["habits"][0]["current_streak"] == 0
+        assert data["tasks"] == [{"id": self.task.id, "habit": self.habit.id, "description": "Workout", "status": "pending"}]
+
+    def test_second_read_served_from_cache(self, django_assert_num_queries):
+        self.client.get(self.url)
+
+        # force_authenticate skips the JWT user lookup, so a cache hit needs no query at all.
+        with django_assert_num_queries(0):
+            response = self.client.get(self.url)
+
+        assert response.status_code == 200
+
+    def test_task_change_invalidates(self, django_capture_on_commit_callbacks):
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.task.status = "done"
+            self.task.save()
+        data = self.client.get(self.url).json()
+
+        assert data["tasks"][0]["status"] == "done"
+        assert data["habits"][0]["current_streak"] == 1
+
+    def test_habit_change_invalidates(self, django_capture_on_commit_callbacks):
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Habit.objects.create(user=self.user, title="Read")
+        data = self.client.get(self.url).json()
+
+        assert {habit["title"] for habit in data["habits"]} == {"Exercise", "Read"}
+
+    def test_streak_change_invalidates(self, django_capture_on_commit_callbacks):
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            StreakRecord.objects.create(habit=self.habit, current_streak=3, longest_streak=8, last_completed_date=self.today)
+        data = self.client.get(self.url).json()
+
+        assert (data["habits"][0]["current_streak"], data["habits"][0]["longest_streak"]) == (3, 8)
+
+    def test_batch_update_invalidates(self, django_capture_on_commit_callbacks):
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.client.post("/tasks/api/v1/batch-status/", {"tasks": [{"id": self.task.id, "status": "done"}]}, format="json")
+        data = self.client.get(self.url).json()
+
+        assert data["tasks"][0]["status"] == "done"
+
+    def test_read_racing_a_write_does_not_cache_stale_data(self, monkeypatch, django_capture_on_commit_callbacks):
+        from habits import dashboard
+        build_dashboard = dashboard.build_dashboard
+
+        def build_then_write(user_id, day):
+            # The write commits and invalidates after this read loaded its rows but before it caches them.
+            stale = build_dashboard(user_id, day)
+            with django_capture_on_commit_callbacks(execute=True):
+                self.task.status = "done"
+                self.task.save()
+            return stale
+
+        monkeypatch.setattr(dashboard, "build_dashboard", build_then_write)
+        assert self.client.get(self.url).json()["tasks"][0]["status"] == "pending"
+        monkeypatch.setattr(dashboard, "build_dashboard", build_dashboard)
+
+        assert self.client.get(self.url).json()["tasks"][0]["status"] == "done"
+
+    def test_other_users_cache_untouched(self, django_capture_on_commit_callbacks, django_assert_num_queries):
+        other = User.objects.create_user(username="other", password="password123")
+        self.client.get(self.url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Habit.objects.create(user=other, title="Not mine")
+
+        with django_assert_num_queries(0):
+            self.client.get(self.url)
+
+    def test_stale_streak_shows_as_zero(self):
+        StreakRecord.objects.create(habit=self.habit, current_streak=5, longest_streak=5, last_completed_date=self.today - timedelta(days=3))
+
+        data = self.client.get(self.url).json()
+
+        assert (data["habits"][0]["current_streak"], data["habits"][0]["longest_streak"]) == (0, 5)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        assert self.client.get(self.url).status_code == 401
@@ -0,0 +1,67 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import date, timedelta
+from rest_framework.test import APIClient
+from users.models import User
+from habits.models import Habit
+from habits.exports import stream_export
+from tasks.models import Task
+
+DAY = date(2025, 3, 1)
+
+
+def body(response):
+    return b"".join(response.streaming_content)
+
+@pytest.mark.django_db
+class TestHabitExportAPI:
+    """Test suite for the streaming history export."""
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/habits/api/v1/export/"
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.habit = Habit.objects.create(user=self.user, title="Read, daily")
+        for offset in range(5):
+            Task.objects.create(user=self.user, habit=self.habit, description="Read", date=DAY + timedelta(days=offset), status="done")
+        other = User.objects.create_user(username="other", password="password123")
+        Task.objects.create(user=other, description="Not yours", date=DAY)
+        self.client.force_authenticate(self.user)
+
+    def test_csv_sections(self):
+        response = self.client.get(self.url)
+        rows = list(csv.reader(io.StringIO(body(response).decode())))
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "text/csv"
+        assert response["Content-Disposition"].startswith('attachment; filename="habit-history-')
+        assert [row for row in rows if row[0] == "record"][1] == ["record", "id", "habit_id", "date", "description", "status"]
+        assert [row[2] for row in rows if row[0] == "habit"] == ["Read, daily"]
+        assert sorted(row[3] for row in rows if row[0] == "task") == [str(DAY + timedelta(days=offset)) for offset in range(5)]
+        assert [row[2:4] for row in rows if row[0] == "streak"] == [["5", "5"]]
+
+    def test_ndjson_gzip(self):
+        response = self.client.get(self.url, {"output": "ndjson", "gzip": "1"})
+        lines = [json.loads(line) for line in gzip.decompress(body(response)).decode().splitlines()]
+
+        assert response["Content-Type"] == "application/gzip"
+        assert response["Content-Disposition"].endswith('.ndjson.gz"')
+        assert [line["record"] for line in lines] == ["habit"] + ["task"] * 5 + ["streak"]
+        assert lines[1]["date"] == str(DAY)
+
+    def test_reads_in_pages(self, django_assert_num_queries):
+        # Five tasks in pages of two: three task pages, one habit page, one streak page.
+        with django_assert_num_queries(5):
+            chunks = list(stream_export(self.user.id, "ndjson", chunk_size=2))
+
+        assert sum(chunk.count("\n") for chunk in chunks) == 7
+
+    def test_unknown_output_rejected(self):
+        assert self.client.get(self.url, {"output": "xml"}).status_code == 400
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        assert self.client.get(self.url).status_code == 401
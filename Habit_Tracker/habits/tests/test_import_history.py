@@ -0,0 +1,106 @@
+import json
+import pytest
+from datetime import date, timedelta
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from users.models import User
+from habits.models import Habit
+from habits.imports import import_history
+from tasks.models import Task
+from streaks.models import CompletionBitmap, StreakRecord
+from streaks.bitmaps import completed_days, union_years
+
+DAY = date(2025, 3, 1)
+
+
+def bitmap_has(habit, day):
+    years = union_years(CompletionBitmap.objects.filter(habit=habit).values_list("year", "bits"))
+    return list(completed_days(years, day, day)) == [day]
+
+def csv_lines(*rows):
+    return ["habit,date,status,description\n"] + [",".join(row) + "\n" for row in rows]
+
+@pytest.mark.django_db
+class TestImportHistory:
+    """Batch validation, upserts and streak rebuilds of the history import."""
+    def setup_method(self):
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.read = Habit.objects.create(user=self.user, title="Read")
+
+    def test_creates_habits_and_rebuilds_streaks(self):
+        rows = [("Read", str(DAY + timedelta(days=offset)), "done", "") for offset in range(3)]
+        rows += [("Walk", str(DAY), "missed", "Morning walk"), ("Walk", str(DAY + timedelta(days=1)), "1", "")]
+
+        result = import_history(self.user.id, csv_lines(*rows), "csv", batch_size=2)
+
+        walk = Habit.objects.get(user=self.user, title="Walk")
+        assert (result.rows, result.tasks_imported, result.habits_created, result.skipped) == (5, 5, 1, 0)
+        assert StreakRecord.objects.get(habit=self.read).current_streak == 3
+        assert StreakRecord.objects.get(habit=walk).current_streak == 1
+        assert Task.objects.get(habit=walk, date=DAY).description == "Morning walk"
+        assert bitmap_has(self.read, DAY + timedelta(days=2))
+
+    def test_reimport_overwrites_day(self):
+        Task.objects.create(user=self.user, habit=self.read, description="Read", date=DAY, status="done")
+
+        import_history(self.user.id, csv_lines(("Read", str(DAY), "pending", ""), ("Read", str(DAY), "false", "Later row")), "csv")
+
+        task = Task.objects.get(habit=self.read, date=DAY)
+        assert (task.status, task.description) == ("pending", "Later row")
+        assert StreakRecord.objects.get(habit=self.read).current_streak == 0
+        assert not bitmap_has(self.read, DAY)
+
+    def test_invalid_rows_skipped_and_reported(self):
+        lines = [json.dumps({"habit": "Read", "date": str(DAY), "status": True}), "not json",
+                 json.dumps({"habit": "Read", "date": "yesterday"}), json.dumps({"habit": "Read", "date": str(DAY), "status": "maybe"})]
+
+        result = import_history(self.user.id, lines, "ndjson")
+
+        assert (result.rows, result.tasks_imported, result.skipped) == (4, 1, 3)
+        assert [error["row"] for error in result.errors] == [2, 3, 4]
+        assert "date" in result.errors[1]["errors"]
+
+    def test_batches_use_bulk_queries(self, django_assert_max_num_queries):
+        rows = [("Read", str(DAY + timedelta(days=offset)), "done", "") for offset in range(200)]
+        # A handful of queries per batch plus the rebuilds, not one per row.
+        with django_assert_max_num_queries(25):
+            import_history(self.user.id, csv_lines(*rows), "csv", batch_size=100)
+
+        assert Task.objects.filter(habit=self.read).count() == 200
+
+    def test_command(self, tmp_path):
+        path = tmp_path / "history.jsonl"
+        path.write_text(json.dumps({"habit": "Read", "date": str(DAY)}) + "\n")
+
+        call_command("import_history", str(path), user=self.user.username, stdout=None)
+
+        assert Task.objects.get(habit=self.read).status == "done"
+
+@pytest.mark.django_db
+class TestHabitImportAPI:
+    """Test suite for the history import endpoint."""
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/habits/api/v1/import/"
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content, **data):
+        return self.client.post(self.url, {"file": SimpleUploadedFile(name, content), **data}, format="multipart")
+
+    def test_csv_upload(self):
+        response = self.upload("history.csv", "".join(csv_lines(("Read", str(DAY), "done", ""))).encode())
+
+        assert response.status_code == 200
+        assert response.json()["tasks_imported"] == 1
+        assert Task.objects.filter(user=self.user, habit__title="Read", date=DAY).exists()
+
+    def test_missing_columns_rejected(self):
+        response = self.upload("history.csv", b"title,day\nRead,2025-03-01\n")
+
+        assert response.status_code == 400
+        assert "file" in response.json()
+
+    def test_unknown_format_rejected(self):
+        assert self.upload("history.txt", b"").status_code == 400
@@ -0,0 +1,140 @@
+import pytest
+from datetime import datetime, time, timedelta
+from django.utils import timezone
+from users.models import User
+from habits.models import Habit
+from habits.reminders import ReminderScheduler, next_fire_time
+
+
+class FakeClock:
+    def __init__(self, start):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def at(hour, minute=0, day=1):
+    return timezone.make_aware(datetime(2025, 1, day, hour, minute))
+
+def test_next_fire_time_today_or_tomorrow():
+    assert next_fire_time(time(8, 0), at(7, 30)) == at(8, 0)
+    assert next_fire_time(time(8, 0), at(8, 0)) == at(8, 0, day=2)
+    assert next_fire_time(time(8, 0), at(9, 15)) == at(8, 0, day=2)
+
+@pytest.mark.django_db
+class TestReminderScheduler:
+    """Scheduler behaviour against a fake clock."""
+    def setup_method(self):
+        self.user = User.objects.create_user(username="test123", password="password123")
+        self.clock = FakeClock(at(7, 59) + timedelta(seconds=30))
+        self.batches = []
+        self.scheduler = ReminderScheduler(self.batches.append, clock=self.clock, sleep=self.clock.sleep)
+
+    def make_habit(self, title, reminder_time, **fields):
+        return Habit.objects.create(user=self.user, title=title, reminder_enabled=True, reminder_time=reminder_time, **fields)
+
+    def advance_to(self, moment):
+        self.clock.now = moment
+        return self.scheduler.run_pending()
+
+    def test_load_includes_only_enabled_reminders(self):
+        self.make_habit("Read", time(8, 0))
+        self.make_habit("Paused", time(8, 0), is_active=False)
+        Habit.objects.create(user=self.user, title="No reminder", reminder_time=time(8, 0))
+
+        self.scheduler.load()
+
+        assert len(self.scheduler) == 1
+
+    def test_load_is_one_query(self, django_assert_num_queries):
+        for minute in range(10):
+            self.make_habit(f"Habit {minute}", time(8, minute))
+
+        with django_assert_num_queries(1):
+            self.scheduler.load()
+
+    def test_due_reminders_dispatched_as_one_batch(self):
+        read = self.make_habit("Read", time(8, 0))
+        run = self.make_habit("Run", time(8, 0))
+        self.make_habit("Write", time(8, 1))
+        self.scheduler.load()
+
+        assert self.scheduler.next_wake() == at(8, 0)
+        self.advance_to(at(8, 0))
+
+        assert len(self.batches) == 1
+        assert {reminder.habit_id for reminder in self.batches[0]} == {read.id, run.id}
+        assert self.scheduler.next_wake() == at(8, 1)
+
+    def test_reminder_fires_again_next_day(self):
+        self.make_habit("Read", time(8, 0))
+        self.scheduler.load()
+
+        self.advance_to(at(8, 0))
+        self.advance_to(at(8, 0, day=2))
+
+        assert [batch[0].fire_at for batch in self.batches] == [at(8, 0), at(8, 0, day=2)]
+
+    def test_sync_picks_up_edited_time(self):
+        habit = self.make_habit("Read", time(8, 0))
+        self.scheduler.load()
+
+        habit.reminder_time = time(8, 5)
+        habit.save()
+        assert self.scheduler.sync() == 1
+
+        assert self.advance_to(at(8, 0)) == []
+        assert [reminder.fire_at for reminder in self.advance_to(at(8, 5))] == [at(8, 5)]
+
+    def test_sync_picks_up_disabled_and_new_habits(self):
+        habit = self.make_habit("Read", time(8, 0))
+        self.scheduler.load()
+
+        habit.reminder_enabled = False
+        habit.save()
+        added = self.make_habit("Run", time(8, 0))
+        self.scheduler.sync()
+
+        assert [reminder.habit_id for reminder in self.advance_to(at(8, 0))] == [added.id]
+
+    def test_deleted_habit_is_dropped_at_dispatch(self):
+        habit = self.make_habit("Read", time(8, 0))
+        self.scheduler.load()
+
+        habit.delete()
+
+        assert self.advance_to(at(8, 0)) == []
+        assert self.batches == []
+        assert len(self.scheduler) == 0
+
+    def test_users_without_notifications_are_skipped(self):
+        self.user.notifications_enabled = False
+        self.user.save()
+        self.make_habit("Read", time(8, 0))
+
+        self.scheduler.load()
+
+        assert len(self.scheduler) == 0
+
+    def test_run_sleeps_to_bucket_boundaries(self):
+        self.make_habit("Read", time(8, 0))
+        self.make_habit("Run", time(8, 30))
+        wakes = []
+        original_sleep = self.clock.sleep
+        self.scheduler.sleep = lambda seconds: (original_sleep(seconds), wakes.append(self.clock.now))
+
+        self.scheduler.run(should_stop=lambda: len(self.batches) == 2)
+
+        assert all(wake.second == 0 for wake in wakes)
+        assert [batch[0].fire_at for batch in self.batches] == [at(8, 0), at(8, 30)]
+
+    def test_run_fires_daily_across_reloads(self):
+        self.make_habit("Read", time(8, 0))
+
+        self.scheduler.run(should_stop=lambda: self.clock.now >= at(9, 0, day=3))
+
+        assert [batch[0].fire_at for batch in self.batches] == [at(8, 0), at(8, 0, day=2), at(8, 0, day=3)]
@@ -0,0 +1,79 @@
+import pytest
+from django.contrib.auth.hashers import check_password
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from users.models import User, GUEST_ACCOUNT_LIFETIME
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import StreakRecord, CompletionBitmap
+from streaks.rebuild import rebuild_streaks
+from streaks.bitmaps import rebuild_bitmaps
+
+STREAK_VALUES = ("habit_id", "current_streak", "longest_streak", "last_completed_date")
+
+
+def seed(**options):
+    call_command("seed_load", users=20, guest_ratio=0.3, habits_per_user=3, days=30, batch_size=8, insert_size=50, **options)
+
+@pytest.mark.django_db
+def test_seed_creates_users_habits_and_history():
+    seed()
+
+    assert User.objects.count() == 20
+    assert Habit.objects.count() == 60
+    assert StreakRecord.objects.count() == 60
+    assert Task.objects.filter(status="done").exists()
+    assert Task.objects.filter(status="pending").exists()
+    assert not Task.objects.filter(date__gt=timezone.localdate()).exists()
+    assert not Habit.objects.filter(reminder_enabled=True, reminder_time__isnull=True).exists()
+
+@pytest.mark.django_db
+def test_streak_records_match_rebuild():
+    seed()
+    generated = set(StreakRecord.objects.values_list(*STREAK_VALUES))
+
+    rebuild_streaks()
+
+    assert set(StreakRecord.objects.values_list(*STREAK_VALUES)) == generated
+
+@pytest.mark.django_db
+def test_completion_bitmaps_match_rebuild():
+    seed()
+    generated = {(habit_id, year, bytes(bits)) for habit_id, year, bits in CompletionBitmap.objects.values_list("habit_id", "year", "bits")}
+
+    rebuild_bitmaps()
+
+    rebuilt = {(habit_id, year, bytes(bits)) for habit_id, year, bits in CompletionBitmap.objects.values_list("habit_id", "year", "bits")}
+    assert generated and rebuilt == generated
+
+@pytest.mark.django_db
+def test_guest_expiry_written_explicitly():
+    seed()
+    guests = User.objects.filter(is_guest=True)
+
+    assert guests.exists()
+    for guest in guests:
+        assert guest.guest_expires_on == guest.created_on + GUEST_ACCOUNT_LIFETIME
+    assert not User.objects.filter(is_guest=False, guest_expires_on__isnull=False).exists()
+
+@pytest.mark.django_db
+def test_password_hashed_once_and_usable():
+    seed(password="load-password")
+    passwords = set(User.objects.values_list("password", flat=True))
+
+    assert len(passwords) == 1
+    assert check_password("load-password", passwords.pop())
+
+@pytest.mark.django_db
+def test_unusable_passwords():
+    seed(unusable_passwords=True)
+
+    assert not any(user.has_usable_password() for user in User.objects.all())
+
+@pytest.mark.django_db
+def test_existing_prefix_rejected():
+    seed()
+
+    with pytest.raises(CommandError):
+        seed()
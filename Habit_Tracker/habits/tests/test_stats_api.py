@@ -0,0 +1,78 @@
+import base64
+import pytest
+from datetime import date, timedelta
+from rest_framework.test import APIClient
+from users.models import User
+from habits.models import Habit
+from habits.stats import HEATMAP_DAYS
+from tasks.models import Task
+
+END = date(2025, 3, 31)  # a Monday
+
+
+def unpack_days(heatmap):
+    bits = base64.b64decode(heatmap["bits"])
+    start = date.fromisoformat(heatmap["start"])
+    return {start + timedelta(days=offset) for offset in range(heatmap["days"]) if bits[offset >> 3] >> (offset & 7) & 1}
+
+@pytest.fixture(autouse=True)
+def fixed_today(monkeypatch):
+    monkeypatch.setattr("habits.stats.timezone.localdate", lambda: END)
+
+@pytest.mark.django_db
+class TestHabitStatsAPI:
+    """Test suite for the habit statistics endpoint."""
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/habits/api/v1/stats/"
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.read = Habit.objects.create(user=self.user, title="Read")
+        self.walk = Habit.objects.create(user=self.user, title="Walk")
+        for offset in range(10):
+            Task.objects.create(user=self.user, habit=self.read, description="Read", date=END - timedelta(days=offset),
+                                status="done" if offset % 2 == 0 else "pending")
+        Task.objects.create(user=self.user, habit=self.walk, description="Walk", date=END - timedelta(days=1), status="done")
+        Task.objects.create(user=self.user, habit=self.walk, description="Old", date=END - timedelta(days=HEATMAP_DAYS), status="done")
+        self.client.force_authenticate(self.user)
+
+    def test_single_habit(self):
+        response = self.client.get(self.url, {"habit": self.read.id})
+        data = response.json()
+
+        assert response.status_code == 200
+        assert (data["completed"], data["total"], data["completion_rate"]) == (5, 10, 0.5)
+        assert data["weekdays"][0] == {"weekday": 1, "done": 1, "total": 2}
+        assert data["months"] == [{"month": "2025-03", "done": 5, "total": 10}]
+        assert unpack_days(data["heatmap"]) == {END - timedelta(days=offset) for offset in range(0, 10, 2)}
+
+    def test_all_habits(self):
+        data = self.client.get(self.url).json()
+
+        assert data["habit"] is None
+        assert (data["completed"], data["total"]) == (6, 11)
+        assert END - timedelta(days=1) in unpack_days(data["heatmap"])
+        assert data["heatmap"]["start"] == str(END - timedelta(days=HEATMAP_DAYS - 1))
+
+    def test_tasks_without_habit_left_out(self):
+        Task.objects.create(user=self.user, description="Errand", date=END - timedelta(days=3), status="done")
+        data = self.client.get(self.url).json()
+
+        assert (data["completed"], data["total"]) == (6, 11)
+        assert END - timedelta(days=3) not in unpack_days(data["heatmap"])
+
+    def test_constant_queries(self, django_assert_num_queries):
+        with django_assert_num_queries(3):
+            self.client.get(self.url)
+
+    def test_foreign_or_invalid_habit_not_found(self):
+        other = User.objects.create_user(username="other", password="password123")
+        foreign = Habit.objects.create(user=other, title="Not yours")
+
+        assert self.client.get(self.url, {"habit": foreign.id}).status_code == 404
+        assert self.client.get(self.url, {"habit": "abc"}).status_code == 404
+        assert self.client.get(self.url, {"habit": "\u00b2"}).status_code == 404
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        assert self.client.get(self.url).status_code == 401
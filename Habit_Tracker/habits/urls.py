@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import DashboardView, HabitStatsView, HabitExportView, HabitImportView
+
+
+urlpatterns = [
+    path("api/v1/dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("api/v1/stats/", HabitStatsView.as_view(), name="habit_stats"),
+    path("api/v1/export/", HabitExportView.as_view(), name="habit_export"),
+    path("api/v1/import/", HabitImportView.as_view(), name="habit_import"),
+]
@@ -1,3 +1,185 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
+from django.http import StreamingHttpResponse
+from django.db import router
+from django.utils import timezone
+from Habit_Tracker.db_router import ReplicaReadMixin
+from habits.models import Habit
+from habits.dashboard import get_dashboard
+from habits.stats import habit_stats
+from habits.exports import EXPORT_FORMATS, stream_export
+from habits.imports import IMPORT_FORMATS, import_history, format_from_name
+from dataclasses import asdict
+import codecs
+import logging
+
+logger = logging.getLogger("api.habits")
 
 # Create your views here.
+
+class DashboardView(APIView):
+    """
+    Today's dashboard for the authenticated user.
+
+    Methods:
+    - GET /api/{version}/dashboard/ -> Active habits with streaks and today's tasks
+
+    Permission: IsAuthenticated
+
+    Response:
+    {
+      "date": "2025-01-01",
+      "habits": [ { "id", "title", "reminder_time", "end_date", "current_streak", "longest_streak", "last_completed_date" } ],
+      "tasks": [ { "id", "habit", "description", "status" } ]
+    }
+
+    Notes:
+    - Served from the cache; any change to the user's habits, tasks or streaks invalidates it.
+    - Cache misses read the primary, never the replica: an entry lives for DASHBOARD_CACHE_TIMEOUT,
+      and one built from a lagging replica would keep serving that lag after the invalidation.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_dashboard(request.user.id), status=status.HTTP_200_OK)
+
+
+class HabitStatsView(ReplicaReadMixin, APIView):
+    """
+    Habit statistics for the authenticated user over the last 365 days.
+
+    Methods:
+    - GET /api/{version}/stats/ -> Statistics across all of the user's habits
+    - GET /api/{version}/stats/?habit=<id> -> Statistics for one habit
+
+    Permission: IsAuthenticated
+
+    Response:
+    {
+      "habit": 3,
+      "start": "2024-01-02",
+      "end": "2025-01-01",
+      "completed": 240,
+      "total": 300,
+      "completion_rate": 0.8,
+      "weekdays": [ { "weekday": 1, "done": 35, "total": 43 }, ... ],   (ISO weekdays, 1 = Monday)
+      "months": [ { "month": "2024-01", "done": 20, "total": 30 }, ... ],
+      "heatmap": { "start": "2024-01-02", "days": 365, "bits": "<base64>" }
+    }
+
+    Notes:
+    - Heatmap bit i (least significant bit first in each byte) is set when a habit task was
+      completed on start + i days.
+    - Weekdays and months are aggregate queries over Task; the heatmap is read from the
+      habits' completion bitmaps. See habits/stats.py.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        habit_id = request.query_params.get("habit")
+        if habit_id is not None:
+            if not (habit_id.isascii() and habit_id.isdigit()) or not Habit.objects.filter(id=habit_id, user=request.user).exists():
+                raise NotFound("Habit not found.")
+            habit_id = int(habit_id)
+        return Response(habit_stats(request.user.id, habit_id), status=status.HTTP_200_OK)
+
+
+class HabitExportView(ReplicaReadMixin, APIView):
+    """
+    Streaming download of the authenticated user's habits, tasks and streak records.
+
+    Methods:
+    - GET /api/{version}/export/ -> CSV
+    - GET /api/{version}/export/?output=ndjson -> One JSON object per line
+    - GET /api/{version}/export/?gzip=1 -> Either format, gzip compressed
+
+    Permission: IsAuthenticated
+
+    Response: an attachment. CSV has a section per record type (habit, task, streak), each
+    with its own header row; every row starts with its record type. NDJSON objects carry a
+    "record" key.
+
+    Notes:
+    - Rows are read and written a page at a time, so memory use does not depend on the
+      size of the history; see habits/exports.py.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        output = request.query_params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({"output": [f"Must be one of: {', '.join(EXPORT_FORMATS)}."]})
+        compress = request.query_params.get("gzip") in ("1", "true")
+
+        filename = f"habit-history-{timezone.localdate().isoformat()}.{output}"
+        content_type = EXPORT_FORMATS[output]
+        if compress:
+            filename += ".gz"
+            content_type = "application/gzip"
+
+        # The body is produced after the view returns, so the database is chosen now.
+        using = router.db_for_read(Habit)
+        response = StreamingHttpResponse(stream_export(request.user.id, output, compress, using=using), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class HabitImportView(APIView):
+    """
+    Bulk import of habit history exported from another app.
+
+    Methods:
+    - POST /api/{version}/import/ -> Multipart upload with a "file" field
+
+    Permission: IsAuthenticated
+
+    Request:
+    - file: CSV with a header row, or NDJSON; one row per habit and day with "habit"
+      (title), "date", optional "status" and optional "description"
+    - input: "csv" or "ndjson"; defaults from the file extension
+
+    Response:
+    {
+      "rows": 1200,
+      "skipped": 1,
+      "habits_created": 4,
+      "tasks_imported": 1199,
+      "errors": [ { "row": 17, "errors": { "date": [ "..." ] } } ]
+    }
+
+    Notes:
+    - Habits are matched by title and created when missing; a day that already has a task
+      is overwritten.
+    - Rows are validated and inserted in batches, then streaks are rebuilt once for the
+      touched habits; see habits/imports.py.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": ["No file was submitted."]})
+        input_format = request.data.get("input") or format_from_name(upload.name)
+        if input_format not in IMPORT_FORMATS:
+            raise ValidationError({"input": [f"Must be one of: {', '.join(IMPORT_FORMATS)}."]})
+
+        try:
+            result = import_history(request.user.id, codecs.iterdecode(upload, "utf-8-sig"), input_format)
+        except UnicodeDecodeError:
+            raise ValidationError({"file": ["The file must be UTF-8 encoded."]})
+
+        logger.info(
+            "History import finished",
+            extra={
+                "user_id": request.user.id,
+                "rows": result.rows,
+                "skipped": result.skipped,
+                "tasks_imported": result.tasks_imported,
+            },
+        )
+        return Response(asdict(result), status=status.HTTP_200_OK)
@@ -0,0 +1,198 @@
+"""
+Completion bitmaps: one row per habit and calendar year with a bit per day.
+
+Bit ``day_of_year - 1`` is set when the habit's task for that day is done, least
+significant bit first within each byte (the same layout as the stats heatmap). Bitmaps
+are kept in step with Task by the streak engine, so every path that feeds it (the Task
+signals and the batch status endpoint) maintains them too.
+
+Task is the source of truth. StreakRecord and the bitmaps are both copies derived from
+it: StreakRecord serves streaks, the bitmaps serve the stats heatmap and the older runs the
+streak engine needs (a backfill joining an earlier run, the longest run after an undo).
+``manage.py recompute_streaks`` rebuilds both from Task, and ``rebuild_completion_bitmaps``
+only the bitmaps; run one after writes that bypass the engine or to repair drift.
+
+Reads work on whole years as Python ints: a heatmap is the OR of the habits' rows, and a
+habit's rows shifted into one int give run lengths with a few bit operations.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+import numpy as np
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from tasks.models import Task
+from streaks.models import BITMAP_BYTES, CompletionBitmap
+
+
+def day_bit(day):
+    return day.timetuple().tm_yday - 1
+
+
+def set_day(bits, day, done):
+    """Set or clear ``day`` in a bytearray bitmap of ``day.year``."""
+    index = day_bit(day)
+    if done:
+        bits[index >> 3] |= 1 << (index & 7)
+    else:
+        bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+
+def as_int(bits):
+    return int.from_bytes(bytes(bits), "little")
+
+
+def completed_days(years, start, end):
+    """Days from ``start`` to ``end`` inclusive that are set in ``{year: int}`` bitmaps."""
+    day = start
+    while day <= end:
+        if years.get(day.year, 0) >> day_bit(day) & 1:
+            yield day
+        day += timedelta(days=1)
+
+
+def union_years(rows):
+    """OR ``(year, bits)`` rows into one ``{year: int}`` bitmap."""
+    years = defaultdict(int)
+    for year, bits in rows:
+        years[year] |= as_int(bits)
+    return years
+
+
+def joined_days(rows, origin):
+    """``(year, bits)`` rows as one int in which bit ``i`` is the day ``origin + i``."""
+    joined = 0
+    for year, bits in union_years(rows).items():
+        joined |= bits << (date(year, 1, 1) - origin).days
+    return joined
+
+
+def longest_run(bits):
+    """Length of the longest run of set bits."""
+    length = 0
+    while bits:
+        bits &= bits >> 1
+        length += 1
+    return length
+
+
+def run_ending(habit_id, day):
+    """Length of the habit's run of completed days ending on ``day``. Reads two years, more only for longer runs."""
+    years = 2
+    while True:
+        origin = date(day.year - years + 1, 1, 1)
+        rows = CompletionBitmap.objects.filter(habit_id=habit_id, year__gte=origin.year, year__lte=day.year)
+        end = (day - origin).days + 1
+        missing = ~joined_days(rows.values_list("year", "bits"), origin) & ((1 << end) - 1)
+        if missing:
+            return end - missing.bit_length()
+        years *= 2
+
+
+def longest_run_before(habit_id, day):
+    """Length of the habit's longest run of completed days before ``day``."""
+    rows = list(CompletionBitmap.objects.filter(habit_id=habit_id, year__lte=day.year).values_list("year", "bits"))
+    if not rows:
+        return 0
+    origin = date(min(year for year, _ in rows), 1, 1)
+    return longest_run(joined_days(rows, origin) & ((1 << (day - origin).days) - 1))
+
+
+def apply_bitmap_changes(changes):
+    """
+    Persist ``(habit_id, day, done)`` changes to the bitmaps.
+
+    Affected rows are read with one locking query and written with one bulk update. Rows
+    missing for a completion are inserted empty and locked with a second read first.
+    """
+    by_key = defaultdict(list)
+    for habit_id, day, done in changes:
+        by_key[(habit_id, day.year)].append((day, done))
+    if not by_key:
+        return
+
+    def locked(keys):
+        rows = CompletionBitmap.objects.select_for_update().filter(
+            habit_id__in={habit_id for habit_id, _ in keys}, year__in={year for _, year in keys}
+        )
+        return {(bitmap.habit_id, bitmap.year): bitmap for bitmap in rows if (bitmap.habit_id, bitmap.year) in keys}
+
+    with transaction.atomic(savepoint=False):
+        bitmaps = locked(by_key.keys())
+        missing = {key for key, days in by_key.items() if key not in bitmaps and any(done for _, done in days)}
+        if missing:
+            # ignore_conflicts keeps a concurrent insert of the same row from failing the transaction.
+            CompletionBitmap.objects.bulk_create(
+                [CompletionBitmap(habit_id=habit_id, year=year) for habit_id, year in missing], ignore_conflicts=True
+            )
+            bitmaps.update(locked(missing))
+
+        changed = []
+        for key, bitmap in bitmaps.items():
+            days = by_key[key]
+            bits = bytearray(bitmap.bits)
+            for day, done in days:
+                set_day(bits, day, done)
+            if bits != bytes(bitmap.bits):
+                bitmap.bits = bytes(bits)
+                changed.append(bitmap)
+
+        CompletionBitmap.objects.bulk_update(changed, ["bits"])
+
+
+def pack_bitmaps(habit_ids, days):
+    """``(habit_id, year, bits)`` for every habit and year in the completed ``(habit_id, day)`` pairs."""
+    habit_ids = np.asarray(habit_ids, dtype=np.int64)
+    days = np.asarray(days, dtype="datetime64[D]")
+    if habit_ids.size == 0:
+        return []
+
+    years = days.astype("datetime64[Y]")
+    offsets = (days - years).astype(np.int64)
+    keys, inverse = np.unique(np.stack([habit_ids, years.astype(np.int64)]), axis=1, return_inverse=True)
+    bits = np.zeros((keys.shape[1], BITMAP_BYTES * 8), dtype=bool)
+    bits[inverse.reshape(-1), offsets] = True
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    return [
+        (habit_id, year + 1970, row.tobytes())
+        for habit_id, year, row in zip(keys[0].tolist(), keys[1].tolist(), packed)
+    ]
+
+
+def _write_batch(habit_ids, days, write_size):
+    bitmaps = [CompletionBitmap(habit_id=habit_id, year=year, bits=bits) for habit_id, year, bits in pack_bitmaps(habit_ids, days)]
+    with transaction.atomic():
+        CompletionBitmap.objects.filter(habit_id__in=set(habit_ids)).delete()
+        CompletionBitmap.objects.bulk_create(bitmaps, batch_size=write_size)
+    return len(bitmaps)
+
+
+def rebuild_bitmaps(habit_ids=None, batch_size=10000, chunk_size=2000, write_size=1000):
+    """
+    Rebuild the bitmaps of ``habit_ids`` (or every habit) from completed tasks.
+
+    Rows are buffered until at least ``batch_size`` pairs are held and a habit boundary is
+    reached; each batch's habits are rewritten in one transaction. Returns the number of
+    bitmaps written.
+    """
+    completions = Task.objects.filter(status="done", habit__isnull=False)
+    bitmaps = CompletionBitmap.objects.all()
+    if habit_ids is not None:
+        completions = completions.filter(habit_id__in=habit_ids)
+        bitmaps = bitmaps.filter(habit_id__in=habit_ids)
+
+    bitmaps.filter(~Exists(Task.objects.filter(habit_id=OuterRef("habit_id"), status="done"))).delete()
+
+    rows = completions.order_by("habit_id", "date").values_list("habit_id", "date").iterator(chunk_size=chunk_size)
+
+    written = 0
+    batch_habits, batch_days = [], []
+    for habit_id, day in rows:
+        if len(batch_habits) >= batch_size and habit_id != batch_habits[-1]:
+            written += _write_batch(batch_habits, batch_days, write_size)
+            batch_habits, batch_days = [], []
+        batch_habits.append(habit_id)
+        batch_days.append(day)
+
+    if batch_habits:
+        written += _write_batch(batch_habits, batch_days, write_size)
+    return written
@@ -0,0 +1,161 @@
+"""
+Incremental streak engine.
+
+A StreakRecord is updated from a single Task transition using the values stored on the
+record. The two cases that need older runs read them from the habit's CompletionBitmap
+rows with bit operations, never from the Task history.
+
+Semantics:
+- ``current_streak`` is the length of the run of consecutive completed days ending on
+  ``last_completed_date``.
+- Completing a day after ``last_completed_date`` extends or restarts the run.
+- Completing the day just before the current run (a backfill) extends it backwards and
+  joins the older run ending the day before, if any. Other backfills are ignored.
+- Undoing a day inside the current run shortens or splits it. When the current run held
+  ``longest_streak``, an older run may hold it too, so the longest run before the current
+  one is read from the bitmaps.
+
+Every transition is also written to the habit's CompletionBitmap (see ``streaks.bitmaps``).
+
+Run ``manage.py recompute_streaks`` to rebuild records and bitmaps exactly from the Task table.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from functools import partial
+from django.db import transaction
+from streaks.models import StreakRecord
+from streaks.bitmaps import apply_bitmap_changes, longest_run_before, run_ending
+
+ONE_DAY = timedelta(days=1)
+STREAK_FIELDS = ["current_streak", "longest_streak", "last_completed_date"]
+
+
+def current_streak_on(current_streak, last_completed_date, day):
+    """Streak as seen on ``day``: a stored run only counts while it ended that day or the day before."""
+    if last_completed_date is None or (day - last_completed_date).days > 1:
+        return 0
+    return current_streak
+
+
+def record_completion(record, day, run_before=None):
+    """
+    Apply a completion on ``day`` to ``record`` in memory. Returns True if the record changed.
+
+    ``run_before(day)`` returns the length of the completed run ending on ``day``. It is only
+    called for a backfill that makes the current run touch an older one; without it, there
+    is taken to be no older run.
+    """
+    last = record.last_completed_date
+
+    if last is None or day > last:
+        if last is not None and day - last == ONE_DAY:
+            record.current_streak += 1
+        else:
+            record.current_streak = 1
+        record.last_completed_date = day
+    elif record.current_streak and day == last - timedelta(days=record.current_streak):
+        record.current_streak += 1 + (run_before(day - ONE_DAY) if run_before is not None else 0)
+    else:
+        return False
+
+    record.longest_streak = max(record.longest_streak, record.current_streak)
+    return True
+
+
+def revert_completion(record, day, longest_before=None):
+    """
+    Remove a completion on ``day`` from ``record`` in memory. Returns True if the record changed.
+
+    ``longest_before(run_start)`` returns the longest run ending before the current run. It
+    is only called when the current run held ``longest_streak``; without it, the current run
+    is taken to be the only one.
+    """
+    last = record.last_completed_date
+    if last is None or not record.current_streak or day > last:
+        return False
+
+    run_start = last - timedelta(days=record.current_streak - 1)
+    if day < run_start:
+        return False
+
+    held_longest = record.longest_streak == record.current_streak
+    before = (day - run_start).days
+    after = (last - day).days
+
+    if day == last:
+        record.current_streak = before
+        record.last_completed_date = day - ONE_DAY if before else None
+    else:
+        record.current_streak = after
+
+    if held_longest:
+        earlier = longest_before(run_start) if longest_before is not None else 0
+        record.longest_streak = max(before, after, earlier)
+    return True
+
+
+def apply_transition(habit_id, day, done):
+    """
+    Persist a single pending <-> done transition for a habit.
+
+    Issues one locked read and at most one write for the StreakRecord, plus the bitmap
+    update and, for a backfill or for an undo in the run holding the longest streak, one
+    read of the habit's bitmaps. Returns the StreakRecord, or None when undoing a
+    completion for a habit that has no record yet.
+    """
+    with transaction.atomic():
+        apply_bitmap_changes([(habit_id, day, done)])
+        records = StreakRecord.objects.select_for_update()
+        if done:
+            record, _ = records.get_or_create(habit_id=habit_id)
+            changed = record_completion(record, day, partial(run_ending, habit_id))
+        else:
+            record = records.filter(habit_id=habit_id).first()
+            if record is None:
+                return None
+            changed = revert_completion(record, day, partial(longest_run_before, habit_id))
+
+        if changed:
+            record.save(update_fields=STREAK_FIELDS)
+    return record
+
+
+def apply_transitions(transitions):
+    """
+    Persist many ``(habit_id, day, done)`` transitions together.
+
+    All affected records are read with one locking query and written with one bulk update,
+    so the cost is per habit rather than per task. Undos are applied newest first, then
+    completions before the current run newest first, so a multi-day backfill joins the run,
+    then later completions oldest first. Returns the locked records keyed by habit id.
+    """
+    by_habit = defaultdict(list)
+    for habit_id, day, done in transitions:
+        by_habit[habit_id].append((day, done))
+    if not by_habit:
+        return {}
+
+    with transaction.atomic(savepoint=False):
+        apply_bitmap_changes((habit_id, day, done) for habit_id, changes in by_habit.items() for day, done in changes)
+        completed = [habit_id for habit_id, changes in by_habit.items() if any(done for _, done in changes)]
+        StreakRecord.objects.bulk_create([StreakRecord(habit_id=habit_id) for habit_id in completed], ignore_conflicts=True)
+        records = StreakRecord.objects.select_for_update().in_bulk(list(by_habit), field_name="habit_id")
+
+        changed = []
+        for habit_id, changes in by_habit.items():
+            record = records.get(habit_id)
+            if record is None:
+                continue
+            undos = sorted((day for day, done in changes if not done), reverse=True)
+            results = [revert_completion(record, day, partial(longest_run_before, habit_id)) for day in undos]
+            # A backfill only joins the run when adjacent to its start; oldest first would drop all but one.
+            last = record.last_completed_date
+            completions = sorted(day for day, done in changes if done)
+            backfills = [day for day in reversed(completions) if last is not None and day < last]
+            forward = [day for day in completions if last is None or day >= last]
+            results += [record_completion(record, day, partial(run_ending, habit_id)) for day in backfills + forward]
+            if any(results):
+                changed.append(record)
+
+        StreakRecord.objects.bulk_update(changed, STREAK_FIELDS)
+    return records
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from streaks.bitmaps import rebuild_bitmaps
+
+
+class Command(BaseCommand):
+    help = "Rebuild every CompletionBitmap from the completed tasks in the Task table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--habit", type=int, action="append", dest="habit_ids", help="Only rebuild this habit id (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Completed tasks packed per NumPy batch.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched per database round trip.")
+        parser.add_argument("--write-size", type=int, default=1000, help="Bitmaps per bulk_create statement.")
+
+    def handle(self, *args, **options):
+        written = rebuild_bitmaps(
+            habit_ids=options["habit_ids"],
+            batch_size=options["batch_size"],
+            chunk_size=options["chunk_size"],
+            write_size=options["write_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} completion bitmaps."))
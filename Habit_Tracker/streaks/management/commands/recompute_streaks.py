@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from streaks.rebuild import rebuild_streaks
+from streaks.bitmaps import rebuild_bitmaps
+
+
+class Command(BaseCommand):
+    help = "Rebuild every StreakRecord and CompletionBitmap from the completed tasks in the Task table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--habit", type=int, action="append", dest="habit_ids", help="Only rebuild this habit id (repeatable).")
+        parser.add_argument("--batch-size", type=int, default=10000, help="Completed tasks summarised per NumPy batch.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Rows fetched per database round trip.")
+        parser.add_argument("--write-size", type=int, default=1000, help="Records or bitmaps per bulk_update/bulk_create statement.")
+
+    def handle(self, *args, **options):
+        sizes = {key: options[key] for key in ("batch_size", "chunk_size", "write_size")}
+        written = rebuild_streaks(habit_ids=options["habit_ids"], **sizes)
+        bitmaps = rebuild_bitmaps(habit_ids=options["habit_ids"], **sizes)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt streaks for {written} habits with completions and {bitmaps} completion bitmaps."))
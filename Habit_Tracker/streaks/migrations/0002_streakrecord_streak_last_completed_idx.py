@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0002_habit_habit_user_active_idx'),
+        ('streaks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='streakrecord',
+            index=models.Index(fields=['last_completed_date'], name='streak_last_completed_idx'),
+        ),
+    ]
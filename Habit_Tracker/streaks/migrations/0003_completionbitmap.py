@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:59
+
+import django.db.models.deletion
+import streaks.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0003_habit_updated_on_and_reminder_indexes'),
+        ('streaks', '0002_streakrecord_streak_last_completed_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompletionBitmap',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('bits', models.BinaryField(default=streaks.models.empty_bitmap, max_length=46)),
+                ('habit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='completion_bitmaps', to='habits.habit')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('habit', 'year'), name='unique_bitmap_per_habit_year')],
+            },
+        ),
+    ]
@@ -8,5 +8,32 @@ class StreakRecord(models.Model):
     longest_streak = models.PositiveIntegerField(default=0)
     last_completed_date = models.DateField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["last_completed_date"], name="streak_last_completed_idx"),
+        ]
+
+    def __str__(self):
+        return f"Streak for {self.habit.title}: {self.current_streak} days"
+
+# 366 bits, one per day of a leap year.
+BITMAP_BYTES = 46
+
+
+def empty_bitmap():
+    return bytes(BITMAP_BYTES)
+
+
+class CompletionBitmap(models.Model):
+    """Completed days of one habit in one calendar year: bit ``day_of_year - 1``, least significant bit first in each byte."""
+    habit = models.ForeignKey("habits.Habit", on_delete=models.CASCADE, related_name="completion_bitmaps")
+    year = models.PositiveSmallIntegerField()
+    bits = models.BinaryField(max_length=BITMAP_BYTES, default=empty_bitmap)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["habit", "year"], name="unique_bitmap_per_habit_year"),
+        ]
+
     def __str__(self):
-        return f"Streak for {self.habit.title}: {self.current_streak} days"
\ No newline at end of file
+        return f"Completions for habit {self.habit_id} in {self.year}"
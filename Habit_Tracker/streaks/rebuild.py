@@ -0,0 +1,115 @@
+"""
+Bulk rebuild of StreakRecords from the Task table.
+
+Completed ``(habit_id, date)`` pairs are streamed in habit order and summarised with NumPy
+date arithmetic, a batch of habits at a time, then written back with ``bulk_update``.
+"""
+import numpy as np
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from tasks.models import Task
+from streaks.models import StreakRecord
+from streaks.engine import STREAK_FIELDS
+from habits.models import Habit
+from habits.dashboard import invalidate_dashboard
+
+ONE_DAY = np.timedelta64(1, "D")
+
+
+def summarize_runs(habit_ids, days):
+    """
+    Summarise runs of consecutive days per habit.
+
+    ``habit_ids`` and ``days`` must be sorted by (habit, day); duplicate pairs are ignored.
+    Returns ``(habits, current, longest, last_day)`` arrays with one entry per distinct habit,
+    where ``current`` is the length of the run ending on ``last_day``.
+    """
+    habit_ids = np.asarray(habit_ids, dtype=np.int64)
+    days = np.asarray(days, dtype="datetime64[D]")
+    if habit_ids.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, np.empty(0, dtype="datetime64[D]")
+
+    distinct = np.ones(habit_ids.size, dtype=bool)
+    distinct[1:] = (habit_ids[1:] != habit_ids[:-1]) | (days[1:] != days[:-1])
+    habit_ids, days = habit_ids[distinct], days[distinct]
+    size = habit_ids.size
+
+    new_habit = np.ones(size, dtype=bool)
+    new_habit[1:] = habit_ids[1:] != habit_ids[:-1]
+    new_run = new_habit.copy()
+    new_run[1:] |= (days[1:] - days[:-1]) != ONE_DAY
+
+    run_starts = np.flatnonzero(new_run)
+    run_lengths = np.diff(np.append(run_starts, size))
+    habit_starts = np.flatnonzero(new_habit)
+
+    first_run = np.searchsorted(run_starts, habit_starts)
+    last_run = np.append(first_run[1:], run_starts.size) - 1
+    last_index = np.append(habit_starts[1:], size) - 1
+
+    longest = np.maximum.reduceat(run_lengths, first_run)
+    return habit_ids[habit_starts], run_lengths[last_run], longest, days[last_index]
+
+
+def _write_batch(habit_ids, days, write_size):
+    habits, current, longest, last_day = summarize_runs(habit_ids, days)
+    last_day = last_day.astype(object)
+
+    with transaction.atomic():
+        existing = StreakRecord.objects.in_bulk(habits.tolist(), field_name="habit_id")
+        to_update, to_create = [], []
+        for index, habit_id in enumerate(habits.tolist()):
+            record = existing.get(habit_id)
+            if record is None:
+                record = StreakRecord(habit_id=habit_id)
+                to_create.append(record)
+            else:
+                to_update.append(record)
+            record.current_streak = int(current[index])
+            record.longest_streak = int(longest[index])
+            record.last_completed_date = last_day[index]
+
+        StreakRecord.objects.bulk_update(to_update, STREAK_FIELDS, batch_size=write_size)
+        StreakRecord.objects.bulk_create(to_create, batch_size=write_size)
+
+    user_ids = Habit.objects.filter(id__in=habits.tolist()).values_list("user_id", flat=True).distinct()
+    invalidate_dashboard(*user_ids)
+    return len(habits)
+
+
+def rebuild_streaks(habit_ids=None, batch_size=10000, chunk_size=2000, write_size=1000):
+    """
+    Rebuild StreakRecords for ``habit_ids`` (or every habit) from completed tasks.
+
+    Rows are buffered until at least ``batch_size`` pairs are held and a habit boundary is
+    reached. Returns the number of habits with completions that were written.
+    """
+    completions = Task.objects.filter(status="done", habit__isnull=False)
+    records = StreakRecord.objects.all()
+    if habit_ids is not None:
+        completions = completions.filter(habit_id__in=habit_ids)
+        records = records.filter(habit_id__in=habit_ids)
+
+    has_completions = Exists(Task.objects.filter(habit_id=OuterRef("habit_id"), status="done"))
+    stale = records.filter(~has_completions).filter(
+        Q(current_streak__gt=0) | Q(longest_streak__gt=0) | Q(last_completed_date__isnull=False)
+    )
+    stale_users = list(Habit.objects.filter(streak_record__in=stale).values_list("user_id", flat=True).distinct())
+    stale.update(current_streak=0, longest_streak=0, last_completed_date=None)
+    invalidate_dashboard(*stale_users)
+
+    rows = completions.order_by("habit_id", "date").values_list("habit_id", "date").iterator(chunk_size=chunk_size)
+
+    written = 0
+    batch_habits, batch_days = [], []
+    for habit_id, day in rows:
+        if len(batch_habits) >= batch_size and habit_id != batch_habits[-1]:
+            written += _write_batch(batch_habits, batch_days, write_size)
+            batch_habits, batch_days = [], []
+        batch_habits.append(habit_id)
+        batch_days.append(day)
+
+    if batch_habits:
+        written += _write_batch(batch_habits, batch_days, write_size)
+    return written
@@ -0,0 +1,9 @@
+from rest_framework import serializers
+from streaks.models import StreakRecord
+
+class StreakRecordSerializer(serializers.ModelSerializer):
+    """Read-only view of a habit's streak numbers."""
+    class Meta:
+        model = StreakRecord
+        fields = ["habit", "current_streak", "longest_streak", "last_completed_date"]
+        read_only_fields = fields
@@ -0,0 +1,46 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from tasks.models import Task
+from streaks.engine import apply_transition
+
+_date_field = Task._meta.get_field("date")
+
+
+def _completion(state):
+    """Return (habit_id, date) if the tracked state is a completed habit task, else None."""
+    if state.get("status") != "done" or state.get("habit_id") is None:
+        return None
+    return state["habit_id"], _date_field.to_python(state["date"])
+
+
+@receiver(post_save, sender=Task)
+def update_streak_on_task_save(sender, instance, created, raw=False, **kwargs):
+    """Feed pending <-> done transitions (and moves of a done task) into the streak engine."""
+    if raw:
+        return
+
+    current = instance.tracked_state()
+    previous = {} if created else getattr(instance, "_loaded_state", {})
+    before, after = _completion(previous), _completion(current)
+
+    if before != after:
+        if before is not None:
+            apply_transition(*before, done=False)
+        if after is not None:
+            apply_transition(*after, done=True)
+
+    instance._loaded_state = current
+
+
+@receiver(post_delete, sender=Task)
+def update_streak_on_task_delete(sender, instance, origin=None, **kwargs):
+    """Undo a deleted completion, unless the task goes away with its habit or user."""
+    deleted_directly = isinstance(origin, Task) or (isinstance(origin, QuerySet) and origin.model is Task)
+    if not deleted_directly:
+        return
+
+    state = getattr(instance, "_loaded_state", None) or instance.tracked_state()
+    completion = _completion(state)
+    if completion is not None:
+        apply_transition(*completion, done=False)
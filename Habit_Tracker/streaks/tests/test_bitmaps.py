@@ -0,0 +1,124 @@
+import pytest
+from datetime import date, timedelta
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from users.models import User
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import CompletionBitmap, BITMAP_BYTES
+from streaks.bitmaps import day_bit, set_day, completed_days, union_years, pack_bitmaps, longest_run, run_ending, longest_run_before
+
+DAY = date(2025, 1, 2)
+
+
+def bitmap_days(habit):
+    days = set()
+    for year, bits in CompletionBitmap.objects.filter(habit=habit).values_list("year", "bits"):
+        days.update(day for day in (date(year, 1, 1) + timedelta(days=offset) for offset in range(366)) if day.year == year
+                    and bytes(bits)[day_bit(day) >> 3] >> (day_bit(day) & 7) & 1)
+    return days
+
+def test_set_day_sets_and_clears_bits():
+    bits = bytearray(BITMAP_BYTES)
+
+    set_day(bits, date(2024, 12, 31), True)
+    assert day_bit(date(2024, 12, 31)) == 365
+    assert bits[45] == 1 << 5
+
+    set_day(bits, date(2024, 12, 31), False)
+    assert bits == bytearray(BITMAP_BYTES)
+
+def test_completed_days_cross_year_boundary():
+    years = union_years(
+        [(2024, pack_bitmaps([1, 1], [date(2024, 12, 30), date(2024, 12, 31)])[0][2])]
+        + [(2025, pack_bitmaps([1, 1], [date(2025, 1, 1), DAY])[0][2])]
+    )
+
+    assert list(completed_days(years, date(2024, 12, 29), DAY + timedelta(days=1))) == [
+        date(2024, 12, 30), date(2024, 12, 31), date(2025, 1, 1), DAY
+    ]
+
+def test_longest_run():
+    assert longest_run(0) == 0
+    assert longest_run(0b1110111101) == 4
+
+def test_pack_bitmaps_groups_by_habit_and_year():
+    packed = pack_bitmaps([1, 1, 2], [date(2024, 1, 1), date(2025, 1, 9), date(2025, 1, 1)])
+
+    assert [(habit_id, year) for habit_id, year, _ in packed] == [(1, 2024), (1, 2025), (2, 2025)]
+    assert packed[1][2][1] == 1 and packed[0][2][0] == 1
+    assert all(len(bits) == BITMAP_BYTES for _, _, bits in packed)
+
+@pytest.mark.django_db
+class TestCompletionBitmaps:
+    """Bitmaps follow every Task transition the streak engine sees."""
+    def setup_method(self):
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.habit = Habit.objects.create(user=self.user, title="Read")
+
+    def task(self, day, status="pending"):
+        return Task.objects.create(user=self.user, habit=self.habit, description="Read", date=day, status=status)
+
+    def test_done_and_undone_toggle_bit(self):
+        task = self.task(DAY, status="done")
+        assert bitmap_days(self.habit) == {DAY}
+
+        task.status = "pending"
+        task.save()
+        assert bitmap_days(self.habit) == set()
+
+    def test_moving_and_deleting_done_task(self):
+        task = self.task(DAY, status="done")
+        task.date = DAY - timedelta(days=5)
+        task.save()
+        assert bitmap_days(self.habit) == {DAY - timedelta(days=5)}
+
+        task.delete()
+        assert bitmap_days(self.habit) == set()
+
+    def test_done_task_across_years_writes_both_rows(self):
+        for offset in range(4):
+            self.task(DAY - timedelta(days=offset), status="done")
+
+        assert bitmap_days(self.habit) == {DAY - timedelta(days=offset) for offset in range(4)}
+        assert CompletionBitmap.objects.filter(habit=self.habit).count() == 2
+
+    def test_runs_read_across_years(self):
+        for offset in (0, 1, 2, 3, 10, 11, 12, 13, 14):
+            self.task(DAY - timedelta(days=offset), status="done")
+
+        assert run_ending(self.habit.id, DAY) == 4
+        assert run_ending(self.habit.id, DAY - timedelta(days=4)) == 0
+        assert run_ending(self.habit.id, DAY - timedelta(days=10)) == 5
+        assert longest_run_before(self.habit.id, DAY - timedelta(days=3)) == 5
+        assert longest_run_before(self.habit.id, DAY - timedelta(days=12)) == 2
+        assert longest_run_before(self.habit.id, DAY - timedelta(days=14)) == 0
+
+    def test_run_ending_reads_back_past_two_years(self):
+        days = [date(2021, 12, 30) + timedelta(days=offset) for offset in range((DAY - date(2021, 12, 30)).days + 1)]
+        CompletionBitmap.objects.bulk_create(
+            [CompletionBitmap(habit=self.habit, year=year, bits=bits) for _, year, bits in pack_bitmaps([self.habit.id] * len(days), days)]
+        )
+
+        assert run_ending(self.habit.id, DAY) == len(days)
+
+    def test_batch_status_updates_bitmaps(self):
+        tasks = [self.task(DAY - timedelta(days=offset)) for offset in range(3)]
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post("/tasks/api/v1/batch-status/", {"tasks": [{"id": task.id, "status": "done"} for task in tasks]}, format="json")
+
+        assert response.status_code == 200
+        assert bitmap_days(self.habit) == {task.date for task in tasks}
+
+    def test_rebuild_command_matches_tasks(self):
+        self.task(DAY, status="done")
+        Task.objects.bulk_create([Task(user=self.user, habit=self.habit, description="Read", date=DAY - timedelta(days=1), status="done")])
+        stale = Habit.objects.create(user=self.user, title="Walk")
+        CompletionBitmap.objects.create(habit=stale, year=2025, bits=b"\xff" * BITMAP_BYTES)
+
+        call_command("rebuild_completion_bitmaps", stdout=None)
+
+        assert bitmap_days(self.habit) == {DAY, DAY - timedelta(days=1)}
+        assert not CompletionBitmap.objects.filter(habit=stale).exists()
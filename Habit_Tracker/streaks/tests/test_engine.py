@@ -0,0 +1,184 @@
+import pytest
+from datetime import date, timedelta
+from users.models import User
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import StreakRecord
+from streaks.engine import apply_transitions, record_completion, revert_completion
+
+DAY = date(2025, 1, 10)
+
+
+def make_record(current=0, longest=0, last=None):
+    return StreakRecord(current_streak=current, longest_streak=longest, last_completed_date=last)
+
+def test_first_completion_starts_streak():
+    record = make_record()
+
+    assert record_completion(record, DAY) is True
+    assert (record.current_streak, record.longest_streak, record.last_completed_date) == (1, 1, DAY)
+
+def test_consecutive_completion_extends_streak():
+    record = make_record(current=3, longest=3, last=DAY - timedelta(days=1))
+
+    record_completion(record, DAY)
+
+    assert (record.current_streak, record.longest_streak, record.last_completed_date) == (4, 4, DAY)
+
+def test_gap_restarts_streak_and_keeps_longest():
+    record = make_record(current=5, longest=5, last=DAY - timedelta(days=3))
+
+    record_completion(record, DAY)
+
+    assert (record.current_streak, record.longest_streak, record.last_completed_date) == (1, 5, DAY)
+
+def test_same_day_completion_is_noop():
+    record = make_record(current=2, longest=2, last=DAY)
+
+    assert record_completion(record, DAY) is False
+    assert record.current_streak == 2
+
+def test_backfill_before_run_start_extends_streak():
+    record = make_record(current=2, longest=2, last=DAY)
+
+    assert record_completion(record, DAY - timedelta(days=2)) is True
+    assert (record.current_streak, record.longest_streak, record.last_completed_date) == (3, 3, DAY)
+
+def test_backfill_joins_the_older_run_it_touches():
+    record = make_record(current=2, longest=3, last=DAY)
+
+    assert record_completion(record, DAY - timedelta(days=2), lambda day: 3 if day == DAY - timedelta(days=3) else 0)
+    assert (record.current_streak, record.longest_streak, record.last_completed_date) == (6, 6, DAY)
+
+def test_undo_last_day_shortens_streak():
+    record = make_record(current=3, longest=3, last=DAY)
+
+    revert_completion(record, DAY)
+
+    assert (record.current_streak, record.longest_streak, record.last_completed_date) == (2, 2, DAY - timedelta(days=1))
+
+def test_undo_only_day_clears_streak():
+    record = make_record(current=1, longest=4, last=DAY)
+
+    revert_completion(record, DAY)
+
+    assert (record.current_streak, record.longest_streak, record.last_completed_date) == (0, 4, None)
+
+def test_undo_inside_run_splits_it():
+    record = make_record(current=5, longest=5, last=DAY)
+
+    revert_completion(record, DAY - timedelta(days=1))
+
+    assert (record.current_streak, record.longest_streak, record.last_completed_date) == (1, 3, DAY)
+
+def test_undo_keeps_longest_held_by_an_earlier_run():
+    record = make_record(current=5, longest=5, last=DAY)
+    starts = []
+
+    revert_completion(record, DAY - timedelta(days=1), lambda run_start: starts.append(run_start) or 5)
+
+    assert (record.current_streak, record.longest_streak) == (1, 5)
+    assert starts == [DAY - timedelta(days=4)]
+
+def test_undo_outside_run_is_noop():
+    record = make_record(current=2, longest=6, last=DAY)
+
+    assert revert_completion(record, DAY - timedelta(days=5)) is False
+    assert (record.current_streak, record.longest_streak) == (2, 6)
+
+@pytest.mark.django_db
+class TestTaskTransitions:
+    """Streak records follow Task saves and deletes."""
+    def setup_method(self):
+        self.user = User.objects.create_user(username="test123", password="password123")
+        self.habit = Habit.objects.create(user=self.user, title="Exercise")
+
+    def make_task(self, day, status="pending"):
+        return Task.objects.create(user=self.user, habit=self.habit, description="Workout", date=day, status=status)
+
+    def test_marking_done_updates_record(self):
+        for offset in range(3):
+            task = self.make_task(DAY + timedelta(days=offset))
+            task.status = "done"
+            task.save()
+
+        record = StreakRecord.objects.get(habit=self.habit)
+        assert (record.current_streak, record.longest_streak, record.last_completed_date) == (3, 3, DAY + timedelta(days=2))
+
+    def test_creating_done_task_updates_record(self):
+        self.make_task(DAY, status="done")
+
+        assert StreakRecord.objects.get(habit=self.habit).current_streak == 1
+
+    def test_marking_pending_reverts_record(self):
+        self.make_task(DAY - timedelta(days=1), status="done")
+        task = self.make_task(DAY, status="done")
+
+        task = Task.objects.get(pk=task.pk)
+        task.status = "pending"
+        task.save()
+
+        record = StreakRecord.objects.get(habit=self.habit)
+        assert (record.current_streak, record.last_completed_date) == (1, DAY - timedelta(days=1))
+
+    def test_resaving_done_task_does_not_double_count(self):
+        task = self.make_task(DAY, status="done")
+        task.description = "Longer workout"
+        task.save()
+
+        assert StreakRecord.objects.get(habit=self.habit).current_streak == 1
+
+    def test_deleting_done_task_reverts_record(self):
+        task = self.make_task(DAY, status="done")
+        task.delete()
+
+        assert StreakRecord.objects.get(habit=self.habit).current_streak == 0
+
+    def test_deleting_habit_does_not_recreate_record(self):
+        self.make_task(DAY, status="done")
+        self.habit.delete()
+
+        assert not StreakRecord.objects.exists()
+
+    def test_batch_backfill_of_several_days_joins_the_run(self):
+        self.make_task(DAY, status="done")
+
+        records = apply_transitions([(self.habit.id, DAY - timedelta(days=2), True), (self.habit.id, DAY - timedelta(days=1), True)])
+
+        record = records[self.habit.id]
+        assert (record.current_streak, record.longest_streak, record.last_completed_date) == (3, 3, DAY)
+        assert StreakRecord.objects.get(habit=self.habit).current_streak == 3
+
+    def test_filling_a_gap_joins_both_runs(self):
+        for offset in (1, 2, 3, 5, 6):
+            self.make_task(DAY + timedelta(days=offset), status="done")
+
+        self.make_task(DAY + timedelta(days=4), status="done")
+
+        record = StreakRecord.objects.get(habit=self.habit)
+        assert (record.current_streak, record.longest_streak) == (6, 6)
+
+    def test_undo_in_run_keeps_equal_earlier_run(self):
+        for offset in (0, 1, 2, 4, 5, 6):
+            self.make_task(DAY + timedelta(days=offset), status="done")
+        task = Task.objects.get(habit=self.habit, date=DAY + timedelta(days=5))
+
+        task.status = "pending"
+        task.save()
+
+        record = StreakRecord.objects.get(habit=self.habit)
+        assert (record.current_streak, record.longest_streak) == (1, 3)
+
+    def test_task_without_habit_is_ignored(self):
+        Task.objects.create(user=self.user, description="Buy groceries", status="done")
+
+        assert not StreakRecord.objects.exists()
+
+    def test_transition_uses_constant_queries(self, django_assert_max_num_queries):
+        for offset in range(30):
+            self.make_task(DAY + timedelta(days=offset), status="done")
+        task = self.make_task(DAY + timedelta(days=30))
+        task.status = "done"
+
+        with django_assert_max_num_queries(7):
+            task.save()
@@ -0,0 +1,68 @@
+import pytest
+from datetime import date, timedelta
+from django.core.management import call_command
+from users.models import User
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import CompletionBitmap, StreakRecord
+from streaks.rebuild import summarize_runs
+
+DAY = date(2025, 3, 1)
+
+
+def days(*offsets):
+    return [DAY + timedelta(days=offset) for offset in offsets]
+
+def test_summarize_runs_per_habit():
+    habit_ids = [1, 1, 1, 1, 1, 2, 2]
+    dates = days(0, 1, 2, 5, 6) + days(3, 4)
+
+    habits, current, longest, last_day = summarize_runs(habit_ids, dates)
+
+    assert habits.tolist() == [1, 2]
+    assert current.tolist() == [2, 2]
+    assert longest.tolist() == [3, 2]
+    assert last_day.astype(object).tolist() == [DAY + timedelta(days=6), DAY + timedelta(days=4)]
+
+def test_summarize_runs_ignores_duplicate_days():
+    habits, current, longest, _ = summarize_runs([7, 7, 7], days(0, 0, 1))
+
+    assert current.tolist() == [2]
+    assert longest.tolist() == [2]
+
+def test_summarize_runs_does_not_join_runs_across_habits():
+    habits, current, longest, _ = summarize_runs([1, 2], days(0, 1))
+
+    assert current.tolist() == [1, 1]
+    assert longest.tolist() == [1, 1]
+
+def test_summarize_runs_empty():
+    habits, current, longest, last_day = summarize_runs([], [])
+
+    assert habits.size == current.size == longest.size == last_day.size == 0
+
+@pytest.mark.django_db
+def test_recompute_streaks_command_rebuilds_records():
+    user = User.objects.create_user(username="test123", password="password123")
+    reading = Habit.objects.create(user=user, title="Read")
+    running = Habit.objects.create(user=user, title="Run")
+    idle = Habit.objects.create(user=user, title="Idle")
+
+    # Write tasks in bulk so the incremental engine is not involved.
+    Task.objects.bulk_create(
+        [Task(user=user, habit=reading, description="Read", date=day, status="done") for day in days(0, 1, 2, 4)]
+        + [Task(user=user, habit=running, description="Run", date=day, status="done") for day in days(0, 1)]
+        + [Task(user=user, habit=idle, description="Idle", date=DAY, status="pending")]
+    )
+    StreakRecord.objects.create(habit=running, current_streak=9, longest_streak=9)
+    StreakRecord.objects.create(habit=idle, current_streak=4, longest_streak=4, last_completed_date=DAY)
+
+    call_command("recompute_streaks", "--batch-size", "1")
+
+    records = {record.habit_id: record for record in StreakRecord.objects.all()}
+    assert (records[reading.id].current_streak, records[reading.id].longest_streak) == (1, 3)
+    assert records[reading.id].last_completed_date == DAY + timedelta(days=4)
+    assert (records[running.id].current_streak, records[running.id].longest_streak) == (2, 2)
+    assert (records[idle.id].current_streak, records[idle.id].longest_streak) == (0, 0)
+    assert records[idle.id].last_completed_date is None
+    assert set(CompletionBitmap.objects.values_list("habit_id", flat=True)) == {reading.id, running.id}
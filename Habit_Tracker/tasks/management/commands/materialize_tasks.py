@@ -0,0 +1,22 @@
+from datetime import date
+from django.core.management.base import BaseCommand
+from tasks.materialize import materialize_tasks
+
+
+class Command(BaseCommand):
+    help = "Create the day's pending task for every active habit; safe to rerun and to run per user-id range."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", type=date.fromisoformat, help="Day to materialize (YYYY-MM-DD); defaults to today.")
+        parser.add_argument("--min-user-id", type=int, help="Only habits of users with id >= this.")
+        parser.add_argument("--max-user-id", type=int, help="Only habits of users with id < this.")
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Habits read and tasks inserted per round trip.")
+
+    def handle(self, *args, **options):
+        created = materialize_tasks(
+            day=options["date"],
+            min_user_id=options["min_user_id"],
+            max_user_id=options["max_user_id"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Materialized {created} tasks."))
@@ -0,0 +1,68 @@
+"""
+Daily task materialization.
+
+Creates the day's pending Task for every active habit that has not ended, ahead of time,
+so the first app open after midnight does not have to. Habits are streamed in id order and
+inserted in chunks with ``bulk_create(ignore_conflicts=True)`` against the
+``unique_task_per_habit_day`` constraint; habits that already have the day's task are
+filtered out in SQL, so a rerun reads the habit index and inserts nothing.
+
+Runs can be split by user-id range and executed in parallel; ranges never touch the
+same habits, and overlapping runs are harmless.
+"""
+from datetime import datetime, time, timedelta
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from habits.models import Habit
+from habits.dashboard import invalidate_dashboard
+from tasks.models import Task
+
+
+def habits_due(day, min_user_id=None, max_user_id=None):
+    """Active habits, started by ``day`` and not ended before it, without a task on ``day``."""
+    next_day_start = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    habits = Habit.objects.filter(is_active=True, created_on__lt=next_day_start).filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=day)
+    )
+    if min_user_id is not None:
+        habits = habits.filter(user_id__gte=min_user_id)
+    if max_user_id is not None:
+        habits = habits.filter(user_id__lt=max_user_id)
+    return habits.filter(~Exists(Task.objects.filter(habit_id=OuterRef("pk"), date=day)))
+
+
+def _insert_chunk(rows, day):
+    with transaction.atomic():
+        Task.objects.bulk_create(
+            [Task(user_id=user_id, habit_id=habit_id, description=title, date=day) for habit_id, user_id, title in rows],
+            ignore_conflicts=True,
+        )
+    invalidate_dashboard(*{user_id for _, user_id, _ in rows})
+
+
+def materialize_tasks(day=None, min_user_id=None, max_user_id=None, chunk_size=2000):
+    """
+    Create ``day``'s (default today) pending tasks for habits owned by users in
+    ``[min_user_id, max_user_id)``. Returns the number of habits that needed a task.
+    """
+    day = day or timezone.localdate()
+    rows = (
+        habits_due(day, min_user_id, max_user_id)
+        .order_by("id")
+        .values_list("id", "user_id", "title")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    materialized = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            _insert_chunk(chunk, day)
+            materialized += len(chunk)
+            chunk = []
+    if chunk:
+        _insert_chunk(chunk, day)
+        materialized += len(chunk)
+    return materialized
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:15
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, Count, When
+
+
+def remove_duplicate_habit_days(apps, schema_editor):
+    """Keep one task per (habit, date) before the unique constraint is added, preferring a done one."""
+    Task = apps.get_model('tasks', 'Task')
+    duplicates = (
+        Task.objects.filter(habit__isnull=False)
+        .values('habit_id', 'date')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+    )
+    for group in duplicates.iterator():
+        ids = list(
+            Task.objects.filter(habit_id=group['habit_id'], date=group['date'])
+            .order_by(Case(When(status='done', then=0), default=1), 'id')
+            .values_list('id', flat=True)
+        )
+        Task.objects.filter(id__in=ids[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0002_habit_habit_user_active_idx'),
+        ('tasks', '0002_alter_task_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'date'], name='task_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['habit', 'date', 'status'], name='task_habit_date_status_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_habit_days, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('habit', 'date'), name='unique_task_per_habit_day'),
+        ),
+    ]
@@ -9,11 +9,33 @@ class Task(models.Model):
         ('pending','Pending'),
         ('done','Done'),
     ]
+    # Fields whose loaded values are remembered so signal handlers can tell what changed on save.
+    TRACKED_FIELDS = ("habit_id", "date", "status")
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tasks')
     habit = models.ForeignKey("habits.Habit",on_delete=models.CASCADE, related_name="tasks", null=True, blank=True)
     description = models.TextField()
     date = models.DateField(default=date.today)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "date"], name="task_user_date_idx"),
+            models.Index(fields=["habit", "date", "status"], name="task_habit_date_status_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["habit", "date"], name="unique_task_per_habit_day"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_state = instance.tracked_state()
+        return instance
+
+    def tracked_state(self):
+        """Return the current values of TRACKED_FIELDS, skipping deferred ones so no query is issued."""
+        return {name: self.__dict__[name] for name in self.TRACKED_FIELDS if name in self.__dict__}
+
     def __str__(self):
-        return f"{self.description} - {self.date}"
\ No newline at end of file
+        return f"{self.description} - {self.date}"
@@ -0,0 +1,57 @@
+from django.db import transaction
+from rest_framework import serializers
+from tasks.models import Task
+from streaks.engine import apply_transitions
+from habits.dashboard import invalidate_dashboard
+
+MAX_BATCH_SIZE = 500
+
+class TaskSerializer(serializers.ModelSerializer):
+    """Serializer for Task model."""
+    class Meta:
+        model = Task
+        fields = ["id", "habit", "description", "date", "status"]
+
+class TaskStatusUpdateSerializer(serializers.Serializer):
+    """A single task id with the status it should end up in."""
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES)
+
+class TaskBatchStatusSerializer(serializers.Serializer):
+    """Applies a batch of status changes to the user's tasks in one transaction and updates the affected streaks together."""
+    tasks = TaskStatusUpdateSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_SIZE)
+
+    def validate_tasks(self, tasks):
+        """Ensure each task appears at most once."""
+        ids = [item["id"] for item in tasks]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each task may only appear once per batch")
+        return tasks
+
+    def create(self, validated_data):
+        """Lock the tasks, write every changed status with one bulk_update and recompute streaks per habit."""
+        user = validated_data["user"]
+        targets = {item["id"]: item["status"] for item in validated_data["tasks"]}
+
+        with transaction.atomic():
+            tasks = list(Task.objects.select_for_update().filter(user=user, id__in=targets).order_by("id"))
+            missing = sorted(targets.keys() - {task.id for task in tasks})
+            if missing:
+                raise serializers.ValidationError({"tasks": [f"Unknown task ids: {missing}"]})
+
+            changed = [task for task in tasks if task.status != targets[task.id]]
+            transitions = []
+            for task in changed:
+                task.status = targets[task.id]
+                if task.habit_id is not None:
+                    transitions.append((task.habit_id, task.date, task.status == "done"))
+
+            Task.objects.bulk_update(changed, ["status"])
+            self.streak_records = list(apply_transitions(transitions).values())
+            # bulk_update sends no signals, so the dashboard is invalidated here.
+            transaction.on_commit(lambda: invalidate_dashboard(user.id))
+
+        for task in changed:
+            task._loaded_state = task.tracked_state()
+        self.changed_count = len(changed)
+        return tasks
@@ -0,0 +1,95 @@
+import pytest
+from datetime import date, timedelta
+from rest_framework.test import APIClient
+from users.models import User
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import StreakRecord
+
+DAY = date(2025, 5, 1)
+
+@pytest.mark.django_db
+class TestTaskBatchStatusAPI:
+    """Test suite for the batch task status endpoint."""
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/tasks/api/v1/batch-status/"
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.habit = Habit.objects.create(user=self.user, title="Exercise")
+        self.tasks = [
+            Task.objects.create(user=self.user, habit=self.habit, description="Workout", date=DAY + timedelta(days=offset))
+            for offset in range(5)
+        ]
+        self.client.force_authenticate(self.user)
+
+    def post(self, changes):
+        return self.client.post(self.url, {"tasks": changes}, format="json")
+
+    def test_batch_marks_tasks_done_and_updates_streak(self):
+        response = self.post([{"id": task.id, "status": "done"} for task in self.tasks])
+        data = response.json()
+
+        assert response.status_code == 200
+        assert data["updated"] == 5
+        assert {task["status"] for task in data["tasks"]} == {"done"}
+        assert data["streaks"] == [{
+            "habit": self.habit.id,
+            "current_streak": 5,
+            "longest_streak": 5,
+            "last_completed_date": str(DAY + timedelta(days=4)),
+        }]
+        assert Task.objects.filter(status="done").count() == 5
+
+    def test_batch_undo_shortens_streak(self):
+        self.post([{"id": task.id, "status": "done"} for task in self.tasks])
+
+        response = self.post([{"id": self.tasks[-1].id, "status": "pending"}])
+        record = StreakRecord.objects.get(habit=self.habit)
+
+        assert response.status_code == 200
+        assert (record.current_streak, record.last_completed_date) == (4, DAY + timedelta(days=3))
+
+    def test_batch_uses_constant_queries(self, django_assert_max_num_queries):
+        with django_assert_max_num_queries(11):
+            response = self.post([{"id": task.id, "status": "done"} for task in self.tasks])
+
+        assert response.status_code == 200
+
+    def test_unchanged_tasks_are_not_counted(self):
+        response = self.post([{"id": self.tasks[0].id, "status": "pending"}])
+
+        assert response.status_code == 200
+        assert response.json()["updated"] == 0
+
+    def test_foreign_task_rejects_whole_batch(self):
+        other = User.objects.create_user(username="other", password="password123")
+        foreign = Task.objects.create(user=other, description="Not yours")
+
+        response = self.post([{"id": self.tasks[0].id, "status": "done"}, {"id": foreign.id, "status": "done"}])
+
+        assert response.status_code == 400
+        assert "tasks" in response.json()
+        assert not Task.objects.filter(status="done").exists()
+
+    def test_duplicate_ids_rejected(self):
+        response = self.post([{"id": self.tasks[0].id, "status": "done"}, {"id": self.tasks[0].id, "status": "pending"}])
+
+        assert response.status_code == 400
+        assert "tasks" in response.json()
+
+    def test_empty_batch_rejected(self):
+        response = self.post([])
+
+        assert response.status_code == 400
+
+    def test_invalid_status_rejected(self):
+        response = self.post([{"id": self.tasks[0].id, "status": "skipped"}])
+
+        assert response.status_code == 400
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        response = self.post([{"id": self.tasks[0].id, "status": "done"}])
+
+        assert response.status_code == 401
@@ -0,0 +1,92 @@
+import pytest
+from datetime import date, timedelta
+from rest_framework.test import APIClient
+from users.models import User
+from habits.models import Habit
+from tasks.models import Task
+
+DAY = date(2025, 6, 30)
+
+@pytest.mark.django_db
+class TestTaskHistoryAPI:
+    """Test suite for the cursor-paginated task history endpoint."""
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/tasks/api/v1/history/"
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.reading = Habit.objects.create(user=self.user, title="Read")
+        self.running = Habit.objects.create(user=self.user, title="Run")
+        for offset in range(5):
+            day = DAY - timedelta(days=offset)
+            Task.objects.create(user=self.user, habit=self.reading, description="Read", date=day, status="done")
+            Task.objects.create(user=self.user, habit=self.running, description="Run", date=day)
+        self.client.force_authenticate(self.user)
+
+    def collect(self, url):
+        """Follow next links and return every result plus the number of pages."""
+        results, pages = [], 0
+        while url:
+            data = self.client.get(url).json()
+            results += data["results"]
+            url = data["next"]
+            pages += 1
+        return results, pages
+
+    def test_pages_cover_history_newest_first_without_gaps(self):
+        results, pages = self.collect(f"{self.url}?page_size=3")
+        expected = list(Task.objects.filter(user=self.user).order_by("-date", "-id").values_list("id", flat=True))
+
+        assert pages == 4
+        assert [task["id"] for task in results] == expected
+
+    def test_last_page_has_no_next_link(self):
+        data = self.client.get(f"{self.url}?page_size=10").json()
+
+        assert len(data["results"]) == 10
+        assert data["next"] is None
+
+    def test_filters_by_habit_and_status(self):
+        results, _ = self.collect(f"{self.url}?page_size=2&habit={self.running.id}")
+        done, _ = self.collect(f"{self.url}?status=done")
+
+        assert {task["habit"] for task in results} == {self.running.id}
+        assert len(results) == 5
+        assert {task["habit"] for task in done} == {self.reading.id}
+
+    def test_malformed_filters_rejected(self):
+        habit = self.client.get(f"{self.url}?habit=abc")
+        superscript = self.client.get(f"{self.url}?habit=%C2%B2")
+        task_status = self.client.get(f"{self.url}?status=finished")
+
+        assert habit.status_code == 400
+        assert "habit" in habit.json()
+        assert superscript.status_code == 400
+        assert task_status.status_code == 400
+        assert "status" in task_status.json()
+
+    def test_other_users_tasks_hidden(self):
+        other = User.objects.create_user(username="other", password="password123")
+        Task.objects.create(user=other, description="Not mine", date=DAY)
+
+        results, _ = self.collect(self.url)
+
+        assert len(results) == 10
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(f"{self.url}?cursor=not-a-cursor")
+
+        assert response.status_code == 404
+
+    def test_page_size_is_capped(self):
+        Task.objects.bulk_create(
+            [Task(user=self.user, description="Extra", date=DAY - timedelta(days=10 + offset)) for offset in range(250)]
+        )
+
+        data = self.client.get(f"{self.url}?page_size=1000").json()
+
+        assert len(data["results"]) == 200
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+
+        assert self.client.get(self.url).status_code == 401
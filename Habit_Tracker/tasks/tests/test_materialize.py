@@ -0,0 +1,69 @@
+import pytest
+from datetime import timedelta
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from users.models import User
+from habits.models import Habit
+from habits.dashboard import get_dashboard
+from tasks.models import Task
+from tasks.materialize import materialize_tasks
+
+@pytest.mark.django_db
+class TestMaterializeTasks:
+    """Test suite for the daily task rollover."""
+    def setup_method(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.active = Habit.objects.create(user=self.user, title="Read")
+        self.ends_today = Habit.objects.create(user=self.user, title="Walk", end_date=self.today)
+        Habit.objects.create(user=self.user, title="Paused", is_active=False)
+        Habit.objects.create(user=self.user, title="Ended", end_date=self.today - timedelta(days=1))
+
+    def test_creates_pending_task_per_due_habit(self):
+        assert materialize_tasks() == 2
+
+        tasks = Task.objects.filter(date=self.today)
+        assert {task.habit_id for task in tasks} == {self.active.id, self.ends_today.id}
+        assert {task.status for task in tasks} == {"pending"}
+        assert {task.description for task in tasks} == {"Read", "Walk"}
+
+    def test_rerun_is_a_no_op(self, django_assert_num_queries):
+        materialize_tasks()
+
+        with django_assert_num_queries(1):
+            assert materialize_tasks() == 0
+        assert Task.objects.count() == 2
+
+    def test_existing_task_kept(self):
+        Task.objects.create(user=self.user, habit=self.active, description="Done early", date=self.today, status="done")
+
+        assert materialize_tasks() == 1
+        assert Task.objects.get(habit=self.active).status == "done"
+
+    def test_habits_created_later_skipped_for_past_days(self):
+        assert materialize_tasks(day=self.today - timedelta(days=1)) == 0
+
+    def test_user_id_range(self):
+        other = User.objects.create_user(username="other", password="password123")
+        Habit.objects.create(user=other, title="Run")
+
+        assert materialize_tasks(min_user_id=other.id) == 1
+        assert materialize_tasks(max_user_id=other.id) == 2
+        assert Task.objects.count() == 3
+
+    def test_small_chunks(self):
+        assert materialize_tasks(chunk_size=1) == 2
+
+    def test_invalidates_dashboards(self):
+        assert get_dashboard(self.user.id)["tasks"] == []
+
+        materialize_tasks()
+
+        assert len(get_dashboard(self.user.id)["tasks"]) == 2
+
+    def test_command(self, capsys):
+        call_command("materialize_tasks", "--date", self.today.isoformat())
+
+        assert "Materialized 2 tasks." in capsys.readouterr().out
@@ -1,4 +1,6 @@
 import pytest
+from datetime import timedelta
+from django.db import IntegrityError
 from django.utils import timezone
 from users.models import User
 from habits.models import Habit
@@ -58,10 +60,29 @@ def test_habit_related_name_tasks_manager():
     habit = Habit.objects.create(user=user,title="Meditation")
 
     Task.objects.create(user=user,habit=habit,description="Do meditation for 10 min")
-    Task.objects.create(user=user,habit=habit,description="Evening meditation")
+    Task.objects.create(user=user,habit=habit,description="Evening meditation",date=timezone.now().date() - timedelta(days=1))
 
     queryset = habit.tasks.all()
     descriptions = {task.description for task in queryset}
 
     assert queryset.count() == 2
-    assert descriptions == {"Do meditation for 10 min", "Evening meditation"}
\ No newline at end of file
+    assert descriptions == {"Do meditation for 10 min", "Evening meditation"}
+
+@pytest.mark.django_db
+def test_one_task_per_habit_per_day_enforced():
+    user = User.objects.create_user(username="test123",password="password123")
+    habit = Habit.objects.create(user=user,title="Meditation")
+
+    Task.objects.create(user=user,habit=habit,description="Morning meditation")
+
+    with pytest.raises(IntegrityError):
+        Task.objects.create(user=user,habit=habit,description="Evening meditation")
+
+@pytest.mark.django_db
+def test_tasks_without_habit_can_share_a_day():
+    user = User.objects.create_user(username="test123",password="password123")
+
+    Task.objects.create(user=user,description="Task One")
+    Task.objects.create(user=user,description="Task Two")
+
+    assert user.tasks.count() == 2
\ No newline at end of file
@@ -0,0 +1,8 @@
+from django.urls import path
+from .views import TaskBatchStatusView, TaskHistoryView
+
+
+urlpatterns = [
+    path("api/v1/history/", TaskHistoryView.as_view(), name="task_history"),
+    path("api/v1/batch-status/", TaskBatchStatusView.as_view(), name="task_batch_status"),
+]
@@ -1,3 +1,111 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
+from Habit_Tracker.db_router import ReplicaReadMixin
+from tasks.models import Task
+from tasks.pagination import DateIdCursorPagination
+from tasks.serializers import TaskSerializer, TaskBatchStatusSerializer
+from streaks.serializers import StreakRecordSerializer
+import logging
+
+logger = logging.getLogger("api.tasks")
 
 # Create your views here.
+
+class TaskBatchStatusView(APIView):
+    """
+    Batch task completion endpoint.
+
+    Methods:
+    - POST /api/{version}/batch-status/ -> Apply many status changes at once
+
+    Permission: IsAuthenticated
+
+    Request body:
+    {
+      "tasks": [
+        {"id": 12, "status": "done"},
+        {"id": 13, "status": "pending"}
+      ]
+    }
+
+    Response:
+    {
+      "updated": 2,
+      "tasks": [ ... task ... ],
+      "streaks": [ ... streak record of each affected habit ... ]
+    }
+
+    Notes:
+    - All changes are applied in one transaction; unknown or foreign task ids reject the whole batch.
+    - Streak records are locked and written once per habit, not once per task.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = TaskBatchStatusSerializer(data=request.data or {})
+        if serializer.is_valid():
+            tasks = serializer.save(user=request.user)
+
+            logger.info(
+                "Task batch status update successful",
+                extra={
+                    "user_id": request.user.id,
+                    "submitted": len(tasks),
+                    "updated": serializer.changed_count,
+                },
+            )
+
+            return Response(
+                {
+                    "updated": serializer.changed_count,
+                    "tasks": TaskSerializer(tasks, many=True).data,
+                    "streaks": StreakRecordSerializer(serializer.streak_records, many=True).data,
+                }, status=status.HTTP_200_OK
+            )
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TaskHistoryView(ReplicaReadMixin, APIView):
+    """
+    Task history endpoint with cursor pagination.
+
+    Methods:
+    - GET /api/{version}/history/ -> The user's tasks, newest first
+
+    Permission: IsAuthenticated
+
+    Query parameters:
+    - cursor: opaque token taken from the previous page's "next" link
+    - page_size: 1-200 (default 50)
+    - habit: only tasks of this habit id (400 if not an integer)
+    - status: "pending" or "done" (400 otherwise)
+
+    Response:
+    {
+      "next": "<url of the next page or null>",
+      "results": [ ... task ... ]
+    }
+    """
+    permission_classes = [IsAuthenticated]
+    pagination_class = DateIdCursorPagination
+
+    def get(self, request):
+        queryset = Task.objects.filter(user=request.user)
+
+        habit_id = request.query_params.get("habit")
+        if habit_id is not None:
+            if not (habit_id.isascii() and habit_id.isdigit()):
+                raise ValidationError({"habit": ["A valid habit id is required."]})
+            queryset = queryset.filter(habit_id=habit_id)
+        task_status = request.query_params.get("status")
+        if task_status is not None:
+            if task_status not in dict(Task.STATUS_CHOICES):
+                raise ValidationError({"status": [f"Must be one of: {', '.join(dict(Task.STATUS_CHOICES))}."]})
+            queryset = queryset.filter(status=task_status)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(TaskSerializer(page, many=True).data)
@@ -0,0 +1,224 @@
+"""
+ASGI-native variants of the guest, register and login endpoints.
+
+They mirror the APIViews in ``users.views`` (same request bodies, responses and error
+shapes) but do their ORM work with Django's async ORM and run password hashing in a
+bounded thread pool, so one ASGI worker can serve many logins while hashes are computed.
+
+``users.urls`` routes to these classes when ``ASYNC_AUTH_VIEWS`` is enabled. Under WSGI
+each async view is wrapped in its own event loop, so keep them off there.
+"""
+import asyncio
+import json
+import logging
+from abc import ABCMeta, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import IntegrityError, close_old_connections, transaction
+from django.http import JsonResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
+from users.models import User
+from users.serializers import UserSerializer, GuestUserSerializer, RegisterSerializer, LoginSerializer, GUEST_USERNAME_ATTEMPTS, generate_guest_username
+from users.views import _get_token_pair_for_user
+
+logger = logging.getLogger("api.users")
+
+_password_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASHING_THREADS, thread_name_prefix="password-hashing")
+
+
+def _run_and_release_connection(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # A hash upgrade may save the user from this thread; don't leave the connection open here.
+        close_old_connections()
+
+
+async def run_password_task(func, *args):
+    """Run a CPU-bound password hash/check in the bounded pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_pool, partial(_run_and_release_connection, func, *args))
+
+
+def _check_password(user, raw_password):
+    def setter(raw_password):
+        user.set_password(raw_password)
+        user._password = None
+        user.save(update_fields=["password"])
+
+    return check_password(raw_password, user.password, setter)
+
+
+def _insert_user(user):
+    """Insert inside a savepoint so a username clash leaves any outer transaction usable."""
+    with transaction.atomic():
+        user.save()
+
+
+class _LoginFieldsSerializer(LoginSerializer):
+    """Field validation only; the credential check happens asynchronously in the view."""
+    def validate(self, data):
+        return data
+
+class _RegisterFieldsSerializer(RegisterSerializer):
+    """Field validation only; uniqueness is checked with the async ORM in the view."""
+    def get_fields(self):
+        fields = super().get_fields()
+        username = fields["username"]
+        username.validators = [validator for validator in username.validators if not isinstance(validator, UniqueValidator)]
+        return fields
+
+    def validate_email(self, email):
+        return email
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncAuthView(View, metaclass=ABCMeta):
+    """Shared request handling: body parsing, anonymous-only access and DRF-shaped error bodies."""
+    http_method_names = ["post", "options"]
+
+    def parse_body(self, request):
+        if request.content_type == "application/json":
+            if not request.body:
+                return {}
+            try:
+                data = json.loads(request.body)
+            except ValueError as exc:
+                raise exceptions.ParseError(f"JSON parse error - {exc}")
+            return data if isinstance(data, dict) else {}
+        return request.POST.dict()
+
+    async def ensure_anonymous(self, request):
+        """Same outcome as DRF authentication + IsAnonymous: bad tokens are 401, valid ones 403."""
+        for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            result = await sync_to_async(authenticator_class().authenticate)(request)
+            if result is not None and result[0].is_authenticated:
+                raise exceptions.PermissionDenied()
+
+    def error_response(self, exc):
+        body = exc.detail if isinstance(exc.detail, (dict, list)) else {"detail": exc.detail}
+        return JsonResponse(body, status=exc.status_code, safe=False)
+
+    async def post(self, request):
+        try:
+            await self.ensure_anonymous(request)
+            return await self.handle(request, self.parse_body(request))
+        except exceptions.APIException as exc:
+            return self.error_response(exc)
+
+    @abstractmethod
+    async def handle(self, request, data):
+        """
+        Handle an anonymous POST whose body parsed to ``data`` and return the JsonResponse.
+
+        Raise an APIException for errors; ``post`` turns it into the DRF-shaped error body.
+        """
+
+    async def token_response(self, user, status_code):
+        access_token, refresh_token = await sync_to_async(_get_token_pair_for_user)(user)
+        return JsonResponse(
+            {
+                "user": UserSerializer(user).data,
+                "access": access_token,
+                "refresh": refresh_token,
+            }, status=status_code
+        )
+
+
+class GuestUserView(AsyncAuthView):
+    """Async guest user creation endpoint. See users.views.GuestUserView."""
+
+    async def handle(self, request, data):
+        for _ in range(GUEST_USERNAME_ATTEMPTS):
+            user = User(username=generate_guest_username(), is_guest=True)
+            user.set_unusable_password()
+            try:
+                await sync_to_async(_insert_user)(user)
+                break
+            except IntegrityError:
+                continue
+        else:
+            raise exceptions.ValidationError([GuestUserSerializer.default_error_messages["username_unavailable"]])
+
+        logger.info(
+            "Guest User created successfully",
+            extra={
+                "user_id": user.id,
+                "username": user.username,
+                "is_guest": user.is_guest,
+            },
+        )
+        return await self.token_response(user, status.HTTP_201_CREATED)
+
+
+class RegisterView(AsyncAuthView):
+    """Async user registration endpoint. See users.views.RegisterView."""
+
+    async def handle(self, request, data):
+        serializer = _RegisterFieldsSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        username = serializer.validated_data["username"]
+        email = serializer.validated_data["email"]
+
+        errors = {}
+        if await User.objects.filter(username=username).aexists():
+            errors["username"] = [User._meta.get_field("username").error_messages["unique"]]
+        if await User.objects.filter(email=email).aexists():
+            errors["email"] = ["Email is already taken"]
+        if errors:
+            raise exceptions.ValidationError(errors)
+
+        user = User(username=User.normalize_username(username), email=User.objects.normalize_email(email))
+        user.password = await run_password_task(make_password, serializer.validated_data["password"])
+        try:
+            await sync_to_async(_insert_user)(user)
+        except IntegrityError:
+            raise exceptions.ValidationError({"username": [User._meta.get_field("username").error_messages["unique"]]})
+
+        logger.info(
+            "User registration successful",
+            extra={
+                "user_id": user.id,
+                "username": user.username,
+                "email": user.email,
+            },
+        )
+        return await self.token_response(user, status.HTTP_201_CREATED)
+
+
+class LoginView(AsyncAuthView):
+    """Async user login endpoint. See users.views.LoginView."""
+
+    async def handle(self, request, data):
+        serializer = _LoginFieldsSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        identifier = serializer.validated_data["identifier"]
+
+        lookup = {"email": identifier} if "@" in identifier else {"username": identifier}
+        user = await User.objects.filter(**lookup).afirst()
+
+        if user is None or not await run_password_task(_check_password, user, serializer.validated_data["password"]):
+            logger.warning(
+                "User login failed",
+                extra={
+                    "identifier": identifier,
+                },
+            )
+            raise exceptions.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: ["Invalid login credentials"]})
+
+        logger.info(
+            "User login successful",
+            extra={
+                "user_id": user.id,
+                "username": user.username,
+            },
+        )
+        return await self.token_response(user, status.HTTP_200_OK)
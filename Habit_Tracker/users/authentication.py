@@ -0,0 +1,49 @@
+"""
+JWT authentication that serves the token's user from Django's cache.
+
+Entries are keyed on user id and kept for ``AUTH_USER_CACHE_TIMEOUT`` seconds. They are
+deleted by the handlers in ``users.signals`` when the user is saved or deleted, and by
+``LogoutView`` on logout, so a request never authenticates against a stale row for longer
+than the timeout even if an invalidation is missed.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+def user_cache_key(user_id):
+    return f"auth-user:{user_id}"
+
+
+def invalidate_cached_user(*user_ids):
+    """Drop the cached authentication user for the given ids."""
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids if user_id is not None])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication whose user lookup skips the database on a cache hit."""
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+            return user
+
+        # Same checks JWTAuthentication.get_user applies to a freshly loaded user.
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
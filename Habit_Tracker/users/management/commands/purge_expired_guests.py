@@ -0,0 +1,39 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Delete expired guest accounts with their habits, tasks and streaks, in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200, help="Guest accounts deleted per transaction.")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many guests have expired.")
+
+    def handle(self, *args, **options):
+        expired = User.objects.expired_guests()
+
+        if options["dry_run"]:
+            self.stdout.write(f"{expired.count()} expired guest accounts would be deleted.")
+            return
+
+        users_deleted = rows_deleted = 0
+        while True:
+            ids = list(expired.order_by("id").values_list("id", flat=True)[: options["batch_size"]])
+            if not ids:
+                break
+
+            # Each batch is its own short transaction; cascades stay proportional to the batch.
+            with transaction.atomic():
+                total, per_model = User.objects.filter(id__in=ids).delete()
+
+            users_deleted += per_model.get(User._meta.label, 0)
+            rows_deleted += total
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {users_deleted} expired guest accounts ({rows_deleted} rows including cascades)."
+        ))
@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    help = "Delete outstanding and blacklisted tokens past their expiry, one primary-key range at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000, help="Width of the token id range scanned per delete.")
+        parser.add_argument("--sleep", type=float, default=0.0, help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options):
+        now = aware_utcnow()
+        batch_size = options["batch_size"]
+        last_id = OutstandingToken.objects.aggregate(last=Max("id"))["last"] or 0
+
+        # expires_at has no index; walking the primary key keeps every delete a short range scan
+        # instead of one statement that scans and locks the whole table.
+        deleted = 0
+        for start in range(0, last_id, batch_size):
+            total, per_model = OutstandingToken.objects.filter(
+                id__gt=start, id__lte=start + batch_size, expires_at__lte=now
+            ).delete()
+            deleted += per_model.get(OutstandingToken._meta.label, 0)
+            if total and options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired tokens."))
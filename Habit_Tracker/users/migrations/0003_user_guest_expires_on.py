@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:24
+
+import users.models
+from datetime import timedelta
+from django.db import migrations, models
+
+
+def backfill_guest_expiry(apps, schema_editor):
+    """Set guest_expires_on for existing guests in batches."""
+    User = apps.get_model('users', 'User')
+    pending = User.objects.filter(is_guest=True, guest_expires_on__isnull=True).only('id', 'created_on').order_by('id')
+    while True:
+        batch = list(pending[:1000])
+        if not batch:
+            break
+        for user in batch:
+            user.guest_expires_on = user.created_on + timedelta(days=7)
+        User.objects.bulk_update(batch, ['guest_expires_on'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_alter_user_created_on'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', users.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='guest_expires_on',
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_guest_expiry, migrations.RunPython.noop),
+    ]
@@ -1,29 +1,81 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
 from django.utils import timezone
 from datetime import timedelta
 
+GUEST_ACCOUNT_LIFETIME = timedelta(days=7)
+
 # Create your models here.
 
+class UserManager(BaseUserManager):
+    def expired_guests(self, today=None):
+        """
+        Guest accounts whose expiry date has passed, selectable through the guest_expires_on index.
+
+        Rows saved without guest_expires_on (e.g. bulk_create) expire from created_on, as in
+        ``User.guest_expiry_date``.
+        """
+        today = today or timezone.now().date()
+        return self.filter(
+            models.Q(guest_expires_on__lt=today)
+            | models.Q(guest_expires_on__isnull=True, created_on__lt=today - GUEST_ACCOUNT_LIFETIME),
+            is_guest=True,
+        )
+
 class User(AbstractUser):
     email = models.EmailField(blank=True, null=True)
     is_guest = models.BooleanField(default=False)
     notifications_enabled = models.BooleanField(default=True)
     created_on = models.DateField(auto_now_add=True)
+    guest_expires_on = models.DateField(blank=True, null=True, db_index=True)
+
+    objects = UserManager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._guest_state = user._current_guest_state()
+        return user
+
+    def _current_guest_state(self):
+        return {"is_guest": self.__dict__.get("is_guest"), "created_on": self.__dict__.get("created_on")}
+
+    def save(self, *args, **kwargs):
+        """Derive guest_expires_on on insert, and when a saved is_guest or created_on changed."""
+        update_fields = kwargs.get("update_fields")
+        tracked = {"is_guest", "created_on"} - self.get_deferred_fields()
+        if update_fields is not None:
+            tracked &= set(update_fields)
+        loaded = getattr(self, "_guest_state", None)
+        if self._state.adding or any(loaded is None or loaded[name] != getattr(self, name) for name in tracked):
+            self.guest_expires_on = (self.created_on or timezone.now().date()) + GUEST_ACCOUNT_LIFETIME if self.is_guest else None
+            if update_fields is not None and tracked and "guest_expires_on" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "guest_expires_on"]
+        super().save(*args, **kwargs)
+        self._guest_state = self._current_guest_state()
 
     @property
-    def is_guest_expired(self):
+    def guest_expiry_date(self):
+        """guest_expires_on, or the date derived from created_on for rows saved without it (e.g. bulk_create)."""
         if not self.is_guest:
+            return None
+        if self.guest_expires_on is None and self.created_on is not None:
+            return self.created_on + GUEST_ACCOUNT_LIFETIME
+        return self.guest_expires_on
+
+    @property
+    def is_guest_expired(self):
+        expires_on = self.guest_expiry_date
+        if expires_on is None:
             return False
         
-        expiry_date = self.created_on + timedelta(days=7)
-        return timezone.now().date() > expiry_date
+        return timezone.now().date() > expires_on
     
     @property
     def guest_days_left(self):
-        if not self.is_guest:
+        expires_on = self.guest_expiry_date
+        if expires_on is None:
             return None
         
-        expiry_date = self.created_on + timedelta(days=7)
-        remaining = expiry_date - timezone.now().date()
-        return max(remaining.days, 0)
\ No newline at end of file
+        remaining = expires_on - timezone.now().date()
+        return max(remaining.days, 0)
@@ -0,0 +1,152 @@
+"""
+In-process revocation set for blacklisted refresh tokens.
+
+Blacklisted JTIs are held in a Bloom filter loaded from ``BlacklistedToken`` on first use.
+A JTI the filter has never seen is accepted without touching the blacklist tables; a hit
+is confirmed with the exact ``BlacklistedToken`` lookup, so false positives cost one query
+and never reject a valid token.
+
+The filter follows the table by id: each sync reads rows above the highest id seen so far,
+plus ids skipped below it that may still belong to uncommitted transactions. Syncs run at
+most every ``REVOCATION_SYNC_INTERVAL`` seconds (5 by default), so checks in between cost
+no query. Revocations made by this process are added at once; a token blacklisted by
+another process can still be refreshed here for up to that interval. ``0`` syncs before
+every check, refusing such tokens immediately at the cost of one query per check.
+"""
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.db.models import Max, Q
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+LN2 = math.log(2)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing of one blake2b digest."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / LN2 ** 2))
+        self.hashes = max(1, round(self.size / capacity * LN2))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationSet:
+    """Bloom filter of blacklisted JTIs kept in step with BlacklistedToken by id high-water mark."""
+
+    def __init__(self, min_capacity=10000, error_rate=0.001, gap_timeout=60, chunk_size=10000,
+                 sync_interval=None, clock=time.monotonic):
+        self.min_capacity = min_capacity
+        self.error_rate = error_rate
+        # How long a skipped id is re-read before it is treated as a rolled-back insert.
+        self.gap_timeout = gap_timeout
+        self.chunk_size = chunk_size
+        self._sync_interval = sync_interval
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.filter = None
+        self.capacity = 0
+        self.count = 0
+        # JTIs this process added that the next sync will read back; they are counted once.
+        self.added = set()
+        self.high_water_mark = 0
+        self.gaps = {}
+        self.synced_at = None
+
+    @property
+    def sync_interval(self):
+        if self._sync_interval is not None:
+            return self._sync_interval
+        return settings.REVOCATION_SYNC_INTERVAL
+
+    def load(self):
+        """(Re)build the filter from the unexpired blacklist, sized for twice its current population."""
+        with self.lock:
+            self._load()
+
+    def _load(self):
+        high_water_mark = BlacklistedToken.objects.aggregate(mark=Max("id"))["mark"] or 0
+        live = BlacklistedToken.objects.filter(id__lte=high_water_mark, token__expires_at__gt=aware_utcnow())
+
+        self.capacity = max(self.min_capacity, 2 * live.count())
+        self.filter = BloomFilter(self.capacity, self.error_rate)
+        self.count = 0
+        self.added = set()
+        for jti in live.values_list("token__jti", flat=True).iterator(chunk_size=self.chunk_size):
+            self._add(jti)
+        self.high_water_mark = high_water_mark
+        self.gaps = {}
+        self.synced_at = self.clock()
+
+    def reset(self):
+        """Forget the loaded filter; the next check reloads it from the database."""
+        with self.lock:
+            self.filter = None
+
+    def _add(self, jti):
+        self.filter.add(jti)
+        self.count += 1
+
+    def add(self, jti):
+        """Record a JTI blacklisted by this process without waiting for the next sync."""
+        with self.lock:
+            if self.filter is not None:
+                self._add(jti)
+                self.added.add(jti)
+
+    def _sync(self):
+        now = self.clock()
+        self.gaps = {gap: seen for gap, seen in self.gaps.items() if now - seen < self.gap_timeout}
+        rows = (
+            BlacklistedToken.objects.filter(Q(id__gt=self.high_water_mark) | Q(id__in=list(self.gaps)))
+            .order_by("id")
+            .values_list("id", "token__jti")
+        )
+
+        for row_id, jti in rows:
+            self.gaps.pop(row_id, None)
+            if row_id > self.high_water_mark:
+                # Ids below this row that have not appeared may belong to transactions still in flight.
+                for gap in range(self.high_water_mark + 1, row_id):
+                    self.gaps[gap] = now
+                self.high_water_mark = row_id
+            if jti in self.added:
+                self.added.discard(jti)
+            else:
+                self._add(jti)
+        self.synced_at = now
+
+        if self.count > self.capacity:
+            self._load()
+
+    def _ensure_current(self):
+        with self.lock:
+            if self.filter is None:
+                self._load()
+            elif self.clock() - self.synced_at >= self.sync_interval:
+                self._sync()
+            return self.filter
+
+    def is_revoked(self, jti):
+        """True if ``jti`` is blacklisted. Only filter hits reach the BlacklistedToken table."""
+        if jti not in self._ensure_current():
+            return False
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+
+revocations = RevocationSet()
@@ -1,11 +1,17 @@
+from django.db import IntegrityError, transaction
 from django.utils.crypto import get_random_string
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
 from users.models import User
-import random
-import string
+from users.tokens import RefreshToken
 import re
 
+# 62**8 possible suffixes: a clash is vanishingly rare, so a couple of attempts always suffice.
+GUEST_USERNAME_ATTEMPTS = 3
+
+def generate_guest_username():
+    return f"Guest_{get_random_string(8)}"
+
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for User model. Displays user profile and guest expiry info."""
     guest_days_left = serializers.ReadOnlyField()
@@ -17,16 +23,22 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ["is_guest","guest_days_left","is_guest_expired"]
 
 class GuestUserSerializer(serializers.Serializer):
-    """Creates a temporary guest user with a random username and password. This serializer accepts no input fields; it only generates a guest account."""
-    def create(self, validated_data):
-        """Generate random guest credentials and create User instance."""
-        random_str = "".join(random.choices(string.ascii_letters + string.digits,k=8))
-        username = f"Guest_{random_str}"
-        password = get_random_string(15)
+    """Creates a temporary, passwordless guest user with a random username. This serializer accepts no input fields; it only generates a guest account."""
+    default_error_messages = {
+        "username_unavailable": "Could not create a guest account, please try again"
+    }
 
-        user = User.objects.create_user(username=username,password=password, is_guest=True)
+    def create(self, validated_data):
+        """Create the guest with an unusable password (no hashing); guests authenticate only with their issued tokens."""
+        for _ in range(GUEST_USERNAME_ATTEMPTS):
+            username = generate_guest_username()
+            try:
+                with transaction.atomic():
+                    return User.objects.create_user(username=username, password=None, is_guest=True)
+            except IntegrityError:
+                continue # username taken; the unique constraint decides, no lookup needed
 
-        return user
+        self.fail("username_unavailable")
 
 class RegisterSerializer(serializers.ModelSerializer):
     """Validates and creates new user accounts with email/password."""
@@ -106,3 +118,7 @@ class LogoutSerializer(serializers.Serializer):
             RefreshToken(self.refresh_token).blacklist()
         except Exception:
             self.fail("invalid")
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Token refresh that checks the blacklist through users.revocation instead of querying it every time."""
+    token_class = RefreshToken
@@ -0,0 +1,16 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from users.models import User
+from users.authentication import invalidate_cached_user
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_auth_user(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Drop it now so this transaction's own requests miss, and again after commit so a
+    # concurrent request cannot leave the pre-commit row cached.
+    invalidate_cached_user(instance.pk)
+    transaction.on_commit(partial(invalidate_cached_user, instance.pk))
@@ -0,0 +1,103 @@
+import pytest
+from django.urls import path
+from rest_framework.test import APIClient
+from users.models import User
+from users import async_views
+
+urlpatterns = [
+    path("api/v1/guest/", async_views.GuestUserView.as_view(), name="guest"),
+    path("api/v1/register/", async_views.RegisterView.as_view(), name="register"),
+    path("api/v1/login/", async_views.LoginView.as_view(), name="login"),
+]
+
+pytestmark = [pytest.mark.django_db, pytest.mark.urls(__name__)]
+
+class TestAsyncAuthViews:
+    """The async auth views must behave like their APIView counterparts."""
+    def setup_method(self):
+        self.client = APIClient()
+
+    def test_guest_creation(self):
+        response = self.client.post("/api/v1/guest/", {})
+        data = response.json()
+
+        assert response.status_code == 201
+        assert data["user"]["username"].startswith("Guest_")
+        assert data["user"]["guest_days_left"] == 7
+        assert isinstance(data["access"], str)
+        assert User.objects.get(id=data["user"]["id"]).has_usable_password() is False
+
+    def test_register_success(self):
+        payload = {"username": "testuser", "email": "test@example.com", "password": "password123"}
+
+        response = self.client.post("/api/v1/register/", payload, format="json")
+        data = response.json()
+
+        assert response.status_code == 201
+        assert data["user"]["username"] == "testuser"
+        assert "refresh" in data
+        assert User.objects.get(username="testuser").check_password("password123")
+
+    def test_register_validation_errors_match_sync_view(self):
+        User.objects.create_user(username="taken", email="test@example.com", password="password123")
+
+        at_symbol = self.client.post("/api/v1/register/", {"username": "test@user", "email": "new@example.com", "password": "x"})
+        duplicate = self.client.post("/api/v1/register/", {"username": "taken", "email": "test@example.com", "password": "x"})
+        missing = self.client.post("/api/v1/register/", {"username": "someone"})
+
+        assert at_symbol.status_code == 400
+        assert at_symbol.json()["username"] == ["Username cannot contain '@' symbol"]
+        assert duplicate.status_code == 400
+        assert duplicate.json()["email"] == ["Email is already taken"]
+        assert "username" in duplicate.json()
+        assert set(missing.json()) == {"email", "password"}
+
+    def test_login_by_username_and_email(self):
+        User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+
+        by_username = self.client.post("/api/v1/login/", {"identifier": "testuser", "password": "password123"})
+        by_email = self.client.post("/api/v1/login/", {"identifier": "test@example.com", "password": "password123"}, format="json")
+
+        assert by_username.status_code == 200
+        assert by_email.status_code == 200
+        assert by_email.json()["user"]["username"] == "testuser"
+
+    def test_login_invalid_credentials(self):
+        User.objects.create_user(username="testuser", password="password123")
+
+        wrong_password = self.client.post("/api/v1/login/", {"identifier": "testuser", "password": "nope"})
+        unknown = self.client.post("/api/v1/login/", {"identifier": "ghost", "password": "nope"})
+
+        for response in (wrong_password, unknown):
+            assert response.status_code == 400
+            assert response.json()["non_field_errors"] == ["Invalid login credentials"]
+
+    def test_authenticated_user_denied(self):
+        User.objects.create_user(username="testuser", password="password123")
+        access = self.client.post("/api/v1/login/", {"identifier": "testuser", "password": "password123"}).json()["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        response = self.client.post("/api/v1/login/", {"identifier": "testuser", "password": "password123"})
+
+        assert response.status_code == 403
+        assert "detail" in response.json()
+
+    def test_invalid_token_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+
+        response = self.client.post("/api/v1/guest/", {})
+
+        assert response.status_code == 401
+
+    def test_malformed_json_rejected(self):
+        response = self.client.post("/api/v1/login/", "{", content_type="application/json")
+
+        assert response.status_code == 400
+        assert "detail" in response.json()
+
+    def test_views_must_define_handle(self):
+        class Incomplete(async_views.AsyncAuthView):
+            pass
+
+        with pytest.raises(TypeError, match="handle"):
+            Incomplete()
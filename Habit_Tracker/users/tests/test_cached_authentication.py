@@ -0,0 +1,59 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.authentication import CachedJWTAuthentication, user_cache_key
+from users.models import User
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Test suite for the cached JWT user lookup."""
+    def setup_method(self):
+        cache.clear()
+        self.auth = CachedJWTAuthentication()
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.refresh = RefreshToken.for_user(self.user)
+        self.token = self.auth.get_validated_token(str(self.refresh.access_token))
+
+    def test_second_lookup_skips_database(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            self.auth.get_user(self.token)
+        with django_assert_num_queries(0):
+            user = self.auth.get_user(self.token)
+
+        assert user.pk == self.user.pk
+
+    def test_save_invalidates_entry(self, django_capture_on_commit_callbacks):
+        self.auth.get_user(self.token)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.user.username = "renamed"
+            self.user.save()
+
+        assert self.auth.get_user(self.token).username == "renamed"
+
+    def test_delete_invalidates_entry(self, django_capture_on_commit_callbacks):
+        self.auth.get_user(self.token)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.user.delete()
+
+        with pytest.raises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_cached_inactive_user_rejected(self):
+        self.user.is_active = False
+        cache.set(user_cache_key(self.user.pk), self.user)
+
+        with pytest.raises(AuthenticationFailed):
+            self.auth.get_user(self.token)
+
+    def test_logout_drops_entry(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}")
+
+        response = client.post("/auth/api/v1/logout/", {"refresh_token": str(self.refresh)})
+
+        assert response.status_code == 204
+        assert cache.get(user_cache_key(self.user.pk)) is None
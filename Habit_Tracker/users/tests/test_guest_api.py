@@ -1,4 +1,5 @@
 import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
 from rest_framework.test import APIClient
 from users.models import User
 
@@ -85,4 +86,46 @@ class TestGuestUserAPI:
         login_url = "/auth/api/v1/login/"
         login_response = self.client.post(login_url, {"username": guest_username, "password": "anything"})
         
-        assert login_response.status_code in (400,401) # Login should fail
\ No newline at end of file
+        assert login_response.status_code in (400,401) # Login should fail
+
+@pytest.mark.django_db
+class TestGuestUserCreation:
+    """Tests for how guest accounts are stored."""
+    def setup_method(self):
+        self.client = APIClient()
+        self.url = "/auth/api/v1/guest/"
+
+    def test_guest_has_unusable_password(self):
+        response = self.client.post(self.url, {})
+        user = User.objects.get(id=response.json()["user"]["id"])
+
+        assert user.has_usable_password() is False
+
+    def test_guest_creation_does_not_hash_a_password(self, monkeypatch):
+        def fail_encode(*args, **kwargs):
+            raise AssertionError("guest creation must not hash a password")
+
+        monkeypatch.setattr(PBKDF2PasswordHasher, "encode", fail_encode)
+
+        response = self.client.post(self.url, {})
+
+        assert response.status_code == 201
+
+    def test_username_clash_retries_with_new_name(self, monkeypatch):
+        User.objects.create_user(username="Guest_AAAAAAAA", is_guest=True)
+        names = iter(["AAAAAAAA", "BBBBBBBB"])
+        monkeypatch.setattr("users.serializers.get_random_string", lambda length: next(names))
+
+        response = self.client.post(self.url, {})
+
+        assert response.status_code == 201
+        assert response.json()["user"]["username"] == "Guest_BBBBBBBB"
+
+    def test_username_exhaustion_returns_error(self, monkeypatch):
+        User.objects.create_user(username="Guest_AAAAAAAA", is_guest=True)
+        monkeypatch.setattr("users.serializers.get_random_string", lambda length: "AAAAAAAA")
+
+        response = self.client.post(self.url, {})
+
+        assert response.status_code == 400
+        assert User.objects.count() == 1
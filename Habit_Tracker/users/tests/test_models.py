@@ -64,4 +64,33 @@ def test_guest_days_left():
     user.created_on = timezone.now().date() - timedelta(days=3)
     user.save()
 
-    assert user.guest_days_left == 4
\ No newline at end of file
+    assert user.guest_days_left == 4
+
+@pytest.mark.django_db
+def test_narrow_update_leaves_guest_expiry_alone():
+    user = User.objects.create_user(username="guest1", is_guest=True)
+    extended = timezone.now().date() + timedelta(days=30)
+    User.objects.filter(pk=user.pk).update(guest_expires_on=extended)
+    user = User.objects.get(pk=user.pk)
+
+    user.set_password("password123")
+    user.save(update_fields=["password"])
+
+    assert User.objects.get(pk=user.pk).guest_expires_on == extended
+
+@pytest.mark.django_db
+def test_becoming_a_guest_sets_expiry():
+    user = User.objects.create_user(username="test123", password="password123")
+    user = User.objects.get(pk=user.pk)
+
+    user.is_guest = True
+    user.save(update_fields=["is_guest"])
+
+    assert User.objects.get(pk=user.pk).guest_expires_on == user.created_on + timedelta(days=7)
+
+def test_guest_without_stored_expiry():
+    user = User(is_guest=True, created_on=timezone.now().date() - timedelta(days=3))
+
+    assert (user.is_guest_expired, user.guest_days_left) == (False, 4)
+    user.created_on = None
+    assert (user.is_guest_expired, user.guest_days_left) == (False, None)
@@ -0,0 +1,63 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.utils import timezone
+from users.models import User
+from habits.models import Habit
+from tasks.models import Task
+from streaks.models import StreakRecord
+
+
+def make_guest(username, age_days):
+    user = User.objects.create_user(username=username, is_guest=True)
+    user.created_on = timezone.now().date() - timedelta(days=age_days)
+    user.save()
+    return user
+
+@pytest.mark.django_db
+def test_guest_expiry_date_is_stored():
+    guest = make_guest("guest1", age_days=2)
+    member = User.objects.create_user(username="member", password="password123")
+
+    assert guest.guest_expires_on == timezone.now().date() + timedelta(days=5)
+    assert member.guest_expires_on is None
+
+@pytest.mark.django_db
+def test_expired_guests_selected_in_sql():
+    expired = make_guest("guest1", age_days=8)
+    make_guest("guest2", age_days=7)
+    User.objects.create_user(username="member", password="password123")
+
+    assert list(User.objects.expired_guests()) == [expired]
+
+@pytest.mark.django_db
+def test_guests_without_expiry_date_expire_from_created_on():
+    expired, fresh = make_guest("guest1", age_days=8), make_guest("guest2", age_days=7)
+    User.objects.filter(pk=expired.pk).update(guest_expires_on=None)
+    User.objects.filter(pk=fresh.pk).update(guest_expires_on=None)
+
+    assert list(User.objects.expired_guests()) == [expired]
+    assert User.objects.get(pk=expired.pk).is_guest_expired
+    assert not User.objects.get(pk=fresh.pk).is_guest_expired
+
+@pytest.mark.django_db
+def test_purge_deletes_expired_guests_and_their_data():
+    expired = [make_guest(f"old{number}", age_days=10) for number in range(5)]
+    active = make_guest("fresh", age_days=1)
+    for user in expired + [active]:
+        habit = Habit.objects.create(user=user, title="Read")
+        Task.objects.create(user=user, habit=habit, description="Read", status="done")
+
+    call_command("purge_expired_guests", "--batch-size", "2")
+
+    assert list(User.objects.all()) == [active]
+    assert Habit.objects.count() == Task.objects.count() == StreakRecord.objects.count() == 1
+
+@pytest.mark.django_db
+def test_purge_dry_run_keeps_accounts(capsys):
+    make_guest("old", age_days=10)
+
+    call_command("purge_expired_guests", "--dry-run")
+
+    assert User.objects.count() == 1
+    assert "1 expired guest accounts" in capsys.readouterr().out
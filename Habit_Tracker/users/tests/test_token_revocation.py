@@ -0,0 +1,140 @@
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+from users.models import User
+from users.revocation import BloomFilter, RevocationSet, revocations
+from users.tokens import RefreshToken
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    items = [f"jti-{number}" for number in range(1000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    assert sum(f"other-{number}" in bloom for number in range(1000)) < 20
+
+@pytest.mark.django_db
+class TestRevocationSet:
+    """Test suite for the in-process blacklist filter."""
+    def setup_method(self):
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.now = 0.0
+        self.revocations = RevocationSet(sync_interval=30, clock=lambda: self.now)
+
+    def blacklist_elsewhere(self):
+        """Blacklist a token the way another process would: straight into the tables."""
+        token = RefreshToken.for_user(self.user)
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=token["jti"]))
+        return token["jti"]
+
+    def test_unknown_token_skips_blacklist_query(self, django_assert_num_queries):
+        self.revocations.load()
+
+        with django_assert_num_queries(0):
+            assert not self.revocations.is_revoked("never-blacklisted")
+
+    def test_load_includes_existing_blacklist(self):
+        jti = self.blacklist_elsewhere()
+
+        assert self.revocations.is_revoked(jti)
+
+    def test_sync_picks_up_new_rows_after_interval(self):
+        self.revocations.load()
+        jti = self.blacklist_elsewhere()
+
+        assert not self.revocations.is_revoked(jti)
+        self.now += 30
+        assert self.revocations.is_revoked(jti)
+
+    def test_skipped_ids_are_rechecked(self):
+        self.revocations.load()
+        late_jti = self.blacklist_elsewhere()
+        late_row = BlacklistedToken.objects.get(token__jti=late_jti)
+        late_row.delete()
+        self.blacklist_elsewhere()
+
+        self.now += 30
+        assert not self.revocations.is_revoked(late_jti)
+
+        # The skipped id commits after the sync that moved past it.
+        BlacklistedToken.objects.create(id=late_row.id, token=OutstandingToken.objects.get(jti=late_jti))
+        self.now += 30
+        assert self.revocations.is_revoked(late_jti)
+
+    def test_filter_grows_past_capacity(self):
+        self.revocations.min_capacity = 2
+        self.revocations.load()
+        jtis = [self.blacklist_elsewhere() for _ in range(5)]
+
+        self.now += 30
+        self.revocations.is_revoked(jtis[0])
+
+        assert self.revocations.capacity == 10
+        assert all(self.revocations.is_revoked(jti) for jti in jtis)
+
+    def test_own_revocations_counted_once(self):
+        self.revocations.load()
+        token = RefreshToken.for_user(self.user)
+        token.blacklist()
+        self.revocations.add(token["jti"])
+
+        self.now += 30
+        assert self.revocations.is_revoked(token["jti"])
+        assert self.revocations.count == 1
+
+@pytest.mark.django_db
+class TestTokenRefreshAPI:
+    """Test suite for refresh tokens checked through the revocation set."""
+    def setup_method(self):
+        revocations.reset()
+        self.client = APIClient()
+        self.url = "/auth/api/v1/token/refresh/"
+        self.user = User.objects.create_user(username="testuser", password="password123")
+        self.refresh = RefreshToken.for_user(self.user)
+
+    def test_refresh_succeeds(self):
+        response = self.client.post(self.url, {"refresh": str(self.refresh)})
+
+        assert response.status_code == 200
+        assert "access" in response.json()
+
+    def test_refresh_skips_blacklist_between_syncs(self):
+        self.client.post(self.url, {"refresh": str(self.refresh)})
+        refresh = RefreshToken.for_user(self.user)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.url, {"refresh": str(refresh)})
+
+        assert response.status_code == 200
+        blacklist_reads = [query for query in context.captured_queries
+                           if query["sql"].startswith("SELECT") and "token_blacklist_blacklistedtoken" in query["sql"]]
+        assert blacklist_reads == []
+
+    def test_refresh_rejected_after_logout(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.refresh.access_token}")
+        self.client.post(self.url, {"refresh": str(self.refresh)})
+        self.client.post("/auth/api/v1/logout/", {"refresh_token": str(self.refresh)})
+
+        response = self.client.post(self.url, {"refresh": str(self.refresh)})
+
+        assert response.status_code == 401
+
+@pytest.mark.django_db
+def test_purge_expired_tokens_keeps_live_ones():
+    user = User.objects.create_user(username="testuser", password="password123")
+    tokens = [RefreshToken.for_user(user) for _ in range(7)]
+    expired = OutstandingToken.objects.filter(jti__in=[token["jti"] for token in tokens[:4]])
+    BlacklistedToken.objects.create(token=expired[0])
+    expired.update(expires_at=aware_utcnow() - timedelta(minutes=1))
+
+    call_command("purge_expired_tokens", batch_size=2)
+
+    assert set(OutstandingToken.objects.values_list("jti", flat=True)) == {token["jti"] for token in tokens[4:]}
+    assert not BlacklistedToken.objects.exists()
@@ -0,0 +1,18 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from users.revocation import revocations
+
+
+class RefreshToken(BaseRefreshToken):
+    """Refresh token whose blacklist check goes through the in-process revocation set."""
+
+    def check_blacklist(self):
+        if revocations.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        revocations.add(self.payload[api_settings.JTI_CLAIM])
+        return result
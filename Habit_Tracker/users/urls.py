@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
-from .views import RegisterView, LoginView, GuestUserView, LogoutView
+from . import views, async_views
+from .views import LogoutView
 
+# Guest, register and login have ASGI-native variants that hash passwords off the event loop.
+auth_views = async_views if settings.ASYNC_AUTH_VIEWS else views
 
 urlpatterns = [
-    path("api/v1/guest/", GuestUserView.as_view(), name="guest"),
-    path("api/v1/register/", RegisterView.as_view(), name="register"),
-    path("api/v1/login/", LoginView.as_view(), name="login"),
+    path("api/v1/guest/", auth_views.GuestUserView.as_view(), name="guest"),
+    path("api/v1/register/", auth_views.RegisterView.as_view(), name="register"),
+    path("api/v1/login/", auth_views.LoginView.as_view(), name="login"),
     path("api/v1/logout/", LogoutView.as_view(), name="logout"),
     path("api/v1/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
-]
\ No newline at end of file
+]
@@ -2,9 +2,10 @@ from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from users.tokens import RefreshToken
 from rest_framework.exceptions import ValidationError
 from users.permissions import IsAnonymous
+from users.authentication import invalidate_cached_user
 from users.models import User
 from users.serializers import UserSerializer, GuestUserSerializer, RegisterSerializer, LoginSerializer, LogoutSerializer
 import logging
@@ -195,6 +196,7 @@ class LogoutView(APIView):
     Notes:
     - Requires SimpleJWT token_blacklist app to be enabled in INSTALLED_APPS.
     - Blacklisting prevents token reuse after logout.
+    - The user's cached authentication entry is dropped.
     """
     permission_classes = [IsAuthenticated]
 
@@ -203,6 +205,7 @@ class LogoutView(APIView):
         if serializer.is_valid():
             try:
                 serializer.save()
+                invalidate_cached_user(request.user.id)
 
                 logger.info(
                     "User logout successful",